@@ -0,0 +1,178 @@
+"""
+Benchmark entry point.
+
+    python -m benchmarks fake-openai --latency 0.5
+    python -m benchmarks database --backend memory --size 100000
+    python -m benchmarks mcp --url http://localhost:8000/sse
+    python -m benchmarks query --url http://localhost:5005 --baseline baseline.json
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import click
+import httpx
+
+from benchmarks.runner import (
+    Scenario,
+    ScenarioResult,
+    compare,
+    format_comparison,
+    format_results,
+    load_results,
+    run_scenario,
+    save_results,
+)
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def run_options(command):
+    """Options shared by every benchmark command."""
+    options = [
+        click.option("--concurrency", default=8, show_default=True, help="Requests in flight"),
+        click.option("--requests", "request_count", default=200, show_default=True, help="Measured requests per scenario"),
+        click.option("--warmup", default=10, show_default=True, help="Unmeasured requests before each scenario"),
+        click.option("--seed", default=0, show_default=True, help="Seed for generated data and request inputs"),
+        click.option("--scenario", "only", multiple=True, help="Run only scenarios whose name contains this"),
+        click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), help="Write results as JSON"),
+        click.option("--baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="Results to compare against"),
+        click.option("--tolerance", default=0.10, show_default=True, help="Relative slowdown reported as a regression"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+async def run_all(
+    scenarios: List[Scenario],
+    only: Tuple[str, ...],
+    concurrency: int,
+    requests: int,
+    warmup: int
+) -> List[ScenarioResult]:
+    results = []
+    for scenario in scenarios:
+        if only and not any(part in scenario.name for part in only):
+            continue
+        click.echo(f"Running {scenario.name}...", err=True)
+        results.append(await run_scenario(scenario, concurrency, requests, warmup))
+    return results
+
+
+def report(
+    results: List[ScenarioResult],
+    meta: dict,
+    output: Optional[Path],
+    baseline: Optional[Path],
+    tolerance: float
+):
+    """Print results, save them, and exit with status 1 on a regression against the baseline."""
+    click.echo(format_results(results))
+    for result in results:
+        for sample in result.error_samples:
+            click.echo(f"{result.name}: {sample}", err=True)
+    if output:
+        save_results(output, results, meta)
+    if baseline:
+        rows = compare(results, load_results(baseline), tolerance)
+        click.echo("")
+        click.echo(format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+def benchmark(run: Callable[..., Awaitable[List[ScenarioResult]]], meta: dict, **kwargs):
+    output, baseline, tolerance = kwargs.pop("output"), kwargs.pop("baseline"), kwargs.pop("tolerance")
+    results = asyncio.run(run(**kwargs))
+    meta = {**meta, **{key: value for key, value in kwargs.items() if key != "only"}}
+    report(results, meta, output, baseline, tolerance)
+
+
+@click.group()
+def main():
+    """Load tests for the MCP server's database layer, its tools and the LLM service."""
+
+
+@main.command("fake-openai")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8010, show_default=True)
+@click.option("--latency", default=0.5, show_default=True, help="Seconds every completion takes")
+@click.option("--jitter", default=0.0, show_default=True, help="Extra random seconds, up to this much")
+@click.option("--seed", default=0, show_default=True, help="Seed for the jitter")
+@click.option("--script", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="JSON script of rules")
+def fake_openai(host: str, port: int, latency: float, jitter: float, seed: int, script: Optional[Path]):
+    """Serve scripted OpenAI chat completions (use OPENAI_BASE_URL=http://HOST:PORT/v1)."""
+    import uvicorn
+    from benchmarks.fake_openai import FakeOpenAI
+
+    rules = json.loads(script.read_text()) if script else None
+    uvicorn.run(FakeOpenAI(rules, latency, jitter, seed).app, host=host, port=port, log_level="warning")
+
+
+@main.command()
+@click.option("--backend", type=click.Choice(["memory", "neo4j"]), default="memory", show_default=True,
+              help="Serve reads from the in-memory storage backend or from the configured Neo4j")
+@click.option("--catalog", type=click.Path(exists=True, path_type=Path),
+              help="seed.cypher or bulk loader directory for the memory backend (default: a synthetic catalog)")
+@click.option("--size", default=10_000, show_default=True, help="Metrics in the synthetic catalog")
+@run_options
+def database(backend: str, catalog: Optional[Path], size: int, **kwargs):
+    """Benchmark MetricsDatabase methods in process."""
+    from benchmarks.scenarios import database_scenarios, open_database
+
+    async def run(concurrency, request_count, warmup, seed, only):
+        db, inputs = await open_database(backend, catalog, size, seed)
+        try:
+            return await run_all(database_scenarios(db, inputs), only, concurrency, request_count, warmup)
+        finally:
+            await db.disconnect()
+
+    meta = {"command": "database", "backend": backend, "catalog": str(catalog) if catalog else None, "size": size}
+    benchmark(run, meta, **kwargs)
+
+
+@main.command()
+@click.option("--url", default="http://localhost:8000/sse", show_default=True, help="MCP server SSE endpoint")
+@click.option("--metrics-url", default="http://localhost:8000/metrics", show_default=True,
+              help="MCP server Prometheus endpoint, for its memory use")
+@run_options
+def mcp(url: str, metrics_url: str, **kwargs):
+    """Benchmark the MCP server's tools over SSE."""
+    from benchmarks.scenarios import mcp_inputs, mcp_scenarios, open_mcp, scraped_memory
+
+    async def run(concurrency, request_count, warmup, seed, only):
+        async with AsyncExitStack() as stack:
+            session = await open_mcp(stack, url)
+            inputs = await mcp_inputs(session, seed)
+            scenarios = mcp_scenarios(session, inputs, scraped_memory(metrics_url))
+            return await run_all(scenarios, only, concurrency, request_count, warmup)
+
+    benchmark(run, {"command": "mcp", "url": url}, **kwargs)
+
+
+@main.command()
+@click.option("--url", default="http://localhost:5005", show_default=True, help="LLM service base URL")
+@click.option("--timeout", default=120.0, show_default=True, help="Seconds before a query counts as failed")
+@run_options
+def query(url: str, timeout: float, **kwargs):
+    """Benchmark the LLM service's /query (run it against the fake OpenAI server)."""
+    from benchmarks.scenarios import llm_inputs, query_scenarios, scraped_memory
+
+    async def run(concurrency, request_count, warmup, seed, only):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            inputs = await llm_inputs(client, seed)
+            scenarios = query_scenarios(client, inputs, scraped_memory(f"{url}/prometheus"))
+            return await run_all(scenarios, only, concurrency, request_count, warmup)
+
+    benchmark(run, {"command": "query", "url": url}, **kwargs)
+
+
+if __name__ == "__main__":
+    main()
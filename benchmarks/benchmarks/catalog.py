@@ -0,0 +1,20 @@
+"""
+Catalogs for the database benchmarks.
+
+``synthetic_catalog`` builds a reproducible power-law catalog of any size
+with the MCP server's generator, as node and edge rows for the in-memory
+storage backend. Existing catalog files are read by the backend itself.
+"""
+
+from typing import List, Tuple
+
+from mcp_server.core.generator import CatalogGenerator
+from mcp_server.core.loader import NODE_FILES, edge_row
+from mcp_server.core.snapshot import EdgeRow, NodeRow
+
+
+def synthetic_catalog(metrics: int, seed: int = 0) -> Tuple[List[NodeRow], List[EdgeRow]]:
+    """Generate a catalog with ``metrics`` metrics and proportionally sized other nodes."""
+    generator = CatalogGenerator(metrics, seed)
+    nodes = [(label, row) for label in NODE_FILES for row in generator.nodes(label)]
+    return nodes, [edge_row(row) for row in generator.edges()]
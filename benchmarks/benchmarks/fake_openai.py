@@ -0,0 +1,219 @@
+"""
+Stand-in for the OpenAI chat completions API.
+
+Answers ``POST /v1/chat/completions`` from a script instead of a model: the
+first rule whose pattern matches the latest user message decides which tool
+calls to request, one step per round trip, and the final answer once every
+step's results are in the conversation. Each response waits ``latency``
+seconds plus up to ``jitter`` seconds, so LLM time is predictable.
+
+Point the LLM service at it with ``OPENAI_BASE_URL=http://host:port/v1``.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# Rule arguments are formatted with the pattern's groups: "{0}" is the first
+DEFAULT_SCRIPT: Dict[str, Any] = {
+    "rules": [
+        {
+            "pattern": r"compare (?:the )?metrics? (.+?) (?:and|with) (.+?)\??$",
+            "steps": [[
+                {"name": "search_metrics", "arguments": {"name": "{0}"}},
+                {"name": "search_metrics", "arguments": {"name": "{1}"}}
+            ]],
+            "answer": "Here is how {0} and {1} compare."
+        },
+        {
+            "pattern": r"how (?:is|are) (?:the )?(?:dashboard )?(.+?) (?:connected|related) to (?:the )?(?:dashboard )?(.+?)\??$",
+            "steps": [[{"name": "find_dashboard_path", "arguments": {"dashboard1": "{0}", "dashboard2": "{1}"}}]],
+            "answer": "{0} and {1} are connected through the dashboards above."
+        },
+        {
+            "pattern": r"overview",
+            "steps": [
+                [{"name": "list_domains", "arguments": {}}],
+                [{"name": "list_metrics", "arguments": {}}, {"name": "list_dashboards", "arguments": {"name": ""}}]
+            ],
+            "answer": "The catalog has the domains, metrics and dashboards listed above."
+        }
+    ],
+    "default": {"steps": [], "answer": "I can answer questions about metrics, domains and dashboards."}
+}
+
+
+def _fill(value: Any, groups: tuple) -> Any:
+    if isinstance(value, str):
+        return value.format(*groups)
+    if isinstance(value, dict):
+        return {key: _fill(item, groups) for key, item in value.items()}
+    return value
+
+
+def _content(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+class ScriptedModel:
+    """Picks the next tool calls or the answer for a conversation from a script."""
+
+    def __init__(self, script: Dict[str, Any]):
+        self.rules = [
+            (re.compile(rule["pattern"], re.IGNORECASE), rule) for rule in script.get("rules", [])
+        ]
+        self.default = script.get("default", DEFAULT_SCRIPT["default"])
+
+    def reply(self, messages: List[Dict[str, Any]], offered: set) -> Dict[str, Any]:
+        """Return ``{"tool_calls": [...]}`` or ``{"content": "..."}`` for the next turn."""
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        question = _content(messages[last_user]).strip() if last_user >= 0 else ""
+        # Round trips already made for this question
+        step = sum(
+            1 for message in messages[last_user + 1:]
+            if message.get("role") == "assistant" and (message.get("tool_calls") or message.get("function_call"))
+        )
+
+        rule, groups = self.default, ()
+        for pattern, candidate in self.rules:
+            match = pattern.search(question)
+            if match:
+                rule, groups = candidate, match.groups()
+                break
+
+        steps = rule.get("steps", [])
+        if step < len(steps):
+            calls = [_fill(call, groups) for call in steps[step] if call["name"] in offered]
+            if calls:
+                return {"tool_calls": calls}
+        return {"content": _fill(rule.get("answer", ""), groups)}
+
+
+class FakeOpenAI:
+    """Serves scripted chat completions with a configurable delay."""
+
+    def __init__(self, script: Optional[Dict[str, Any]] = None, latency: float = 0.5, jitter: float = 0.0, seed: int = 0):
+        self.model = ScriptedModel(script or DEFAULT_SCRIPT)
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.app = Starlette(routes=[
+            Route("/v1/chat/completions", self.completions, methods=["POST"]),
+            Route("/v1/models", self.models, methods=["GET"]),
+        ])
+
+    async def models(self, request: Request) -> JSONResponse:
+        return JSONResponse({"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "benchmarks"}]})
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        self.requests += 1
+        messages = body.get("messages", [])
+        functions_mode = "functions" in body and "tools" not in body
+        offered = {
+            tool.get("function", tool).get("name") for tool in body.get("tools") or body.get("functions") or []
+        }
+        reply = self.model.reply(messages, offered)
+        if functions_mode and "tool_calls" in reply:
+            # The functions API requests one call per round trip
+            reply["tool_calls"] = reply["tool_calls"][:1]
+
+        await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        prompt_tokens = sum(len(_content(message)) for message in messages) // 4 + 1
+        if body.get("stream"):
+            return StreamingResponse(
+                self._chunks(completion_id, body.get("model", "fake"), reply, functions_mode),
+                media_type="text/event-stream"
+            )
+        return JSONResponse(self._completion(completion_id, body.get("model", "fake"), reply, functions_mode, prompt_tokens))
+
+    @staticmethod
+    def _message(reply: Dict[str, Any], functions_mode: bool) -> Dict[str, Any]:
+        if "content" in reply:
+            return {"role": "assistant", "content": reply["content"]}
+        calls = reply["tool_calls"]
+        if functions_mode:
+            call = calls[0]
+            return {
+                "role": "assistant",
+                "content": None,
+                "function_call": {"name": call["name"], "arguments": json.dumps(call["arguments"])}
+            }
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])}
+                }
+                for call in calls
+            ]
+        }
+
+    def _completion(
+        self,
+        completion_id: str,
+        model: str,
+        reply: Dict[str, Any],
+        functions_mode: bool,
+        prompt_tokens: int
+    ) -> Dict[str, Any]:
+        message = self._message(reply, functions_mode)
+        completion_tokens = len(json.dumps(message)) // 4 + 1
+        if "content" in reply:
+            finish_reason = "stop"
+        else:
+            finish_reason = "function_call" if functions_mode else "tool_calls"
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def _chunks(self, completion_id: str, model: str, reply: Dict[str, Any], functions_mode: bool):
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }) + "\n\n"
+
+        message = self._message(reply, functions_mode)
+        yield chunk({"role": "assistant", "content": ""})
+        if "content" in reply:
+            for word in re.findall(r"\S+\s*", reply["content"]):
+                yield chunk({"content": word})
+            yield chunk({}, "stop")
+        elif functions_mode:
+            yield chunk({"function_call": message["function_call"]})
+            yield chunk({}, "function_call")
+        else:
+            for index, call in enumerate(message["tool_calls"]):
+                yield chunk({"tool_calls": [{"index": index, **call}]})
+            yield chunk({}, "tool_calls")
+        yield "data: [DONE]\n\n"
@@ -0,0 +1,165 @@
+"""
+Scenario runner and baseline comparison.
+
+A scenario is an async call taking the iteration number. ``run_scenario``
+drives it from ``concurrency`` workers for a fixed number of requests and
+reports latency percentiles, throughput, errors and memory.
+"""
+
+import asyncio
+import json
+import math
+import os
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+Call = Callable[[int], Awaitable[Any]]
+
+# Metrics compared against a baseline and whether higher is better
+COMPARED = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "throughput": True}
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Call
+    # Server-side resident memory in MB, read after the run; None measures this process
+    server_memory: Optional[Callable[[], Awaitable[Optional[float]]]] = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    concurrency: int
+    seconds: float
+    throughput: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    memory_mb: Optional[float]
+    error_samples: List[str] = field(default_factory=list)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def resident_memory_mb() -> float:
+    """Resident memory of this process in MB (peak where current is unavailable)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+async def run_scenario(scenario: Scenario, concurrency: int, requests: int, warmup: int = 0) -> ScenarioResult:
+    """Run ``requests`` calls of a scenario from ``concurrency`` workers."""
+    for i in range(warmup):
+        try:
+            await scenario.call(i)
+        except Exception:
+            pass
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await scenario.call(warmup + i)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    seconds = time.perf_counter() - started
+
+    memory = await scenario.server_memory() if scenario.server_memory else resident_memory_mb()
+    latencies.sort()
+    return ScenarioResult(
+        name=scenario.name,
+        requests=requests,
+        errors=len(errors),
+        concurrency=concurrency,
+        seconds=round(seconds, 3),
+        throughput=round(len(latencies) / seconds, 2) if seconds else 0.0,
+        mean_ms=round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        p50_ms=round(percentile(latencies, 0.50), 3),
+        p95_ms=round(percentile(latencies, 0.95), 3),
+        p99_ms=round(percentile(latencies, 0.99), 3),
+        max_ms=round(latencies[-1], 3) if latencies else 0.0,
+        memory_mb=round(memory, 1) if memory is not None else None,
+        error_samples=errors[:5]
+    )
+
+
+def save_results(path: Path, results: List[ScenarioResult], meta: Dict[str, Any]):
+    path.write_text(json.dumps({"meta": meta, "results": [asdict(result) for result in results]}, indent=2))
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    return {result["name"]: result for result in json.loads(path.read_text())["results"]}
+
+
+def compare(results: List[ScenarioResult], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[Dict[str, Any]]:
+    """Relative change of each compared metric; ``regression`` marks changes beyond ``tolerance``."""
+    rows = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before[metric], getattr(result, metric)
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            rows.append({
+                "scenario": result.name,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": worse > tolerance
+            })
+    return rows
+
+
+def format_results(results: List[ScenarioResult]) -> str:
+    header = f"{'scenario':<24}{'reqs':>7}{'errs':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mem MB':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        memory = f"{r.memory_mb:.1f}" if r.memory_mb is not None else "-"
+        lines.append(
+            f"{r.name:<24}{r.requests:>7}{r.errors:>6}{r.throughput:>10.1f}"
+            f"{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{memory:>9}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = []
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['scenario']:<24}{row['metric']:<12}{row['baseline']:>12.2f} -> {row['current']:>10.2f}"
+            f"  ({row['change']:+.1%}){flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,219 @@
+"""
+Benchmark scenarios for each layer of the stack.
+
+``database`` calls ``MetricsDatabase`` methods in process, against Neo4j or
+the in-memory storage backend; ``mcp`` calls the MCP server's tools over
+SSE; ``query`` posts questions to the LLM service's ``/query``. Inputs are
+picked from the catalog's names by iteration number, so a run with the
+same seed sends the same requests.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from mcp_server.core.backends import MemoryBackend, Neo4jBackend
+from mcp_server.core.config.settings import settings
+from mcp_server.core.database import MetricsDatabase
+from mcp_server.core.snapshot import NODE_LABELS
+
+from benchmarks.catalog import synthetic_catalog
+from benchmarks.runner import Scenario
+
+# Names sampled per label from a live catalog
+SAMPLE_SIZE = 500
+
+
+class Inputs:
+    """Catalog names to draw request arguments from."""
+
+    def __init__(self, names: Dict[str, List[str]], seed: int = 0):
+        self.names = {}
+        for label, values in names.items():
+            values = sorted(values)
+            random.Random(f"{seed}:{label}").shuffle(values)
+            self.names[label] = values
+
+    def pick(self, label: str, i: int, offset: int = 0) -> str:
+        values = self.names.get(label) or [""]
+        return values[(i + offset * 7919) % len(values)]
+
+    def fragment(self, label: str, i: int) -> str:
+        """A word of a name, as someone searching would type it."""
+        words = [word for word in self.pick(label, i).split() if not word.isdigit()]
+        return words[i % len(words)].lower() if words else ""
+
+
+# MetricsDatabase
+
+
+async def open_database(backend: str, catalog: Optional[Path], size: int, seed: int) -> tuple:
+    """Return a ``MetricsDatabase`` for ``backend`` and the inputs to drive it with."""
+    if backend == "neo4j":
+        db = MetricsDatabase(Neo4jBackend())
+        await db.connect(ensure_schema=False)
+        names = {label: [node["name"] async for node in db.stream_nodes(label, limit=SAMPLE_SIZE)] for label in NODE_LABELS}
+        return db, Inputs(names, seed)
+
+    db = MetricsDatabase(MemoryBackend(catalog) if catalog else MemoryBackend(rows=synthetic_catalog(size, seed)))
+    await db.connect(ensure_schema=False)
+    snapshot = await db.snapshot.refresh()
+    if settings.PATH_INDEX_ENABLED:
+        # The path index is built in the background after a snapshot loads
+        deadline = time.monotonic() + 300
+        while (db.path_index is None or db.path_index.snapshot is not snapshot) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+    return db, Inputs({label: list(snapshot.index[label]) for label in NODE_LABELS}, seed)
+
+
+def database_scenarios(db: MetricsDatabase, inputs: Inputs) -> List[Scenario]:
+    return [
+        Scenario("db.get_metric", lambda i: db.get_metric(inputs.pick("Metric", i))),
+        Scenario("db.search_metrics", lambda i: db.search_page("Metric", inputs.fragment("Metric", i))),
+        Scenario("db.list_metrics", lambda i: db.list_page("Metric")),
+        Scenario("db.get_domain_metrics", lambda i: db.get_domain_metrics(inputs.pick("Domain", i))),
+        Scenario(
+            "db.dashboard_paths",
+            lambda i: db.get_dashboard_paths(inputs.pick("Dashboard", i), inputs.pick("Dashboard", i, 1))
+        ),
+        Scenario(
+            "db.domain_paths",
+            lambda i: db.get_domain_paths(inputs.pick("Domain", i), inputs.pick("Domain", i, 1))
+        ),
+    ]
+
+
+# MCP tools
+
+
+async def open_mcp(stack: AsyncExitStack, url: str) -> ClientSession:
+    read, write = await stack.enter_async_context(sse_client(url))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def call_tool(session: ClientSession, name: str, arguments: Dict[str, Any]) -> Any:
+    result = await session.call_tool(name, arguments)
+    text = result.content[0].text if result.content else ""
+    if result.isError:
+        raise RuntimeError(text or f"{name} failed")
+    return json.loads(text) if text else None
+
+
+async def mcp_inputs(session: ClientSession, seed: int) -> Inputs:
+    names = {}
+    for label, tool, arguments in (
+        ("Metric", "list_metrics", {}),
+        ("Domain", "list_domains", {}),
+        ("Dashboard", "list_dashboards", {"name": ""}),
+    ):
+        page = await call_tool(session, tool, {**arguments, "limit": SAMPLE_SIZE})
+        names[label] = [item if isinstance(item, str) else item["name"] for item in page["items"]]
+    return Inputs(names, seed)
+
+
+def mcp_scenarios(session: ClientSession, inputs: Inputs, memory) -> List[Scenario]:
+    def scenario(name: str, tool: str, arguments) -> Scenario:
+        return Scenario(f"mcp.{name}", lambda i: call_tool(session, tool, arguments(i)), memory)
+
+    return [
+        scenario("search_metrics", "search_metrics", lambda i: {"name": inputs.fragment("Metric", i)}),
+        scenario("list_metrics", "list_metrics", lambda i: {}),
+        scenario("list_dashboards", "list_dashboards", lambda i: {"name": inputs.fragment("Dashboard", i)}),
+        scenario(
+            "find_dashboard_path", "find_dashboard_path",
+            lambda i: {"dashboard1": inputs.pick("Dashboard", i), "dashboard2": inputs.pick("Dashboard", i, 1)}
+        ),
+        scenario(
+            "find_domain_path", "find_domain_path",
+            lambda i: {"domain1": inputs.pick("Domain", i), "domain2": inputs.pick("Domain", i, 1)}
+        ),
+    ]
+
+
+# LLM service /query
+
+# "routed" questions match the LLM service's fast path; "agent" questions
+# need the model and are answered by the fake OpenAI server's default script
+QUESTIONS = {
+    "routed": [
+        "List all metrics in domain: {domain}",
+        "Search metrics matching {fragment}",
+        "Find the path between dashboards {dashboard} and {dashboard2}",
+    ],
+    "agent": [
+        "Compare metrics {metric} and {metric2}",
+        "How is {dashboard} connected to {dashboard2}?",
+        "Give me an overview of the catalog",
+    ],
+}
+
+
+async def llm_inputs(client: httpx.AsyncClient, seed: int) -> Inputs:
+    names = {}
+    for label, path in (("Metric", "metrics"), ("Domain", "domains"), ("Dashboard", "dashboards")):
+        response = await client.get(f"/{path}")
+        response.raise_for_status()
+        names[label] = response.json()[path][:SAMPLE_SIZE]
+    return Inputs(names, seed)
+
+
+def question(template: str, inputs: Inputs, i: int) -> str:
+    return template.format(
+        metric=inputs.pick("Metric", i),
+        metric2=inputs.pick("Metric", i, 1),
+        domain=inputs.pick("Domain", i),
+        dashboard=inputs.pick("Dashboard", i),
+        dashboard2=inputs.pick("Dashboard", i, 1),
+        fragment=inputs.fragment("Metric", i)
+    )
+
+
+def query_scenarios(client: httpx.AsyncClient, inputs: Inputs, memory) -> List[Scenario]:
+    def scenario(kind: str) -> Scenario:
+        templates = QUESTIONS[kind]
+
+        async def call(i: int):
+            response = await client.post(
+                "/query",
+                json={
+                    "query": question(templates[i % len(templates)], inputs, i),
+                    "context": {"chat_history": [], "current_time": ""}
+                },
+                headers={"X-Request-Priority": "interactive"}
+            )
+            response.raise_for_status()
+            return response.json()
+
+        return Scenario(f"query.{kind}", call, memory)
+
+    return [scenario(kind) for kind in QUESTIONS]
+
+
+# Server memory
+
+
+_RSS = re.compile(r"^process_resident_memory_bytes\s+(\S+)$", re.MULTILINE)
+
+
+def scraped_memory(url: str):
+    """Read a service's resident memory in MB from its Prometheus endpoint."""
+    async def memory() -> Optional[float]:
+        try:
+            async with httpx.AsyncClient(timeout=5) as client:
+                response = await client.get(url)
+            match = _RSS.search(response.text)
+            return float(match.group(1)) / 2**20 if match else None
+        except httpx.HTTPError:
+            return None
+    return memory
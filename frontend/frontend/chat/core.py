@@ -2,8 +2,8 @@ import json
 from datetime import datetime
 import streamlit as st
 
-from frontend.utils.api import call_llm_api
-from frontend.config import LLM_URL
+from frontend.utils.api import stream_llm_api
+from frontend.config import LLM_URL, MAX_HISTORY
 
 
 def display_tool_usage(tool_usage):
@@ -98,11 +98,11 @@ def display_chat_message(role, content, tool_usage=None):
 
 
 def process_query(user_query):
-    """Process a user query and return the response."""
+    """Process a user query, rendering tool calls and answer tokens as they stream in."""
     try:
         st.info("🔌 Connecting to LLM service...")
 
-        response = call_llm_api("query", {
+        events = stream_llm_api("query/stream", {
             "query": user_query,
             "context": {
                 "chat_history": get_chat_history(),
@@ -110,26 +110,34 @@ def process_query(user_query):
             }
         })
 
-        if response and response.status_code == 200:
-            result = response.json()
-
-            st.info("🧠 Processing response...")
-
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": result["final_response"],
-                "tool_usage": result.get("tool_usage", []),
-                "timestamp": datetime.now().isoformat(),
-                "type": "text"
-            })
-
-            return True
-        else:
-            error_msg = "❌ Failed to get response."
-            if response is not None and response.text:
-                error_msg += f"\nDetails: {response.text}"
-            st.error(error_msg)
-            return False
+        progress = st.empty()
+        answer = st.empty()
+        tokens = []
+        for event, data in events:
+            if event == "tool_start":
+                progress.info(f"🛠️ Using {data['tool_name']}...")
+            elif event == "tool_end":
+                progress.info(f"🧠 {data['tool_name']} finished, thinking...")
+            elif event == "token":
+                tokens.append(data["content"])
+                answer.markdown("".join(tokens) + "▌")
+            elif event == "final":
+                progress.empty()
+                answer.markdown(data["final_response"])
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": data["final_response"],
+                    "tool_usage": data.get("tool_usage", []),
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "text"
+                })
+                return True
+            elif event == "error":
+                st.error(f"❌ Failed to get response.\nDetails: {data.get('detail')}")
+                return False
+
+        st.error("❌ Failed to get response.")
+        return False
     except Exception as e:
         st.error(f"❌ Error making request: {str(e)}")
         return False
@@ -141,11 +149,11 @@ def clear_chat_history():
 
 
 def get_chat_history():
-    """Get the formatted chat history."""
+    """Get the formatted chat history, limited to the last MAX_HISTORY messages."""
     return [
         {
             "role": msg["role"],
             "content": msg["content"]
         }
-        for msg in st.session_state.messages
+        for msg in st.session_state.messages[-MAX_HISTORY:]
     ]
@@ -4,3 +4,4 @@ from dotenv import load_dotenv
 load_dotenv()
 
 LLM_URL = os.getenv("LLM_URL", "http://llm_app:5005")
+MAX_HISTORY = int(os.getenv("MAX_HISTORY", "50"))
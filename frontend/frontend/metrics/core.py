@@ -1,10 +1,11 @@
 """
 Metrics-related functionality for the Streamlit app.
 """
+from urllib.parse import quote, urlencode
+
 import streamlit as st
-import json
 
-from frontend.utils.api import call_llm_api, get_llm_data
+from frontend.utils.api import get_llm_data
 from frontend.config import LLM_URL
 
 
@@ -42,14 +43,10 @@ def show_metric_details(metric_name: str):
         "content": f"Fetching details for metric '{metric_name}'..."
     })
 
-    response = call_llm_api("query", {
-        "query": f"Get details for metric: {metric_name}",
-        "chat_history": []
-    })
+    response = get_llm_data(f"metrics/{quote(metric_name, safe='')}")
 
     if response and response.status_code == 200:
-        result = response.json()
-        details = extract_tool_output(result, "get_metric_details")
+        details = response.json().get("details")
 
         if details:
             st.session_state.messages.append({
@@ -62,8 +59,11 @@ def show_metric_details(metric_name: str):
         else:
             st.warning(f"No details found for metric: {metric_name}")
             return False
+    elif response is not None and response.status_code == 404:
+        st.warning(f"No details found for metric: {metric_name}")
+        return False
     else:
-        st.error(f"Failed to get metric details ({response.status_code})")
+        st.error(f"Failed to get metric details ({response.status_code if response is not None else 'no response'})")
         return False
 
 
@@ -74,24 +74,14 @@ def show_domain_metrics(domain_name: str):
         "content": f"Fetching metrics for domain '{domain_name}'..."
     })
 
-    domain_response = call_llm_api("query", {
-        "query": f"Get details for domain: {domain_name}",
-        "chat_history": []
-    })
-
-    metrics_response = call_llm_api("query", {
-        "query": f"List all metrics in domain: {domain_name}",
-        "chat_history": []
-    })
-
-    metrics = extract_tool_output(metrics_response.json(), "get_domain_metrics") if metrics_response else []
-    domain_details = extract_tool_output(domain_response.json(), "get_domain_details") if domain_response else None
+    response = get_llm_data(f"domains/{quote(domain_name, safe='')}")
+    result = response.json() if response and response.status_code == 200 else {}
 
     st.session_state.messages.append({
         "role": "assistant",
         "content": f"Information for domain '{domain_name}':",
-        "domain_metrics": metrics,
-        "domain_details": domain_details,
+        "domain_metrics": result.get("metrics") or [],
+        "domain_details": result.get("details"),
         "show_comprehensive": True
     })
     return True
@@ -104,51 +94,53 @@ def show_dashboard_metrics(dashboard_name: str):
         "content": f"Fetching metrics for dashboard '{dashboard_name}'..."
     })
 
-    dashboard_response = call_llm_api("query", {
-        "query": f"Get details for dashboard: {dashboard_name}",
-        "chat_history": []
-    })
-
-    metrics_response = call_llm_api("query", {
-        "query": f"List all metrics in dashboard: {dashboard_name}",
-        "chat_history": []
-    })
-
-    metrics = extract_tool_output(metrics_response.json(), "get_dashboard_metrics") if metrics_response else []
-    dashboard_details = extract_tool_output(dashboard_response.json(), "get_dashboard_details") if dashboard_response else None
+    response = get_llm_data(f"dashboards/{quote(dashboard_name, safe='')}")
+    result = response.json() if response and response.status_code == 200 else {}
 
     st.session_state.messages.append({
         "role": "assistant",
         "content": f"Information for dashboard '{dashboard_name}':",
-        "dashboard_metrics": metrics,
-        "dashboard_details": dashboard_details,
+        "dashboard_metrics": result.get("metrics") or [],
+        "dashboard_details": result.get("details"),
         "show_comprehensive": True
     })
     return True
 
 
+def find_matching(label: str, listing: str, query: str):
+    """Names of ``label`` nodes matching ``query``, best first, or None on failure.
+
+    Uses the typo-tolerant ``search`` endpoint, and filters the full
+    ``listing`` by substring if the services do not offer it.
+    """
+    response = get_llm_data(f"search?{urlencode({'q': query, 'label': label})}")
+    if response is not None and response.status_code == 200:
+        return [hit["name"] for hit in response.json().get("hits", [])]
+
+    response = get_llm_data(listing)
+    if response is None or response.status_code != 200:
+        return None
+    return [name for name in response.json().get(listing, []) if query.lower() in name.lower()]
+
+
 def search_metrics(query: str):
     """Search for metrics that match the query."""
     clean_old_search_results()
 
-    response = get_llm_data("metrics")
-    if response and response.status_code == 200:
-        result = response.json()
-        all_metrics = result.get("metrics", [])
-        matching = [m for m in all_metrics if query.lower() in m.lower()]
+    matching = find_matching("Metric", "metrics", query)
+    if matching is None:
+        st.error("Failed to search metrics")
+        return False
 
-        if matching:
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": f"Found {len(matching)} metrics matching '{query}':",
-                "matching_metrics": matching
-            })
-            return True
-        else:
-            st.warning(f"No metrics found matching '{query}'")
-            return False
+    if matching:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": f"Found {len(matching)} metrics matching '{query}':",
+            "matching_metrics": matching
+        })
+        return True
     else:
-        st.error(f"Failed to search metrics ({response.status_code})")
+        st.warning(f"No metrics found matching '{query}'")
         return False
 
 
@@ -156,24 +148,20 @@ def search_domains(query: str):
     """Search for domains that match the query."""
     clean_old_search_results()
 
-    response = get_llm_data("domains")
-    if response and response.status_code == 200:
-        result = response.json()
-        all_domains = result.get("domains", [])
-        matching = [d for d in all_domains if query.lower() in d.lower()]
+    matching = find_matching("Domain", "domains", query)
+    if matching is None:
+        st.error("Failed to search domains")
+        return False
 
-        if matching:
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": f"Found {len(matching)} domains matching '{query}':",
-                "matching_domains": matching
-            })
-            return True
-        else:
-            st.warning(f"No domains found matching '{query}'")
-            return False
+    if matching:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": f"Found {len(matching)} domains matching '{query}':",
+            "matching_domains": matching
+        })
+        return True
     else:
-        st.error(f"Failed to search domains ({response.status_code})")
+        st.warning(f"No domains found matching '{query}'")
         return False
 
 
@@ -181,24 +169,20 @@ def search_dashboards(query: str):
     """Search for dashboards that match the query."""
     clean_old_search_results()
 
-    response = get_llm_data("dashboards")
-    if response and response.status_code == 200:
-        result = response.json()
-        all_dashboards = result.get("dashboards", [])
-        matching = [d for d in all_dashboards if query.lower() in d.lower()]
+    matching = find_matching("Dashboard", "dashboards", query)
+    if matching is None:
+        st.error("Failed to search dashboards")
+        return False
 
-        if matching:
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": f"Found {len(matching)} dashboards matching '{query}':",
-                "matching_dashboards": matching
-            })
-            return True
-        else:
-            st.warning(f"No dashboards found matching '{query}'")
-            return False
+    if matching:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": f"Found {len(matching)} dashboards matching '{query}':",
+            "matching_dashboards": matching
+        })
+        return True
     else:
-        st.error(f"Failed to search dashboards ({response.status_code})")
+        st.warning(f"No dashboards found matching '{query}'")
         return False
 
 
@@ -208,17 +192,3 @@ def clean_old_search_results():
         msg for msg in st.session_state.messages
         if not (msg["role"] == "assistant" and "matching" in msg.get("content", ""))
     ]
-
-
-def extract_tool_output(result_json, tool_name):
-    """Extract tool output from a tool_usage step."""
-    if not result_json or "tool_usage" not in result_json:
-        return None
-
-    for step in result_json["tool_usage"]:
-        if step["tool_name"] == tool_name:
-            try:
-                return json.loads(step["tool_output"])
-            except Exception:
-                continue
-    return None
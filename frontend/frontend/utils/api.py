@@ -1,17 +1,62 @@
+import json
+import os
 import requests
 import streamlit as st
 from frontend.config import LLM_URL
 
+# UI requests are queued ahead of batch and API clients by the LLM service
+PRIORITY_HEADERS = {"X-Request-Priority": "interactive"}
+
+def trace_headers() -> dict:
+    """Start a new W3C trace for a request; the LLM service reports its timings under this id."""
+    return {"traceparent": f"00-{os.urandom(16).hex()}-{os.urandom(8).hex()}-01"}
+
 def call_llm_api(endpoint: str, payload: dict):
     try:
-        return requests.post(f"{LLM_URL}/{endpoint}", json=payload, timeout=60)
+        return requests.post(f"{LLM_URL}/{endpoint}", json=payload, headers={**PRIORITY_HEADERS, **trace_headers()}, timeout=60)
     except requests.RequestException as e:
         st.error(f"❌ POST {endpoint} failed: {e}")
         return None
 
 def get_llm_data(path: str):
+    """GET a data endpoint, revalidating the session's copy with its ETag."""
+    cache = st.session_state.setdefault("etag_cache", {})
+    cached = cache.get(path)
+    headers = {"If-None-Match": cached.headers["ETag"]} if cached is not None else {}
     try:
-        return requests.get(f"{LLM_URL}/{path}", timeout=30)
+        response = requests.get(f"{LLM_URL}/{path}", headers=headers, timeout=30)
     except requests.RequestException as e:
         st.error(f"❌ GET {path} failed: {e}")
         return None
+    if response.status_code == 304 and cached is not None:
+        return cached
+    if response.status_code == 200 and "ETag" in response.headers:
+        cache[path] = response
+    return response
+
+
+def stream_llm_api(endpoint: str, payload: dict):
+    """POST to a Server-Sent Events endpoint and yield ``(event, data)`` pairs."""
+    try:
+        with requests.post(
+            f"{LLM_URL}/{endpoint}",
+            json=payload,
+            stream=True,
+            headers={"Accept": "text/event-stream", **PRIORITY_HEADERS, **trace_headers()},
+            timeout=(10, 60)
+        ) as response:
+            response.raise_for_status()
+            event, data = "message", []
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    if data:
+                        yield event, json.loads("\n".join(data))
+                    event, data = "message", []
+                elif line.startswith(":"):
+                    continue
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data.append(line[len("data:"):].strip())
+    except requests.RequestException as e:
+        st.error(f"❌ POST {endpoint} failed: {e}")
@@ -1,75 +1,74 @@
+import asyncio
+import json
 import logging
-from typing import List, Optional
-from pydantic import BaseModel
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from llm.agents.executor import AgentManager
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
 from llm.config import config
 
 # Configure logging
 logging.basicConfig(level=config.server.log_level)
 logger = logging.getLogger(__name__)
 
-# Pydantic models
-class ChatMessage(BaseModel):
-    role: str
-    content: str
 
-class ChatContext(BaseModel):
-    chat_history: List[ChatMessage]
+async def run_batch(source: Path, output: Optional[Path], concurrency: int):
+    """Run every query in a JSONL file and write one JSON result per line."""
+    from llm.agents.executor import AgentManager
+    from llm.agents.history import HistoryManager
+    from llm.batch import BatchRunner, parse_jsonl
 
-class QueryRequest(BaseModel):
-    query: str
-    context: ChatContext
+    with source.open(encoding="utf-8") as handle:
+        items = parse_jsonl(handle)
 
-# Initialize FastAPI app
-app = FastAPI(title="LLM Agent API")
+    agent_manager = AgentManager()
+    await agent_manager.initialize()
+    history = HistoryManager(config.history, config.history.tokenizer_model)
+    started = time.monotonic()
+    errors = 0
+    out = output.open("w", encoding="utf-8") if output else sys.stdout
+    try:
+        async for result in BatchRunner(agent_manager, concurrency, history).run(items):
+            errors += result["error"] is not None
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+    finally:
+        if output:
+            out.close()
+        await agent_manager.cleanup()
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"✅ Ran {len(items)} queries in {elapsed:.1f}s with {errors} errors "
+        f"({len(items) / elapsed if elapsed else 0:.2f} queries/s)"
+    )
 
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Agent manager
-agent_manager = AgentManager()
+@click.group(invoke_without_command=True)
+@click.pass_context
+def main(ctx: click.Context):
+    """Run the LLM agent API server (default) or a batch of queries."""
+    if ctx.invoked_subcommand is None:
+        ctx.invoke(serve)
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize agent on app startup."""
-    try:
-        await agent_manager.initialize()
-        logger.info("✅ Agent initialized successfully.")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize agent: {e}")
-        raise
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up agent resources on shutdown."""
-    await agent_manager.cleanup()
-    logger.info("🧹 Agent cleanup completed.")
+@main.command()
+def serve():
+    """Run the LLM agent API server."""
+    import uvicorn
+    uvicorn.run("llm.agent_server:app", host=config.server.host, port=config.server.port, reload=False)
+
+
+@main.command()
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), help="Write results here instead of stdout")
+@click.option("--concurrency", default=config.batch.concurrency, show_default=True, help="Queries run at the same time")
+def batch(source: Path, output: Optional[Path], concurrency: int):
+    """Run the queries in a JSONL file (one query string or object per line)."""
+    asyncio.run(run_batch(source, output, concurrency))
 
-@app.post("/query")
-async def process_query(request: QueryRequest):
-    """Endpoint to process a user query through the agent."""
-    try:
-        chat_history = [
-            {"type": msg.role, "content": msg.content}
-            for msg in request.context.chat_history
-        ]
-        result = await agent_manager.execute_query(
-            query=request.query,
-            chat_history=chat_history
-        )
-        return result
-    except Exception as e:
-        logger.error(f"⚠️ Error processing query: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("llm_app.__main__:app", host=config.server.host, port=config.server.port, reload=False)
+    main()
@@ -8,13 +8,28 @@ Provides HTTP endpoints for interacting with the LLM agent.
 
 from typing import Dict, List, Optional, Any
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from starlette.background import BackgroundTask
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
+import asyncio
+import hashlib
 import json
+import logging
+import time
 
+from llm.agents.admission import AdmissionController, QueueFull
 from llm.agents.executor import AgentManager
+from llm.agents.history import HistoryManager
+from llm.agents.tools import ToolCallError
+from llm.batch import BatchRunner, parse_item, parse_jsonl
+from llm.catalog import CatalogService, CatalogUnavailable
 from llm.config import config
+from llm.monitoring import exposition, register_stats
+from llm.tracing import tracer
+
+logger = logging.getLogger(__name__)
 
 # Request/Response Models
 class ChatMessage(BaseModel):
@@ -35,8 +50,45 @@ class QueryRequest(BaseModel):
     query: str
     context: QueryContext
 
+class BatchRequest(BaseModel):
+    # Query strings or {"query": ..., "id": ..., "chat_history": [...]} objects
+    queries: List[Any]
+    concurrency: Optional[int] = None
+
+class MetricList(BaseModel):
+    metrics: List[str]
+
+class DomainList(BaseModel):
+    domains: List[str]
+
+class DashboardList(BaseModel):
+    dashboards: List[str]
+
+class EntityDetails(BaseModel):
+    name: str
+    details: Optional[Dict[str, Any]] = None
+    metrics: Optional[List[str]] = None
+
+class SearchHit(BaseModel):
+    label: str
+    name: str
+    description: Optional[str] = None
+    score: float
+
+class SearchResults(BaseModel):
+    query: str
+    hits: List[SearchHit]
+
 # Global agent manager
 agent_manager = AgentManager()
+history_manager = HistoryManager(config.history, config.history.tokenizer_model)
+catalog = CatalogService(agent_manager)
+admission = AdmissionController(config.admission)
+
+def service_stats() -> Dict[str, Any]:
+    return {**agent_manager.stats(), "admission": admission.stats()}
+
+register_stats(service_stats)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -51,50 +103,204 @@ app = FastAPI(
     port=config.server.port
 )
 
+def format_history(chat_history: List[ChatMessage]) -> List[Dict[str, str]]:
+    """Convert chat messages, and the structured data attached to them, into token-budgeted agent history."""
+    return history_manager.build(chat_history)
+
+async def admit(priority: Optional[str]):
+    """Wait for a query slot, or reject with 429 and Retry-After when the queue is full."""
+    try:
+        return await admission.acquire(priority or "")
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 @app.post("/query")
-async def query_agent(request: QueryRequest):
+async def query_agent(
+    request: QueryRequest,
+    x_request_priority: Optional[str] = Header(default=None),
+    traceparent: Optional[str] = Header(default=None)
+):
+    timings = tracer.collect_timings()
+    with tracer.span("POST /query", "request", traceparent, query=request.query) as span:
+        queued_at = time.monotonic()
+        ticket = await admit(x_request_priority)
+        queue_ms = (time.monotonic() - queued_at) * 1000
+        async with ticket:
+            try:
+                span.attributes["history_length"] = len(request.context.chat_history)
+                logger.debug(f"🔍 Received query with {len(request.context.chat_history)} history messages: {request.query}")
+
+                formatted_history = format_history(request.context.chat_history)
+                span.attributes["compacted_history_length"] = len(formatted_history)
+                logger.debug(f"📜 Compacted history to {len(formatted_history)} messages")
+
+                result = await agent_manager.execute_query(
+                    query=request.query,
+                    chat_history=formatted_history
+                )
+            except Exception as e:
+                logger.exception(f"❌ Query failed: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+
+    # Durations of parallel LLM and tool calls are summed, so they can exceed total_ms.
+    # A request coalesced with an identical one reports that request's LLM, tool and database time.
+    database_ms = timings.get("database")
+    return JSONResponse({
+        **result,
+        "timings": {
+            "trace_id": span.trace_id,
+            "total_ms": round(span.duration_ms, 1),
+            "queue_ms": round(queue_ms, 1),
+            "llm_ms": round(timings.get("llm", 0.0), 1),
+            "tool_ms": round(timings.get("tool", 0.0), 1),
+            "database_ms": round(database_ms, 1) if database_ms is not None else None
+        }
+    })
+
+@app.post("/query/stream")
+async def stream_query_agent(
+    request: QueryRequest,
+    x_request_priority: Optional[str] = Header(default=None),
+    traceparent: Optional[str] = Header(default=None)
+):
+    """Stream tool and token events as Server-Sent Events, ending with a ``final`` event."""
+    formatted_history = format_history(request.context.chat_history)
+    ticket = await admit(x_request_priority)
+
+    async def events():
+        async with ticket:
+            with tracer.span("POST /query/stream", "request", traceparent, query=request.query) as span:
+                try:
+                    async for event in agent_manager.stream_query(
+                        query=request.query,
+                        chat_history=formatted_history
+                    ):
+                        yield {"event": event["event"], "data": json.dumps(event["data"], default=str)}
+                except Exception as e:
+                    logger.exception(f"❌ Streaming query failed: {e}")
+                    span.error = f"{type(e).__name__}: {e}"
+                    yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+
+    # Also release the slot if the client disconnects before the stream starts
+    return EventSourceResponse(events(), background=BackgroundTask(ticket.release))
+
+async def admit_batch_item():
+    """Wait for a batch-priority slot, backing off while the queue is full."""
+    while True:
+        try:
+            return await admission.acquire("batch")
+        except QueueFull as e:
+            await asyncio.sleep(e.retry_after)
+
+@app.post("/query/batch")
+async def batch_query(request: Request):
+    """Run many queries and stream one JSON result line per query as each finishes.
+
+    Accepts ``{"queries": [...], "concurrency": n}`` as JSON, or JSONL with one
+    query string or object per line.
+    """
+    body = (await request.body()).decode()
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            batch = BatchRequest.model_validate_json(body)
+            items = [parse_item(raw, index) for index, raw in enumerate(batch.queries)]
+            concurrency = batch.concurrency or config.batch.concurrency
+        else:
+            items = parse_jsonl(body.splitlines())
+            concurrency = config.batch.concurrency
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if len(items) > config.batch.max_items:
+        raise HTTPException(status_code=413, detail=f"Batches are limited to {config.batch.max_items} queries")
+
+    runner = BatchRunner(
+        agent_manager,
+        min(concurrency, config.batch.concurrency),
+        history_manager,
+        admit=admit_batch_item
+    )
+
+    async def lines():
+        async for result in runner.run(items):
+            yield json.dumps(result, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def etag_response(request: Request, payload: BaseModel) -> Response:
+    """JSON response with a content ETag; 304 if the client already has it."""
+    body = payload.model_dump_json().encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def catalog_call(call, *args):
+    """Run a catalog read, mapping MCP failures to HTTP errors."""
     try:
-        print(f"[DEBUG] 🔍 Received query: {request.query}")
-        print(f"[DEBUG] 📜 Chat history length: {len(request.context.chat_history)}")
-
-        formatted_history = []
-        for msg in request.context.chat_history:
-            formatted_history.append({
-                "type": "human" if msg.role == "user" else "assistant",
-                "content": msg.content
-            })
-            if msg.metrics:
-                formatted_history.append({
-                    "type": "system",
-                    "content": f"Available metrics: {', '.join(msg.metrics)}"
-                })
-            if msg.metric_details:
-                formatted_history.append({
-                    "type": "system",
-                    "content": f"Metric details: {json.dumps(msg.metric_details, indent=2)}"
-                })
-            if msg.domain_metrics:
-                formatted_history.append({
-                    "type": "system",
-                    "content": f"Domain metrics: {', '.join(msg.domain_metrics)}"
-                })
-            if msg.dashboard_metrics:
-                formatted_history.append({
-                    "type": "system",
-                    "content": f"Dashboard metrics: {', '.join(msg.dashboard_metrics)}"
-                })
-
-        result = await agent_manager.execute_query(
-            query=request.query,
-            chat_history=formatted_history
-        )
-        return JSONResponse(result)
-    except Exception as e:
-        print(f"[ERROR] Query failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        return await call(*args)
+    except CatalogUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except ToolCallError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+async def entity_details(request: Request, entity: str, name: str) -> Response:
+    details, metrics = await catalog_call(catalog.details, entity, name)
+    if not details and not metrics:
+        raise HTTPException(status_code=404, detail=f"Unknown {entity}: {name}")
+    return etag_response(request, EntityDetails(name=name, details=details or None, metrics=metrics))
+
+@app.get("/metrics", response_model=MetricList)
+async def list_metrics(request: Request):
+    return etag_response(request, MetricList(metrics=await catalog_call(catalog.metrics)))
+
+@app.get("/metrics/{name:path}", response_model=EntityDetails)
+async def get_metric(request: Request, name: str):
+    return await entity_details(request, "metric", name)
+
+@app.get("/domains", response_model=DomainList)
+async def list_domains(request: Request):
+    return etag_response(request, DomainList(domains=await catalog_call(catalog.domains)))
+
+@app.get("/domains/{name:path}", response_model=EntityDetails)
+async def get_domain(request: Request, name: str):
+    return await entity_details(request, "domain", name)
+
+@app.get("/dashboards", response_model=DashboardList)
+async def list_dashboards(request: Request):
+    return etag_response(request, DashboardList(dashboards=await catalog_call(catalog.dashboards)))
+
+@app.get("/dashboards/{name:path}", response_model=EntityDetails)
+async def get_dashboard(request: Request, name: str):
+    return await entity_details(request, "dashboard", name)
+
+@app.get("/search", response_model=SearchResults)
+async def search_catalog(
+    request: Request,
+    q: str,
+    label: List[str] = Query(default=["Metric", "Dashboard", "Domain"]),
+    limit: int = 25
+):
+    """Typo-tolerant search over metric, dashboard and domain names, best matches first."""
+    hits = await catalog_call(catalog.search, q, label, limit)
+    return etag_response(request, SearchResults(query=q, hits=hits))
+
+@app.get("/stats")
+async def stats():
+    return service_stats()
+
+# /metrics serves the metric catalog, so Prometheus scrapes this path instead
+@app.get("/prometheus", include_in_schema=False)
+async def prometheus_metrics():
+    body, content_type = exposition()
+    return Response(body, media_type=content_type)
 
 @app.get("/health")
 async def health_check():
     if not agent_manager.agent_executor:
         return {"status": "initializing"}
+    if not agent_manager.mcp_pool.healthy:
+        return {"status": "degraded", "fastmcp_status": "disconnected"}
     return {"status": "healthy"}
@@ -0,0 +1,160 @@
+# admission.py
+
+"""
+Admission control for agent queries.
+
+Bounds how many queries run against the LLM and MCP at once. Requests beyond
+that wait in a priority queue (interactive UI traffic ahead of batch and API
+clients); when the queue is full, or a request waits too long, it is
+rejected right away with a retry hint instead of slowing everyone down.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from llm.config import AdmissionConfig
+from llm.monitoring import QUEUE_WAIT_SECONDS
+
+# Lower value is served first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class QueueFull(Exception):
+    """Raised when a query is not admitted; ``retry_after`` is in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted query's slot. Releasing it more than once is harmless."""
+
+    def __init__(self, controller: "AdmissionController", priority: str):
+        self.controller = controller
+        self.priority = priority
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.controller._release(time.monotonic() - self.started)
+
+    async def __aenter__(self) -> "Ticket":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class AdmissionController:
+    """Runs at most ``max_concurrent`` queries and queues the rest by priority."""
+
+    def __init__(self, settings: AdmissionConfig):
+        self.settings = settings
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._queued = {priority: 0 for priority in PRIORITIES}
+        self._sequence = itertools.count()
+        self._waits: Deque[float] = deque(maxlen=1000)
+        # Moving average of how long an admitted query holds its slot
+        self._service_time = 5.0
+
+    def priority(self, requested: str) -> str:
+        return requested if requested in PRIORITIES else self.settings.default_priority
+
+    async def acquire(self, priority: str) -> Ticket:
+        """Wait for a slot; raise ``QueueFull`` if the query cannot be admitted."""
+        priority = self.priority(priority)
+        if not self.settings.enabled:
+            return self._admit(priority, 0.0)
+        if self.running < self.settings.max_concurrent and not self._waiters:
+            return self._admit(priority, 0.0)
+
+        limit = self.settings.max_queue if priority == "interactive" else self.settings.max_batch_queue
+        if sum(self._queued.values()) >= self.settings.max_queue or self._queued[priority] >= limit:
+            self.rejected += 1
+            raise QueueFull(f"Too many queued {priority} queries", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (PRIORITIES[priority], next(self._sequence), priority, future)
+        heapq.heappush(self._waiters, entry)
+        self._queued[priority] += 1
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.settings.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(entry)
+            self.timed_out += 1
+            raise QueueFull(
+                f"Query waited more than {self.settings.queue_timeout}s for a slot", self.retry_after()
+            )
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+        return self._admit(priority, time.monotonic() - queued_at, handed_off=True)
+
+    def retry_after(self) -> int:
+        """Rough seconds until the current queue drains."""
+        queued = sum(self._queued.values())
+        return max(1, math.ceil(self._service_time * (queued + 1) / self.settings.max_concurrent))
+
+    def _admit(self, priority: str, waited: float, handed_off: bool = False) -> Ticket:
+        # A handed-off slot was already counted as running by ``_release``
+        if not handed_off:
+            self.running += 1
+        self.admitted += 1
+        self._waits.append(waited)
+        QUEUE_WAIT_SECONDS.labels(priority=priority).observe(waited)
+        return Ticket(self, priority)
+
+    def _abandon(self, entry: Tuple[int, int, str, asyncio.Future]):
+        _, _, priority, future = entry
+        if future.done() and not future.cancelled():
+            # The slot was handed over just as the waiter gave up; pass it on
+            self._release(None)
+        else:
+            future.cancel()
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._queued[priority] -= 1
+
+    def _release(self, held: Any):
+        if held is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * held
+        while self._waiters:
+            _, _, priority, future = heapq.heappop(self._waiters)
+            if future.cancelled():
+                continue
+            self._queued[priority] -= 1
+            future.set_result(None)
+            return
+        self.running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def percentile(fraction: float) -> float:
+            return waits[min(len(waits) - 1, int(fraction * len(waits)))] if waits else 0.0
+
+        return {
+            "running": self.running,
+            "queued": dict(self._queued),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_wait_seconds": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": waits[-1] if waits else 0.0
+            }
+        }
@@ -0,0 +1,210 @@
+# cache.py
+
+"""
+Tool result and answer caching.
+
+Keeps results of idempotent MCP tool calls in a bounded TTL + LRU cache so
+repeated agent steps such as ``search_metrics("Revenue")`` do not go back to
+the MCP server every time, and caches final answers to repeated questions.
+"""
+
+import json
+import math
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from llm.config import AnswerCacheConfig, ToolCacheConfig
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a per-entry TTL.
+
+    Memory is bounded both by entry count and by the summed ``size`` that
+    callers report for each entry.
+    """
+
+    def __init__(self, max_entries: int, max_size: int):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)``, dropping the entry if it has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 1):
+        """Store ``value`` for ``ttl`` seconds, evicting least recently used entries."""
+        if ttl <= 0 or size > self.max_size:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+
+class ToolResultCache:
+    """Caches MCP tool results keyed on tool name and canonicalized arguments."""
+
+    def __init__(self, settings: ToolCacheConfig):
+        self.settings = settings
+        self.cache = TTLCache(settings.max_entries, settings.max_size)
+
+    def cacheable(self, tool_name: str) -> bool:
+        """Whether results of ``tool_name`` may be cached at all."""
+        return self.settings.enabled and tool_name not in self.settings.excluded_tools and self.ttl(tool_name) > 0
+
+    def ttl(self, tool_name: str) -> float:
+        return self.settings.tool_ttls.get(tool_name, self.settings.default_ttl)
+
+    @staticmethod
+    def key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Canonical cache key: argument order and JSON spacing do not matter."""
+        return json.dumps([tool_name, arguments], sort_keys=True, separators=(",", ":"), default=str)
+
+    def get(self, tool_name: str, arguments: Dict[str, Any]) -> Tuple[bool, Any]:
+        return self.cache.get(self.key(tool_name, arguments))
+
+    def set(self, tool_name: str, arguments: Dict[str, Any], value: Any, size: int):
+        self.cache.set(self.key(tool_name, arguments), value, self.ttl(tool_name), size)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_STOPWORDS = frozenset(
+    "a an the is are was were be do does did of in on for to at by with and or "
+    "what which who me my i you please can could would".split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_PUNCTUATION.sub(" ", query.lower()).split())
+
+
+def hash_vector(text: str, dimensions: int = 1 << 18) -> Dict[int, float]:
+    """L2-normalized hashed bag of words and word bigrams.
+
+    A dependency-free stand-in for an embedding model: enough to match
+    rephrasings that share most of their words.
+    """
+    words = [word for word in text.split() if word not in _STOPWORDS]
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector: Dict[int, float] = {}
+    for feature in features:
+        index = zlib.crc32(feature.encode()) % dimensions
+        vector[index] = vector.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {index: weight / norm for index, weight in vector.items()} if norm else {}
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+class AnswerCache:
+    """Caches final agent answers to history-free queries.
+
+    Lookups hit on the normalized query text and, when enabled, on the most
+    similar cached query above ``semantic_threshold``.
+    """
+
+    def __init__(self, settings: AnswerCacheConfig):
+        self.settings = settings
+        self.cache = TTLCache(settings.max_entries, settings.max_entries)
+        self.semantic_hits = 0
+        self._vectors: "OrderedDict[str, Dict[int, float]]" = OrderedDict()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        if not self.settings.enabled:
+            return None
+        key = normalize_query(query)
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        if self.settings.semantic_enabled:
+            match = self._most_similar(key)
+            if match is not None:
+                found, value = self.cache.get(match)
+                if found:
+                    # The miss recorded for the exact lookup was answered after all
+                    self.cache.misses -= 1
+                    self.semantic_hits += 1
+                    return value
+        return None
+
+    def set(self, query: str, result: Dict[str, Any]):
+        if not self.settings.enabled:
+            return
+        key = normalize_query(query)
+        self.cache.set(key, result, self.settings.ttl)
+        if self.settings.semantic_enabled:
+            self._vectors[key] = hash_vector(key)
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.settings.max_entries:
+                self._vectors.popitem(last=False)
+
+    def clear(self):
+        self.cache.clear()
+        self._vectors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "semantic_hits": self.semantic_hits}
+
+    def _most_similar(self, key: str) -> Optional[str]:
+        vector = hash_vector(key)
+        best, best_score = None, self.settings.semantic_threshold
+        for candidate, candidate_vector in self._vectors.items():
+            score = cosine(vector, candidate_vector)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
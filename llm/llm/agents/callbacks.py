@@ -0,0 +1,47 @@
+# callbacks.py
+
+"""
+LangChain callbacks that record a tracing span and token counts for every LLM call.
+"""
+
+from typing import Any, Dict
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from llm.monitoring import record_tokens
+from llm.tracing import Span, tracer
+
+
+class LLMSpanHandler(AsyncCallbackHandler):
+    """Opens an ``llm`` span when a model call starts and closes it when it ends."""
+
+    def __init__(self):
+        self.spans: Dict[UUID, Span] = {}
+
+    def _start(self, serialized: Dict[str, Any], run_id: UUID):
+        model = ((serialized or {}).get("kwargs") or {}).get("model_name") or (serialized or {}).get("name")
+        self.spans[run_id] = tracer.start_span("llm call", "llm", model=model)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        self._start(serialized, run_id)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        self._start(serialized, run_id)
+
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any):
+        span = self.spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        span.attributes.update({
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens")
+        })
+        record_tokens(span.attributes.get("model"), usage)
+        tracer.end_span(span)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        span = self.spans.pop(run_id, None)
+        if span is not None:
+            tracer.end_span(span, error)
@@ -7,8 +7,10 @@ Handles initialization and execution of the LLM agent with its tools.
 """
 
 import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -18,9 +20,16 @@ from langchain.agents.format_scratchpad import format_to_openai_function_message
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
 from langchain.agents import create_openai_functions_agent
 
-from agents.mcp import MCPServerSse
+from pydantic import AnyUrl
 from llm.config import config
-from llm.agents.tools import make_structured_tool
+from llm.agents.pool import MCPConnectionPool
+from llm.agents.tools import call_mcp_tool, limit_tool_concurrency, make_structured_tool
+from llm.agents.cache import AnswerCache, ToolResultCache, normalize_query
+from llm.agents.callbacks import LLMSpanHandler
+from llm.agents.router import QueryRouter
+from llm.agents.singleflight import SingleFlight
+from llm.monitoring import QUERIES_IN_FLIGHT, QUERY_SECONDS, timed
+from llm.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -30,57 +39,60 @@ class AgentManager:
 
     def __init__(self):
         self.agent_executor: Optional[AgentExecutor] = None
-        self.mcp_server: Optional[MCPServerSse] = None
+        self.mcp_pool: Optional[MCPConnectionPool] = None
+        self.router: Optional[QueryRouter] = None
+        self.tools: Dict[str, Any] = {}
+        self.tool_cache = ToolResultCache(config.tool_cache)
+        self.answer_cache = AnswerCache(config.answer_cache)
+        self.inflight = SingleFlight()
+        self.llm_spans = LLMSpanHandler()
+        self.catalog_version: Optional[str] = None
+        self._catalog_checked_at = 0.0
 
     async def initialize(self):
         """Initialize the agent by connecting to MCP server and setting up tools."""
         logger.info("🔄 Initializing agent...")
 
-        max_retries = 5
-        retry_delay = 5
-
-        for attempt in range(max_retries):
-            try:
-                self.mcp_server = MCPServerSse(
-                    params={"url": config.fastmcp_url},
-                    cache_tools_list=True
-                )
-                await self.mcp_server.connect()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"⚠️ MCP connection failed (attempt {attempt + 1}/{max_retries}): {e}")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    logger.error(f"❌ Could not connect to MCP after {max_retries} attempts: {e}")
-                    raise
-
-        tools = [make_structured_tool(t, self.mcp_server) for t in await self.mcp_server.list_tools()]
+        # The pool keeps retrying with backoff until startup_timeout expires
+        self.mcp_pool = MCPConnectionPool(config.fastmcp_url, config.mcp_pool)
+        try:
+            await self.mcp_pool.start()
+        except Exception as e:
+            logger.error(f"❌ Could not connect to MCP: {e}")
+            raise
+
+        tools = [
+            make_structured_tool(t, self.mcp_pool, self.tool_cache)
+            for t in await self.mcp_pool.list_tools()
+        ]
         logger.info(f"🧰 Tools discovered: {[t.name for t in tools]}")
+        self.tools = {t.name: t for t in tools}
+        if config.agent.router_enabled:
+            self.router = QueryRouter(self.tools)
 
         llm = ChatOpenAI(
             api_key=config.openai_api_key,
+            base_url=config.openai_base_url,
             model="gpt-4",
             temperature=0
         )
 
         prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful AI assistant that uses tools to answer questions."),
+            ("system", "You are a helpful AI assistant that uses tools to answer questions. "
+                       "When a question involves several metrics, domains or dashboards, "
+                       "request the tool calls for all of them at once."),
             MessagesPlaceholder(variable_name="chat_history", optional=True),
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad")
         ])
 
-        # Create the agent with the correct configuration
-        from langchain.agents import create_openai_functions_agent
-        from langchain.agents.format_scratchpad import format_to_openai_function_messages
-        from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
-
-        agent = create_openai_functions_agent(
-            llm=llm,
-            tools=tools,
-            prompt=prompt
-        )
+        # The tools agent can return several tool calls per step; AgentExecutor
+        # runs the calls of one step concurrently with asyncio.gather
+        if config.agent.mode == "functions":
+            agent = create_openai_functions_agent(llm=llm, tools=tools, prompt=prompt)
+        else:
+            agent = create_openai_tools_agent(llm=llm, tools=tools, prompt=prompt)
+        logger.info(f"🤖 Agent mode: {config.agent.mode}")
 
         # Create the executor with the agent
         self.agent_executor = AgentExecutor.from_agent_and_tools(
@@ -96,23 +108,71 @@ class AgentManager:
 
     async def cleanup(self):
         """Clean up resources when shutting down."""
-        if self.mcp_server:
-            await self.mcp_server.disconnect()
-            self.mcp_server = None
+        if self.mcp_pool:
+            await self.mcp_pool.stop()
+            self.mcp_pool = None
         self.agent_executor = None
 
-    async def execute_query(self, query: str, chat_history: Optional[List] = None) -> Dict[str, Any]:
-        """Execute a query using the agent and return results with step-by-step info."""
-        if not self.agent_executor:
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call an MCP tool directly, bypassing the agent but not the tool cache."""
+        if not self.mcp_pool:
             raise RuntimeError("Agent not initialized")
+        await self.check_catalog_version()
+        return await call_mcp_tool(self.mcp_pool, tool_name, arguments, self.tool_cache)
 
-        chat_history = chat_history or []
+    def stats(self) -> Dict[str, Any]:
+        """Return runtime statistics of the agent's caches."""
+        return {
+            "mcp_pool": self.mcp_pool.stats() if self.mcp_pool else None,
+            "router": self.router.stats() if self.router else None,
+            "single_flight": self.inflight.stats(),
+            "tool_cache": self.tool_cache.stats(),
+            "answer_cache": self.answer_cache.stats(),
+            "catalog_version": self.catalog_version
+        }
+
+    async def database_timing(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Database time the MCP server spent on behalf of one trace, if it recorded any."""
+        try:
+            result = await self.mcp_pool.read_resource(AnyUrl(f"trace://{trace_id}"))
+            return json.loads(result.contents[0].text)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read MCP timings for trace {trace_id}: {e}")
+            return None
+
+    async def check_catalog_version(self):
+        """Drop cached answers and tool results once the MCP catalog changes.
+
+        The version is read from the ``catalog://version`` resource at most
+        every ``version_check_interval`` seconds.
+        """
+        now = time.monotonic()
+        if now - self._catalog_checked_at < config.answer_cache.version_check_interval:
+            return
+        self._catalog_checked_at = now
+        try:
+            result = await self.mcp_pool.read_resource(AnyUrl("catalog://version"))
+            version = result.contents[0].text
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read catalog version: {e}")
+            return
+        if self.catalog_version is not None and version != self.catalog_version:
+            logger.info(f"📦 Catalog changed ({self.catalog_version} -> {version}), clearing caches")
+            self.answer_cache.clear()
+            self.tool_cache.clear()
+        self.catalog_version = version
 
-        result = await self.agent_executor.ainvoke({
-            "input": query,
-            "chat_history": chat_history
-        })
+    async def _cached_answer(self, query: str, chat_history: List) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return whether the query's answer is cacheable, and the cached answer if any."""
+        # Earlier assistant-only messages (e.g. the greeting) do not change the answer
+        cacheable = not any(message.get("type") == "human" for message in chat_history)
+        if not cacheable:
+            return False, None
+        await self.check_catalog_version()
+        return True, self.answer_cache.get(query)
 
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
         tool_usage = []
         for step in result["intermediate_steps"]:
             action, observation = step
@@ -127,3 +187,103 @@ class AgentManager:
             "final_response": result["output"],
             "tool_usage": tool_usage
         }
+
+    async def execute_query(self, query: str, chat_history: Optional[List] = None) -> Dict[str, Any]:
+        """Execute a query using the agent and return results with step-by-step info."""
+        if not self.agent_executor:
+            raise RuntimeError("Agent not initialized")
+
+        chat_history = chat_history or []
+        # Identical questions asked at the same time (e.g. from a shared link) run once
+        key = json.dumps([normalize_query(query), chat_history], sort_keys=True, default=str)
+        with timed(QUERY_SECONDS, QUERIES_IN_FLIGHT):
+            result, timings = await self.inflight.do(key, lambda: self._timed_query(query, chat_history))
+        # Coalesced callers report the timings of the call that answered them
+        tracer.add_timings(timings)
+        return result
+
+    async def _timed_query(self, query: str, chat_history: List) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Run the query, returning its result and the LLM, tool and database time it took."""
+        timings = tracer.collect_timings()
+        result = await self._execute_query(query, chat_history)
+        span = tracer.current()
+        if timings.get("tool") and span is not None:
+            # Only the leader's trace id has database time recorded on the MCP server
+            database = await self.database_timing(span.trace_id)
+            if database is not None:
+                timings["database"] = database.get("database_ms", 0.0)
+        return result, dict(timings)
+
+    async def _execute_query(self, query: str, chat_history: List) -> Dict[str, Any]:
+        if self.router:
+            routed = await self.router.route(query)
+            if routed is not None:
+                return routed
+
+        cacheable, cached = await self._cached_answer(query, chat_history)
+        if cached is not None:
+            return cached
+
+        limit_tool_concurrency(config.agent.max_parallel_tools)
+        result = await self.agent_executor.ainvoke(
+            {"input": query, "chat_history": chat_history},
+            config={"callbacks": [self.llm_spans]}
+        )
+
+        response = self._format_result(result)
+        if cacheable:
+            self.answer_cache.set(query, response)
+        return response
+
+    async def stream_query(self, query: str, chat_history: Optional[List] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a query, yielding events as the agent produces them.
+
+        Yields ``token`` events for LLM output, ``tool_start``/``tool_end``
+        around each tool call, and one ``final`` event carrying the same
+        payload ``execute_query`` returns.
+        """
+        if not self.agent_executor:
+            raise RuntimeError("Agent not initialized")
+
+        chat_history = chat_history or []
+        if self.router:
+            routed = await self.router.route(query)
+            if routed is not None:
+                for step in routed["tool_usage"]:
+                    yield {"event": "tool_start", "data": {"tool_name": step["tool_name"], "tool_input": step["tool_input"]}}
+                    yield {"event": "tool_end", "data": {"tool_name": step["tool_name"], "tool_output": step["tool_output"]}}
+                yield {"event": "final", "data": routed}
+                return
+
+        cacheable, cached = await self._cached_answer(query, chat_history)
+        if cached is not None:
+            yield {"event": "final", "data": cached}
+            return
+
+        limit_tool_concurrency(config.agent.max_parallel_tools)
+        async for event in self.agent_executor.astream_events(
+            {"input": query, "chat_history": chat_history},
+            config={"callbacks": [self.llm_spans]},
+            version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield {"event": "token", "data": {"content": content}}
+            elif kind == "on_tool_start":
+                yield {
+                    "event": "tool_start",
+                    "data": {"tool_name": event["name"], "tool_input": event["data"].get("input")}
+                }
+            elif kind == "on_tool_end":
+                yield {
+                    "event": "tool_end",
+                    "data": {"tool_name": event["name"], "tool_output": event["data"].get("output")}
+                }
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # The outermost run is the AgentExecutor itself
+                response = self._format_result(event["data"]["output"])
+                if cacheable:
+                    self.answer_cache.set(query, response)
+                yield {"event": "final", "data": response}
@@ -0,0 +1,155 @@
+# history.py
+
+"""
+Chat history compaction.
+
+Turns the chat history sent by the frontend into agent messages that fit a
+token budget: the most recent turns are kept verbatim, older turns collapse
+into a one-line-per-turn summary, and large structured attachments (metric
+lists, metric details) are replaced by short references.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from llm.config import HistoryConfig
+
+logger = logging.getLogger(__name__)
+
+# Structured attachments a chat message may carry, with their agent-facing labels
+ATTACHMENTS = {
+    "metrics": "Available metrics",
+    "metric_details": "Metric details",
+    "domain_metrics": "Domain metrics",
+    "dashboard_metrics": "Dashboard metrics",
+}
+
+
+def load_token_counter(model: str) -> Callable[[str], int]:
+    """Return a token counter for ``model``, estimating if tiktoken is unavailable."""
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model(model)
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception as e:
+        logger.warning(f"⚠️ tiktoken unavailable for {model}, estimating tokens: {e}")
+        return lambda text: (len(text) + 3) // 4
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class HistoryManager:
+    """Builds token-budgeted agent history from chat messages."""
+
+    def __init__(self, settings: HistoryConfig, model: str):
+        self.settings = settings
+        self.model = model
+        self._count: Optional[Callable[[str], int]] = None
+
+    def count(self, text: str) -> int:
+        # Loading the tokenizer can hit the network; defer it to first use
+        if self._count is None:
+            self._count = load_token_counter(self.model)
+        return self._count(text)
+
+    def build(self, chat_history: List[Any]) -> List[Dict[str, str]]:
+        """Return agent messages for ``chat_history`` within ``max_tokens``."""
+        turns = self._split_turns(chat_history)
+        recent = turns[-self.settings.keep_turns:] if self.settings.keep_turns else []
+        older = turns[:len(turns) - len(recent)]
+
+        summary = [self._summarize(turn) for turn in older]
+        recent_messages = [self._turn_messages(turn) for turn in recent]
+
+        # Drop the oldest material first until everything fits
+        while True:
+            messages = self._assemble(summary, recent_messages)
+            if sum(self.count(message["content"]) for message in messages) <= self.settings.max_tokens:
+                return messages
+            if summary:
+                summary.pop(0)
+            elif len(recent_messages) > 1:
+                recent_messages.pop(0)
+            else:
+                break
+
+        # The last turn alone is over budget: shorten its messages evenly
+        last_turn = recent_messages[0]
+        share = self.settings.max_tokens // len(last_turn)
+        return [
+            {**message, "content": self._truncate(message["content"], share)}
+            for message in last_turn
+        ]
+
+    @staticmethod
+    def _split_turns(chat_history: List[Any]) -> List[List[Any]]:
+        """Group messages into turns, each starting at a user message."""
+        turns: List[List[Any]] = []
+        for message in chat_history:
+            if message.role == "user" or not turns:
+                turns.append([])
+            turns[-1].append(message)
+        return turns
+
+    def _turn_messages(self, turn: List[Any]) -> List[Dict[str, str]]:
+        messages = []
+        for message in turn:
+            messages.append({
+                "type": "human" if message.role == "user" else "assistant",
+                "content": message.content
+            })
+            for field, label in ATTACHMENTS.items():
+                value = getattr(message, field, None)
+                if value:
+                    messages.append({"type": "system", "content": f"{label}: {self._attachment(value)}"})
+        return messages
+
+    def _attachment(self, value: Any) -> str:
+        """Inline an attachment as compact JSON, or reference it if it is too large."""
+        text = ", ".join(map(str, value)) if isinstance(value, list) else compact_json(value)
+        if self.count(text) <= self.settings.max_attachment_tokens:
+            return text
+        if isinstance(value, list):
+            preview = ", ".join(map(str, value[:self.settings.attachment_preview_items]))
+            return f"{len(value)} items, e.g. {preview} (ask a tool for the full list)"
+        if isinstance(value, dict) and value.get("name"):
+            return f"details of '{value['name']}' with fields {', '.join(value)} (ask a tool for the full details)"
+        return self._truncate(text, self.settings.max_attachment_tokens)
+
+    def _summarize(self, turn: List[Any]) -> str:
+        question = " ".join(message.content for message in turn if message.role == "user")
+        answer = " ".join(message.content for message in turn if message.role != "user")
+        limit = self.settings.summary_tokens_per_turn
+        if question:
+            return f"- User: {self._truncate(question, limit)} | Assistant: {self._truncate(answer, limit)}"
+        return f"- Assistant: {self._truncate(answer, limit)}"
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        text = " ".join(text.split())
+        if self.count(text) <= max_tokens:
+            return text
+        # Cut on word boundaries; counting whole prefixes keeps this tokenizer-agnostic
+        words = text.split(" ")
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count(" ".join(words[:middle])) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return " ".join(words[:low]) + " …"
+
+    @staticmethod
+    def _assemble(summary: List[str], recent_messages: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        messages = []
+        if summary:
+            messages.append({
+                "type": "system",
+                "content": "Summary of earlier conversation:\n" + "\n".join(summary)
+            })
+        for turn in recent_messages:
+            messages.extend(turn)
+        return messages
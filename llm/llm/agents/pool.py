@@ -0,0 +1,237 @@
+# pool.py
+
+"""
+Pool of MCP client connections.
+
+Spreads tool calls from concurrent requests over several ``MCPServerSse``
+sessions, probes idle sessions with pings and reconnects dropped ones with
+exponential backoff, so one broken SSE stream does not fail every request.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from agents.mcp import MCPServerSse
+from llm.config import MCPPoolConfig
+from llm.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class MCPUnavailable(RuntimeError):
+    """Raised when no pooled MCP connection is healthy."""
+    pass
+
+
+class PooledConnection:
+    """One MCP session plus the bookkeeping the pool needs to schedule it."""
+
+    def __init__(self, index: int, url: str):
+        self.index = index
+        self.url = url
+        self.server: Optional[MCPServerSse] = None
+        self.healthy = False
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.reconnects = 0
+        self.connected_once = False
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        self.last_used = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "reconnects": self.reconnects
+        }
+
+
+class MCPConnectionPool:
+    """Dispatches MCP requests over a fixed number of supervised sessions.
+
+    Connections are opened, probed and closed only by the supervisor task:
+    the SSE client keeps anyio scopes that must be exited by the task that
+    entered them. Callers just mark a connection unhealthy on failure.
+    """
+
+    def __init__(self, url: str, settings: MCPPoolConfig):
+        self.url = url
+        self.settings = settings
+        self.connections = [PooledConnection(index, url) for index in range(settings.size)]
+        self._turn = itertools.count()
+        self._wake = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> List[PooledConnection]:
+        return [connection for connection in self.connections if connection.healthy]
+
+    async def start(self):
+        """Start the supervisor and wait until at least one connection is up."""
+        self._supervisor = asyncio.create_task(self._supervise())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=self.settings.startup_timeout)
+        except asyncio.TimeoutError:
+            await self.stop()
+            raise MCPUnavailable(
+                f"Could not connect to MCP at {self.url} within {self.settings.startup_timeout}s"
+            )
+        logger.info(f"🔌 MCP pool ready: {len(self.healthy)}/{len(self.connections)} connections")
+
+    async def stop(self):
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        # The trace context travels in the request's _meta, which MCP reserves for such data
+        span = tracer.current()
+        meta = {"traceparent": span.traceparent} if span is not None else None
+        return await self._dispatch(lambda server: server.session.call_tool(tool_name, arguments, meta=meta))
+
+    async def list_tools(self) -> List[Any]:
+        return await self._dispatch(lambda server: server.list_tools())
+
+    async def read_resource(self, uri: Any) -> Any:
+        return await self._dispatch(lambda server: server.session.read_resource(uri))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.connections),
+            "healthy": len(self.healthy),
+            "connections": [connection.stats() for connection in self.connections]
+        }
+
+    def _pick(self, exclude: set) -> Optional[PooledConnection]:
+        candidates = [c for c in self.healthy if c.index not in exclude]
+        if not candidates:
+            return None
+        # Rotate the starting point so ties do not always land on the first connection
+        offset = next(self._turn) % len(candidates)
+        candidates = candidates[offset:] + candidates[:offset]
+        if self.settings.dispatch == "round_robin":
+            return candidates[0]
+        return min(candidates, key=lambda connection: connection.in_flight)
+
+    async def _dispatch(self, request) -> Any:
+        """Run ``request`` on a healthy connection, retrying others if it drops."""
+        tried: set = set()
+        last_error: Optional[BaseException] = None
+        for _ in range(self.settings.retries + 1):
+            connection = self._pick(tried)
+            if connection is None:
+                break
+            tried.add(connection.index)
+            connection.in_flight += 1
+            connection.calls += 1
+            connection.last_used = time.monotonic()
+            try:
+                return await asyncio.wait_for(request(connection.server), timeout=self.settings.call_timeout)
+            except asyncio.TimeoutError as e:
+                # A slow call is not a dead stream; do not retry or drop the connection
+                raise TimeoutError(f"MCP call timed out after {self.settings.call_timeout}s") from e
+            except (ConnectionError, OSError, EOFError) as e:
+                last_error = e
+                self._mark_failed(connection, e)
+            except Exception as e:
+                # Transport errors surface as assorted anyio/httpx exceptions; only a
+                # failing ping tells them apart from errors raised by the tool itself
+                if await self._alive(connection):
+                    raise
+                last_error = e
+                self._mark_failed(connection, e)
+            finally:
+                connection.in_flight -= 1
+        raise MCPUnavailable(f"No healthy MCP connection: {last_error}")
+
+    async def _alive(self, connection: PooledConnection) -> bool:
+        try:
+            await asyncio.wait_for(connection.server.session.send_ping(), timeout=self.settings.ping_timeout)
+            return True
+        except Exception:
+            return False
+
+    def _mark_failed(self, connection: PooledConnection, error: Any):
+        if connection.healthy:
+            logger.warning(f"⚠️ MCP connection {connection.index} failed, reconnecting: {error}")
+            connection.healthy = False
+            connection.failures += 1
+            self._wake.set()
+
+    async def _supervise(self):
+        try:
+            while True:
+                await self._maintain()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._next_wakeup())
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            for connection in self.connections:
+                await self._close(connection)
+
+    def _next_wakeup(self) -> float:
+        now = time.monotonic()
+        pending = [c.retry_at - now for c in self.connections if not c.healthy]
+        return max(0.05, min(pending + [self.settings.health_interval]))
+
+    async def _maintain(self):
+        now = time.monotonic()
+        for connection in self.connections:
+            if not connection.healthy:
+                if now >= connection.retry_at:
+                    await self._reconnect(connection)
+            elif not connection.in_flight and now - connection.last_used >= self.settings.health_interval:
+                if not await self._alive(connection):
+                    self._mark_failed(connection, "ping failed")
+                    await self._reconnect(connection)
+
+    async def _reconnect(self, connection: PooledConnection):
+        await self._close(connection)
+        server = MCPServerSse(params={"url": self.url}, cache_tools_list=True)
+        try:
+            await asyncio.wait_for(server.connect(), timeout=self.settings.connect_timeout)
+        except Exception as e:
+            connection.backoff = min(
+                max(connection.backoff * 2, self.settings.backoff_initial),
+                self.settings.backoff_max
+            )
+            connection.retry_at = time.monotonic() + connection.backoff
+            logger.warning(
+                f"⚠️ MCP connection {connection.index} could not connect, retrying in {connection.backoff:.1f}s: {e}"
+            )
+            try:
+                await server.cleanup()
+            except Exception:
+                pass
+            return
+        if connection.connected_once:
+            connection.reconnects += 1
+        connection.connected_once = True
+        connection.server = server
+        connection.healthy = True
+        connection.backoff = 0.0
+        connection.last_used = time.monotonic()
+        self._ready.set()
+
+    async def _close(self, connection: PooledConnection):
+        server, connection.server = connection.server, None
+        connection.healthy = False
+        if server is not None:
+            try:
+                await server.cleanup()
+            except Exception as e:
+                logger.debug(f"MCP connection {connection.index} cleanup failed: {e}")
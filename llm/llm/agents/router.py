@@ -0,0 +1,222 @@
+# router.py
+
+"""
+Deterministic fast path for catalog lookups.
+
+Recognizes templated and commonly phrased lookup queries ("Get details for
+metric: X", "List all metrics in domain: X", "list domains", ...) and answers
+them with a direct MCP tool call instead of an LLM round trip. Results have
+the same ``final_response``/``tool_usage`` shape ``AgentManager`` returns;
+queries that match no route, or whose lookup finds nothing, fall through to
+the agent.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words that start a further clause; a bare name stops before them, so
+# "domain Finance and who owns it" is not read as a lookup of that whole phrase
+_CLAUSE = r"\s+(?:and|or|with|vs|versus|compare|compared|who|which|that|but)\b"
+# A quoted name (taken verbatim) or a bare name ending before any further clause
+_ENTITY = (
+    r"""(?P<q_{group}>['"“])?(?P<{group}>(?(q_{group})[^'"”]+"""
+    rf"""|(?:(?!{_CLAUSE})[^'"”])+?))(?(q_{{group}})['"”])"""
+)
+_END = r"\s*[?.!]?"
+
+
+def _pattern(template: str) -> re.Pattern:
+    """Compile a route template; ``{name}``-style fields become entity groups."""
+    regex = re.sub(r"\{(\w+)\}", lambda m: _ENTITY.replace("{group}", m.group(1)), template)
+    return re.compile(rf"\s*{regex}{_END}\s*", re.IGNORECASE)
+
+
+_DETAILS = r"(?:(?:get|show|give me|fetch)\s+)?(?:the\s+)?(?:details|info|information)\s+(?:for|of|about|on)\s+(?:the\s+)?"
+_DESCRIBE = r"(?:tell me about|describe)\s+(?:the\s+)?"
+_LIST_IN = r"(?:(?:list|show|get|give me|which are|what are)(?:\s+me)?\s+)?(?:all\s+)?(?:the\s+)?metrics\s+(?:in|of|for|on)\s+(?:the\s+)?"
+_LIST = r"(?:(?:list|show|get|give me|what are)(?:\s+me)?\s+)?(?:all\s+)?(?:the\s+)?(?:available\s+)?"
+_SEARCH = r"(?:search|find|look up|lookup)(?:\s+for)?\s+"
+_PATH = r"(?:(?:find|show|get|what is)\s+)?(?:the\s+|a\s+)?(?:shortest\s+)?(?:path|connection)s?\s+(?:between|from)\s+"
+
+
+@dataclass(frozen=True)
+class Route:
+    """A lookup intent: query patterns and the tools that can answer it.
+
+    ``tools`` lists ``(tool name, {argument: pattern group})`` pairs in order
+    of preference; the first tool the MCP server exposes is used.
+    """
+    intent: str
+    # Describes what was looked up, formatted with the pattern groups
+    subject: str
+    patterns: Tuple[re.Pattern, ...]
+    tools: Tuple[Tuple[str, Dict[str, str]], ...]
+    fixed_arguments: Tuple[Tuple[str, Any], ...] = ()
+
+
+ROUTES = (
+    Route(
+        "metric_details",
+        "metric '{name}'",
+        (_pattern(_DETAILS + r"metric\b:?\s*{name}"), _pattern(_DESCRIBE + r"metric\b:?\s*{name}")),
+        (("get_metric_details", {"metric_name": "name"}), ("search_metrics", {"name": "name"})),
+    ),
+    Route(
+        "domain_metrics",
+        "metrics in domain '{name}'",
+        (_pattern(_LIST_IN + r"domain\b:?\s*{name}"),),
+        (("get_domain_metrics", {"domain_name": "name"}),),
+    ),
+    Route(
+        "dashboard_metrics",
+        "metrics in dashboard '{name}'",
+        (_pattern(_LIST_IN + r"dashboard\b:?\s*{name}"),),
+        (("get_dashboard_metrics", {"dashboard_name": "name"}),),
+    ),
+    Route(
+        "domain_details",
+        "domain '{name}'",
+        (_pattern(_DETAILS + r"domain\b:?\s*{name}"), _pattern(_DESCRIBE + r"domain\b:?\s*{name}")),
+        (("get_domain_details", {"domain_name": "name"}),),
+    ),
+    Route(
+        "dashboard_details",
+        "dashboard '{name}'",
+        (_pattern(_DETAILS + r"dashboard\b:?\s*{name}"), _pattern(_DESCRIBE + r"dashboard\b:?\s*{name}")),
+        (("get_dashboard_details", {"dashboard_name": "name"}), ("list_dashboards", {"name": "name"})),
+    ),
+    Route(
+        "dashboard_path",
+        "paths between dashboards '{first}' and '{second}'",
+        (_pattern(_PATH + r"(?:the\s+)?dashboards?\b:?\s*{first}\s+(?:and|to)\s+(?:dashboard\b:?\s*)?{second}"),),
+        (("find_dashboard_path", {"dashboard1": "first", "dashboard2": "second"}),),
+    ),
+    Route(
+        "domain_path",
+        "paths between domains '{first}' and '{second}'",
+        (_pattern(_PATH + r"(?:the\s+)?domains?\b:?\s*{first}\s+(?:and|to)\s+(?:domain\b:?\s*)?{second}"),),
+        (("find_domain_path", {"domain1": "first", "domain2": "second"}),),
+    ),
+    Route(
+        "search_metrics",
+        "metrics matching '{name}'",
+        (_pattern(_SEARCH + r"metrics?\s+(?:matching|named|called|like|for)\s+{name}"),),
+        (("search_metrics", {"name": "name"}),),
+    ),
+    Route(
+        "search_dashboards",
+        "dashboards matching '{name}'",
+        (_pattern(_SEARCH + r"dashboards?\s+(?:matching|named|called|like|for)\s+{name}"),),
+        (("list_dashboards", {"name": "name"}),),
+    ),
+    Route("list_metrics", "metrics", (_pattern(_LIST + r"metrics"),), (("list_metrics", {}),)),
+    Route("list_domains", "domains", (_pattern(_LIST + r"domains"),), (("list_domains", {}),)),
+    Route("list_dashboards", "dashboards", (_pattern(_LIST + r"dashboards"),), (("list_dashboards", {}),), (("name", ""),)),
+)
+
+
+def _names(value: Any) -> Optional[List[str]]:
+    """Names in a list-like tool output, or None if it is not list-like."""
+    if isinstance(value, dict) and isinstance(value.get("items"), list):
+        value = value["items"]
+    if not isinstance(value, list):
+        return None
+    names = []
+    for item in value:
+        if isinstance(item, dict):
+            if item.get("nodes"):
+                names.append(" → ".join(map(str, item["nodes"])))
+            else:
+                names.append(str(item.get("name", item)))
+        else:
+            names.append(str(item))
+    return names
+
+
+def _found(output: Any) -> bool:
+    """Whether a tool output holds an answer, rather than nothing or an error."""
+    if isinstance(output, str):
+        # make_structured_tool reports failures as text instead of raising
+        return bool(output) and not output.startswith("Error executing tool")
+    names = _names(output)
+    if names is not None:
+        return bool(names)
+    return output is not None and output != {}
+
+
+def render(subject: str, output: Any) -> str:
+    """Plain-text answer for a routed lookup."""
+    if isinstance(output, str):
+        return output or f"No results found for {subject}."
+    names = _names(output)
+    if names is not None:
+        if not names:
+            return f"No results found for {subject}."
+        total = output.get("total") if isinstance(output, dict) else None
+        more = f" (showing {len(names)} of {total})" if total and total > len(names) else ""
+        return f"Found {len(names)} result(s) for {subject}{more}:\n" + "\n".join(f"- {name}" for name in names)
+    if isinstance(output, dict):
+        if not output:
+            return f"No results found for {subject}."
+        lines = [
+            f"- {key}: {value if isinstance(value, (str, int, float)) else json.dumps(value, default=str)}"
+            for key, value in output.items()
+        ]
+        return f"Details for {subject}:\n" + "\n".join(lines)
+    return json.dumps(output, default=str)
+
+
+class QueryRouter:
+    """Matches lookup queries to routes and answers them with direct tool calls."""
+
+    def __init__(self, tools: Dict[str, Any]):
+        # LangChain tools by name, so routed calls share the tool cache and limits
+        self.tools = tools
+        self.routed: Dict[str, int] = {}
+
+    def match(self, query: str) -> Optional[Tuple[Route, str, str, Dict[str, Any]]]:
+        """Return the route, subject, tool name and tool arguments for ``query``, if any."""
+        for route in ROUTES:
+            for pattern in route.patterns:
+                found = pattern.fullmatch(query)
+                if not found:
+                    continue
+                for tool_name, argument_groups in route.tools:
+                    if tool_name in self.tools:
+                        arguments = {arg: found.group(group).strip() for arg, group in argument_groups.items()}
+                        arguments.update(route.fixed_arguments)
+                        return route, route.subject.format(**found.groupdict()), tool_name, arguments
+                return None
+        return None
+
+    async def route(self, query: str) -> Optional[Dict[str, Any]]:
+        """Answer ``query`` without the LLM, or return None to fall through."""
+        matched = self.match(query)
+        if matched is None:
+            return None
+        route, subject, tool_name, arguments = matched
+        logger.info(f"⚡ Routed '{query}' to {tool_name} ({route.intent})")
+        output = await self.tools[tool_name].ainvoke(arguments)
+        if not _found(output):
+            # Unknown name or misread question: let the agent handle it
+            logger.info(f"↪️ No direct answer from {tool_name}; falling through to the agent")
+            return None
+        self.routed[route.intent] = self.routed.get(route.intent, 0) + 1
+
+        return {
+            "final_response": render(subject, output),
+            "tool_usage": [{
+                "tool_name": tool_name,
+                "thought": f"Matched the '{route.intent}' lookup; called {tool_name} directly without the LLM.",
+                "tool_input": arguments,
+                "tool_output": output
+            }]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"routed": sum(self.routed.values()), "by_intent": dict(self.routed)}
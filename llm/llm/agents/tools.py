@@ -1,8 +1,83 @@
-from typing import Any, List, Dict
+import asyncio
+import logging
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, List, Dict, Optional
 from pydantic import create_model, Field
 from langchain.tools import StructuredTool
 import json
 
+from llm.agents.cache import ToolResultCache
+from llm.monitoring import TOOL_CALLS_IN_FLIGHT, TOOL_SECONDS, timed
+from llm.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Per-request cap on concurrent MCP calls; tasks spawned for parallel tool
+# calls inherit the semaphore through their copied context
+_tool_slots: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("tool_slots", default=None)
+
+
+# Tool results shared by every query of a batch, keyed like the tool cache
+_shared_results: ContextVar[Optional[Dict[str, asyncio.Future]]] = ContextVar("shared_results", default=None)
+
+
+def limit_tool_concurrency(max_parallel: int):
+    """Allow at most ``max_parallel`` concurrent tool calls in the current request."""
+    _tool_slots.set(asyncio.Semaphore(max_parallel))
+
+
+def share_tool_results():
+    """Share tool results among all tasks started from the current context.
+
+    Unlike the TTL cache, shared results do not expire while the batch runs,
+    and concurrent identical calls wait for the first one.
+    """
+    _shared_results.set({})
+
+
+class ToolCallError(Exception):
+    """Raised when an MCP tool reports an error result."""
+    pass
+
+
+async def call_mcp_tool(mcp_server, tool_name: str, arguments: Dict[str, Any], cache: Optional[ToolResultCache] = None) -> Any:
+    """Call an MCP tool and decode its JSON output, using ``cache`` for cacheable tools."""
+    shared = _shared_results.get()
+    if shared is None or (cache is not None and tool_name in cache.settings.excluded_tools):
+        return await _call_mcp_tool(mcp_server, tool_name, arguments, cache)
+    key = ToolResultCache.key(tool_name, arguments)
+    if key not in shared:
+        shared[key] = asyncio.ensure_future(_call_mcp_tool(mcp_server, tool_name, arguments, cache))
+        # Failed calls are not shared; the next query retries them
+        shared[key].add_done_callback(
+            lambda task: shared.pop(key, None) if task.cancelled() or task.exception() else None
+        )
+    return await asyncio.shield(shared[key])
+
+
+async def _call_mcp_tool(mcp_server, tool_name: str, arguments: Dict[str, Any], cache: Optional[ToolResultCache]) -> Any:
+    use_cache = cache is not None and cache.cacheable(tool_name)
+    if use_cache:
+        found, value = cache.get(tool_name, arguments)
+        if found:
+            return value
+    slots = _tool_slots.get()
+    async with slots if slots is not None else nullcontext():
+        with tracer.span(f"mcp {tool_name}", "tool", tool=tool_name, input=json.dumps(arguments, default=str)):
+            result = await mcp_server.call_tool(tool_name, arguments)
+    content = result.content[0].text if result.content else ""
+    if getattr(result, "isError", False):
+        raise ToolCallError(content)
+    try:
+        value = json.loads(content) if content else ""
+    except Exception:
+        value = content
+    if use_cache:
+        cache.set(tool_name, arguments, value, size=len(content))
+    return value
+
+
 def _py_type(jtype: str) -> type:
     return {
         "string":  str,
@@ -13,9 +88,12 @@ def _py_type(jtype: str) -> type:
     }.get(jtype, Any)
 
 
-def make_structured_tool(mcp_tool, mcp_server):
+def make_structured_tool(mcp_tool, mcp_server, cache: Optional[ToolResultCache] = None):
     """
     Build a LangChain StructuredTool from a Fast-MCP tool.
+
+    When a ``cache`` is given, successful results of cacheable tools are
+    served from it for identical arguments.
     """
     # Extract schema from inputSchema
     input_schema = mcp_tool.inputSchema
@@ -30,17 +108,11 @@ def make_structured_tool(mcp_tool, mcp_server):
 
     async def run(**kwargs):
         try:
-            print(f"[DEBUG] 🛠️ Tool '{mcp_tool.name}' input: {kwargs}")
-            result = await mcp_server.call_tool(mcp_tool.name, kwargs)
-            if result.content:
-                content = result.content[0].text
-                try:
-                    return json.loads(content)
-                except Exception:
-                    return content
-            return ""
+            logger.debug(f"🛠️ Tool '{mcp_tool.name}' input: {kwargs}")
+            with timed(TOOL_SECONDS, TOOL_CALLS_IN_FLIGHT, tool=mcp_tool.name):
+                return await call_mcp_tool(mcp_server, mcp_tool.name, kwargs, cache)
         except Exception as e:
-            print(f"[ERROR] Tool '{mcp_tool.name}' failed: {str(e)}")
+            logger.error(f"❌ Tool '{mcp_tool.name}' failed: {e}")
             return f"Error executing tool {mcp_tool.name}: {str(e)}"
 
     return StructuredTool.from_function(
@@ -0,0 +1,93 @@
+# batch.py
+
+"""
+Batch execution of question sets.
+
+Runs many queries through ``AgentManager`` with bounded parallelism, sharing
+MCP tool results across the whole batch, and yields one result per query as
+soon as it finishes. Used by the ``/query/batch`` endpoint and the
+``python -m llm batch`` command.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from llm.agents.executor import AgentManager
+from llm.agents.history import HistoryManager
+from llm.agents.tools import share_tool_results
+
+
+def parse_item(raw: Any, index: int) -> Dict[str, Any]:
+    """Normalize a batch entry: a query string or ``{"query", "id", "chat_history"}``."""
+    if isinstance(raw, str):
+        return {"id": index, "query": raw, "chat_history": []}
+    if not isinstance(raw, dict) or not isinstance(raw.get("query"), str):
+        raise ValueError(f"Item {index} needs a 'query' string")
+    return {"id": raw.get("id", index), "query": raw["query"], "chat_history": raw.get("chat_history") or []}
+
+
+def parse_jsonl(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse JSONL batch input; blank lines are skipped."""
+    items = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            items.append(parse_item(json.loads(line), len(items)))
+    return items
+
+
+class BatchRunner:
+    """Runs batch items through an ``AgentManager`` at most ``concurrency`` at a time."""
+
+    def __init__(
+        self,
+        agent_manager: AgentManager,
+        concurrency: int,
+        history: HistoryManager,
+        admit: Optional[Callable[[], Awaitable[Any]]] = None
+    ):
+        self.agent_manager = agent_manager
+        self.concurrency = max(1, concurrency)
+        self.history = history
+        # Returns an async context manager holding a query slot (see admission)
+        self.admit = admit
+
+    async def run(self, items: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a result for every item in completion order."""
+        # Tasks created below copy this context, so they all share one result table
+        share_tool_results()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_item(index: int, item: Dict[str, Any]):
+            async with slots:
+                await queue.put(await self._run_one(index, item))
+
+        tasks = [asyncio.create_task(run_item(index, item)) for index, item in enumerate(items)]
+        try:
+            for _ in tasks:
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_one(self, index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.monotonic()
+        result: Dict[str, Any] = {"index": index, "id": item["id"], "query": item["query"]}
+        try:
+            # Chat history uses the /query message shape: role, content and attachments
+            chat_history = self.history.build([SimpleNamespace(**message) for message in item["chat_history"]])
+            if self.admit:
+                async with await self.admit():
+                    response = await self.agent_manager.execute_query(item["query"], chat_history)
+            else:
+                response = await self.agent_manager.execute_query(item["query"], chat_history)
+            result.update(response)
+            result["error"] = None
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = round(time.monotonic() - started, 3)
+        return result
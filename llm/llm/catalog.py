@@ -0,0 +1,132 @@
+# catalog.py
+
+"""
+Structured catalog access for the REST endpoints.
+
+Proxies the MCP catalog tools directly, without the LLM, and shapes their
+output into the plain lists and detail objects the frontend renders. Full
+name lists take one MCP call per page, so they are kept until the MCP
+server reports a new catalog version.
+"""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from llm.agents.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from llm.agents.executor import AgentManager
+
+# Largest page the MCP list tools hand out
+PAGE_SIZE = 500
+
+# Detail and metric-list tools per entity, with the name of their argument
+DETAIL_TOOLS = {
+    "metric": ("get_metric_details", "metric_name"),
+    "domain": ("get_domain_details", "domain_name"),
+    "dashboard": ("get_dashboard_details", "dashboard_name"),
+}
+METRIC_LIST_TOOLS = {
+    "domain": ("get_domain_metrics", "domain_name"),
+    "dashboard": ("get_dashboard_metrics", "dashboard_name"),
+}
+
+
+class CatalogUnavailable(Exception):
+    """Raised when the MCP server exposes no tool that can answer a request."""
+    pass
+
+
+def names_of(value: Any) -> List[str]:
+    """Names in a list-like tool output: a list, or a page with ``items``."""
+    if isinstance(value, dict):
+        value = value.get("items", [])
+    if not isinstance(value, list):
+        return []
+    return [str(item.get("name")) if isinstance(item, dict) else str(item) for item in value]
+
+
+class CatalogService:
+    """Reads metrics, domains and dashboards through the agent's MCP connection."""
+
+    def __init__(self, agent_manager: "AgentManager"):
+        self.agent_manager = agent_manager
+        # (tool name, arguments) -> (catalog version, names)
+        self._lists: Dict[str, Tuple[str, List[str]]] = {}
+        self._inflight = SingleFlight()
+
+    def has_tool(self, tool_name: str) -> bool:
+        return tool_name in self.agent_manager.tools
+
+    async def list_names(self, tool_name: str, **arguments) -> List[str]:
+        """Every name a paginated list tool returns, reused while the catalog version is unchanged.
+
+        Without a catalog version from the MCP server every call fetches the
+        list again. The returned list is shared and must not be mutated.
+        """
+        if not self.has_tool(tool_name):
+            raise CatalogUnavailable(f"MCP server has no {tool_name} tool")
+        await self.agent_manager.check_catalog_version()
+        version = self.agent_manager.catalog_version
+        key = json.dumps([tool_name, arguments], sort_keys=True)
+        cached = self._lists.get(key)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        names = await self._inflight.do(key, lambda: self._fetch_names(tool_name, arguments))
+        if version is not None:
+            self._lists[key] = (version, names)
+        return names
+
+    async def _fetch_names(self, tool_name: str, arguments: Dict[str, Any]) -> List[str]:
+        names: List[str] = []
+        cursor: Optional[str] = None
+        while True:
+            page = await self.agent_manager.call_tool(
+                tool_name, {**arguments, "limit": PAGE_SIZE, "cursor": cursor}
+            )
+            names.extend(names_of(page))
+            cursor = page.get("next_cursor") if isinstance(page, dict) else None
+            if not cursor:
+                return names
+
+    async def metrics(self) -> List[str]:
+        return await self.list_names("list_metrics")
+
+    async def domains(self) -> List[str]:
+        return await self.list_names("list_domains")
+
+    async def dashboards(self) -> List[str]:
+        return await self.list_names("list_dashboards", name="")
+
+    async def details(self, entity: str, name: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[str]]]:
+        """Return ``(details, metric names)`` of one entity.
+
+        Either part is None when the MCP server has no tool for it.
+        Raises ``CatalogUnavailable`` if it has neither.
+        """
+        details = None
+        detail_tool, detail_argument = DETAIL_TOOLS[entity]
+        if self.has_tool(detail_tool):
+            details = await self.agent_manager.call_tool(detail_tool, {detail_argument: name}) or {}
+        elif entity == "metric" and self.has_tool("search_metrics"):
+            # Older MCP servers only offer search; accept an exact name match
+            page = await self.agent_manager.call_tool("search_metrics", {"name": name, "limit": 1})
+            items = page.get("items", []) if isinstance(page, dict) else []
+            details = items[0] if items and items[0].get("name", "").lower() == name.lower() else {}
+
+        metrics = None
+        if entity in METRIC_LIST_TOOLS:
+            list_tool, list_argument = METRIC_LIST_TOOLS[entity]
+            if self.has_tool(list_tool):
+                metrics = names_of(await self.agent_manager.call_tool(list_tool, {list_argument: name}))
+
+        if details is None and metrics is None:
+            raise CatalogUnavailable(f"MCP server has no tool for {entity} details")
+        return details, metrics
+
+    async def search(self, text: str, labels: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Ranked fuzzy hits, each with label, name, description and score."""
+        if not self.has_tool("search_catalog"):
+            raise CatalogUnavailable("MCP server has no search_catalog tool")
+        result = await self.agent_manager.call_tool("search_catalog", {"text": text, "labels": labels, "limit": limit})
+        return result.get("items", []) if isinstance(result, dict) else []
@@ -4,6 +4,7 @@
 Configuration module for the LLM application.
 """
 
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -12,6 +13,102 @@ class ServerConfig(BaseSettings):
     port: int = Field(default=5005, env="PORT")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
 
+class ToolCacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="TOOL_CACHE_", extra="ignore")
+
+    enabled: bool = True
+    default_ttl: float = 300.0
+    # Per-tool TTL overrides in seconds, e.g. TOOL_CACHE_TOOL_TTLS='{"list_domains": 3600}'
+    tool_ttls: Dict[str, float] = {}
+    excluded_tools: List[str] = ["process_query"]
+    max_entries: int = 2048
+    # Upper bound on the summed length of cached tool outputs
+    max_size: int = 32 * 1024 * 1024
+
+class AnswerCacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="ANSWER_CACHE_", extra="ignore")
+
+    enabled: bool = True
+    ttl: float = 900.0
+    max_entries: int = 1000
+    # Also reuse answers of rephrased queries whose hashed word vectors are this similar
+    semantic_enabled: bool = False
+    semantic_threshold: float = 0.95
+    # Seconds between checks of the MCP catalog version
+    version_check_interval: float = 30.0
+
+class AgentConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="AGENT_", extra="ignore")
+
+    # "tools" lets the model request several tool calls per step, which run
+    # concurrently; "functions" issues one call per LLM round trip
+    mode: str = "tools"
+    # Upper bound on MCP tool calls in flight for a single request
+    max_parallel_tools: int = 4
+    # Answer templated catalog lookups with a direct tool call instead of the LLM
+    router_enabled: bool = True
+
+class MCPPoolConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="MCP_POOL_", extra="ignore")
+
+    # Number of MCP client sessions tool calls are spread over
+    size: int = 4
+    # "least_busy" picks the session with the fewest calls in flight; "round_robin" rotates
+    dispatch: str = "least_busy"
+    call_timeout: float = 30.0
+    connect_timeout: float = 10.0
+    # Seconds the service waits at startup for the first session
+    startup_timeout: float = 60.0
+    # Idle sessions are pinged this often; failed ones are reconnected with backoff
+    health_interval: float = 15.0
+    ping_timeout: float = 5.0
+    backoff_initial: float = 1.0
+    backoff_max: float = 30.0
+    # Further sessions tried when a call fails because its session dropped
+    retries: int = 1
+
+class AdmissionConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="ADMISSION_", extra="ignore")
+
+    enabled: bool = True
+    # Queries running against the LLM and MCP at once; the rest wait in line
+    max_concurrent: int = 8
+    # Queued queries beyond these limits are rejected with 429 right away
+    max_queue: int = 100
+    max_batch_queue: int = 50
+    # Seconds a queued query may wait for a slot before it is rejected
+    queue_timeout: float = 30.0
+    # Priority of requests without an X-Request-Priority header: interactive or batch
+    default_priority: str = "batch"
+
+class BatchConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="BATCH_", extra="ignore")
+
+    # Queries of one batch run at the same time
+    concurrency: int = 8
+    max_items: int = 1000
+
+class TracingConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="TRACING_", extra="ignore")
+
+    # Append finished spans as OTLP/JSON lines to this file; unset disables export
+    export_path: Optional[str] = None
+    service_name: str = "llm"
+
+class HistoryConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="HISTORY_", extra="ignore")
+
+    # Token budget for the chat history passed to the agent
+    max_tokens: int = 2000
+    # Most recent turns (a user message and the replies to it) kept verbatim
+    keep_turns: int = 3
+    # Attachments such as metric lists above this size are replaced by a reference
+    max_attachment_tokens: int = 200
+    attachment_preview_items: int = 5
+    # Length of each older question and answer in the summary of earlier turns
+    summary_tokens_per_turn: int = 40
+    tokenizer_model: str = "gpt-4"
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -21,7 +118,17 @@ class Settings(BaseSettings):
     )
 
     server: ServerConfig = ServerConfig()
+    agent: AgentConfig = AgentConfig()
+    mcp_pool: MCPPoolConfig = MCPPoolConfig()
+    admission: AdmissionConfig = AdmissionConfig()
+    batch: BatchConfig = BatchConfig()
+    tracing: TracingConfig = TracingConfig()
+    tool_cache: ToolCacheConfig = ToolCacheConfig()
+    answer_cache: AnswerCacheConfig = AnswerCacheConfig()
+    history: HistoryConfig = HistoryConfig()
     fastmcp_url: str = Field(default="http://mcp_server:8000/sse", env="MCP_SERVER_URL")
     openai_api_key: str = Field(env="OPENAI_API_KEY")
+    # Another OpenAI-compatible server, e.g. the benchmarks' fake one
+    openai_base_url: Optional[str] = Field(default=None, env="OPENAI_BASE_URL")
 
 config = Settings()
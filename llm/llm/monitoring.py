@@ -0,0 +1,127 @@
+# monitoring.py
+
+"""
+Prometheus metrics for the LLM service.
+
+The hot path only observes histograms and moves gauges. Cache, MCP pool,
+router and admission figures already kept for ``/stats`` are turned into
+metrics when Prometheus scrapes, so they cost nothing between scrapes.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Seconds; agent queries take up to minutes, routed queries and cached tools milliseconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+QUERY_SECONDS = Histogram(
+    "llm_query_seconds", "Time to answer a query", ["outcome"], buckets=LATENCY_BUCKETS
+)
+QUERIES_IN_FLIGHT = Gauge("llm_queries_in_flight", "Queries being answered")
+TOOL_SECONDS = Histogram(
+    "llm_tool_seconds", "MCP tool call latency as seen by the agent", ["tool", "outcome"], buckets=LATENCY_BUCKETS
+)
+TOOL_CALLS_IN_FLIGHT = Gauge("llm_tool_calls_in_flight", "MCP tool calls being made by the agent")
+QUEUE_WAIT_SECONDS = Histogram(
+    "llm_admission_queue_wait_seconds", "Time an admitted query waited for a slot", ["priority"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens", "Tokens used by LLM calls", ["model", "kind"])
+
+
+@contextmanager
+def timed(histogram: Histogram, in_flight: Gauge, **labels) -> Iterator[None]:
+    """Count a block as in flight and observe its duration with an ``ok``/``error`` outcome."""
+    in_flight.inc()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        in_flight.dec()
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - started)
+
+
+def record_tokens(model: str, usage: Dict[str, Any]):
+    """Add an LLM call's ``token_usage`` to the token counters."""
+    for kind in ("prompt", "completion"):
+        count = usage.get(f"{kind}_tokens")
+        if count:
+            LLM_TOKENS.labels(model=model or "unknown", kind=kind).inc(count)
+
+
+class StatsCollector(Collector):
+    """Exposes the figures behind ``/stats`` as metrics at scrape time."""
+
+    def __init__(self, stats: Callable[[], Dict[str, Any]]):
+        self.stats = stats
+
+    def describe(self):
+        # Skip the collect() the registry would otherwise run at registration
+        return []
+
+    def collect(self):
+        stats = self.stats()
+
+        hits = CounterMetricFamily("llm_cache_hits", "Cache lookups that found an entry", labels=["cache"])
+        misses = CounterMetricFamily("llm_cache_misses", "Cache lookups that found no entry", labels=["cache"])
+        ratio = GaugeMetricFamily("llm_cache_hit_ratio", "Hits over lookups since start", labels=["cache"])
+        entries = GaugeMetricFamily("llm_cache_entries", "Entries held", labels=["cache"])
+        for cache in ("tool_cache", "answer_cache"):
+            figures = stats[cache]
+            hits.add_metric([cache], figures["hits"])
+            misses.add_metric([cache], figures["misses"])
+            ratio.add_metric([cache], figures["hit_ratio"])
+            entries.add_metric([cache], figures["entries"])
+        yield from (hits, misses, ratio, entries)
+
+        shared = CounterMetricFamily("llm_single_flight_shared", "Queries answered by an identical in-flight query")
+        shared.add_metric([], stats["single_flight"]["shared"])
+        yield shared
+
+        if stats["router"]:
+            routed = CounterMetricFamily("llm_router_routed", "Queries answered without the LLM", labels=["intent"])
+            for intent, count in stats["router"]["by_intent"].items():
+                routed.add_metric([intent], count)
+            yield routed
+
+        pool = stats["mcp_pool"]
+        if pool:
+            connections = pool["connections"]
+            busy = sum(1 for connection in connections if connection["in_flight"])
+            yield GaugeMetricFamily("llm_mcp_pool_size", "MCP connections in the pool", value=pool["size"])
+            yield GaugeMetricFamily("llm_mcp_pool_healthy", "Healthy MCP connections", value=pool["healthy"])
+            yield GaugeMetricFamily(
+                "llm_mcp_pool_in_flight", "MCP requests in flight",
+                value=sum(connection["in_flight"] for connection in connections)
+            )
+            yield GaugeMetricFamily(
+                "llm_mcp_pool_utilization", "Share of MCP connections with a request in flight",
+                value=busy / pool["size"] if pool["size"] else 0.0
+            )
+
+        admission = stats["admission"]
+        yield GaugeMetricFamily("llm_admission_running", "Admitted queries running", value=admission["running"])
+        queued = GaugeMetricFamily("llm_admission_queued", "Queries waiting for a slot", labels=["priority"])
+        for priority, count in admission["queued"].items():
+            queued.add_metric([priority], count)
+        yield queued
+        rejected = CounterMetricFamily("llm_admission_rejected", "Queries turned away with 429")
+        rejected.add_metric([], admission["rejected"] + admission["timed_out"])
+        yield rejected
+
+
+def register_stats(stats: Callable[[], Dict[str, Any]]):
+    """Publish ``stats()`` figures alongside the instrumented metrics."""
+    REGISTRY.register(StatsCollector(stats))
+
+
+def exposition() -> tuple:
+    """Current metrics in the Prometheus text format, with their content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
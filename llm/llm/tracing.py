@@ -0,0 +1,195 @@
+# tracing.py
+
+"""
+Lightweight request tracing.
+
+Spans follow the W3C trace context: a ``traceparent`` received from the
+frontend becomes the parent of the request span, and the current span is
+handed to the MCP server with every tool call. Finished spans can be written
+as OTLP/JSON lines (one ``ExportTraceServiceRequest`` per line, the format
+the OpenTelemetry collector's file exporter and receiver use).
+
+Spans may carry a category (``llm``, ``tool``, ...); the time spent in each
+category is summed per request for the timing breakdown in ``/query``.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from llm.config import TracingConfig, config
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds: 1 internal, 2 server, 3 client
+SPAN_KINDS = {"request": 2, "llm": 3, "tool": 3}
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        category: Optional[str],
+        attributes: Dict[str, Any]
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.category = category
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.category, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in {**self.attributes, "category": self.category}.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """Return ``(trace id, parent span id)`` from a W3C traceparent header."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    return (match.group(1), match.group(2)) if match else None
+
+
+class JsonFileExporter:
+    """Appends finished spans to a file as OTLP/JSON lines."""
+
+    def __init__(self, path: str, service: str):
+        self.path = path
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{"scope": {"name": "insights"}, "spans": [span.to_otlp()]}]
+            }]
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans and keeps the current one in a context variable."""
+
+    def __init__(self, settings: TracingConfig):
+        self.settings = settings
+        self.exporter = (
+            JsonFileExporter(settings.export_path, settings.service_name) if settings.export_path else None
+        )
+
+    def start_span(
+        self,
+        name: str,
+        category: Optional[str] = None,
+        traceparent: Optional[str] = None,
+        **attributes
+    ) -> Span:
+        """Start a span under ``traceparent`` if given, else under the current span."""
+        remote = parse_traceparent(traceparent)
+        parent = _current_span.get()
+        if remote:
+            trace_id, parent_id = remote
+        elif parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+        return Span(name, trace_id, parent_id, category, attributes)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None):
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        timings = _timings.get()
+        if timings is not None and span.category:
+            timings[span.category] = timings.get(span.category, 0.0) + span.duration_ms
+        if self.exporter:
+            try:
+                self.exporter.export(span)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not export span {span.name}: {e}")
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: Optional[str] = None,
+        traceparent: Optional[str] = None,
+        **attributes
+    ) -> Iterator[Span]:
+        """Run a block inside a new span that becomes the current span."""
+        span = self.start_span(name, category, traceparent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        return _current_span.get()
+
+    @staticmethod
+    def collect_timings() -> Dict[str, float]:
+        """Start summing span durations per category for the current request."""
+        timings: Dict[str, float] = {}
+        _timings.set(timings)
+        return timings
+
+    @staticmethod
+    def add_timings(timings: Dict[str, float]):
+        """Add durations collected elsewhere, e.g. by a coalesced call, to the current request's timings."""
+        current = _timings.get()
+        if current is None:
+            return
+        for category, duration_ms in timings.items():
+            current[category] = current.get(category, 0.0) + duration_ms
+
+
+tracer = Tracer(config.tracing)
@@ -0,0 +1,4 @@
+import os
+
+# llm.config builds its settings on import and requires an API key
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from llm.agents.admission import AdmissionController, QueueFull
+from llm.config import AdmissionConfig
+
+
+def controller(**settings):
+    defaults = {"max_concurrent": 1, "max_queue": 10, "max_batch_queue": 10, "queue_timeout": 5.0}
+    return AdmissionController(AdmissionConfig(**{**defaults, **settings}))
+
+
+async def settle():
+    """Let queued tasks reach their wait."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def admit_and_release(admission, priority):
+    (await admission.acquire(priority)).release()
+
+
+def wait_count(priority):
+    return REGISTRY.get_sample_value("llm_admission_queue_wait_seconds_count", {"priority": priority}) or 0.0
+
+
+def test_queries_are_admitted_while_slots_are_free():
+    async def run():
+        admission = controller(max_concurrent=2)
+        first = await admission.acquire("interactive")
+        second = await admission.acquire("batch")
+        assert admission.running == 2
+        first.release()
+        second.release()
+        second.release()  # releasing twice is harmless
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_unknown_priority_uses_the_default():
+    assert controller(default_priority="batch").priority("urgent") == "batch"
+    assert controller().priority("interactive") == "interactive"
+
+
+def test_interactive_queries_are_served_before_batch():
+    async def run():
+        admission = controller()
+        holder = await admission.acquire("interactive")
+        order = []
+
+        async def query(priority, name):
+            async with await admission.acquire(priority):
+                order.append(name)
+
+        tasks = [asyncio.create_task(query("batch", "batch 1"))]
+        await settle()
+        tasks.append(asyncio.create_task(query("batch", "batch 2")))
+        await settle()
+        tasks.append(asyncio.create_task(query("interactive", "interactive")))
+        await settle()
+        assert admission.stats()["queued"] == {"interactive": 1, "batch": 2}
+
+        holder.release()
+        await asyncio.gather(*tasks)
+        assert order == ["interactive", "batch 1", "batch 2"]
+        assert admission.running == 0
+        assert admission.stats()["queued"] == {"interactive": 0, "batch": 0}
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        admission = controller(max_queue=2, max_batch_queue=1)
+        holder = await admission.acquire("interactive")
+        waiting = [asyncio.create_task(admit_and_release(admission, "batch"))]
+        await settle()
+
+        with pytest.raises(QueueFull) as batch_full:
+            await admission.acquire("batch")
+        assert batch_full.value.retry_after >= 1
+
+        waiting.append(asyncio.create_task(admit_and_release(admission, "interactive")))
+        await settle()
+        with pytest.raises(QueueFull) as queue_full:
+            await admission.acquire("interactive")
+        # Estimated from the queue length and the time queries hold a slot
+        assert queue_full.value.retry_after >= batch_full.value.retry_after
+        assert admission.rejected == 2
+
+        holder.release()
+        await asyncio.gather(*waiting)
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_queue_timeout_rejects_and_frees_the_place_in_line():
+    async def run():
+        admission = controller(queue_timeout=0.01)
+        holder = await admission.acquire("interactive")
+        with pytest.raises(QueueFull):
+            await admission.acquire("interactive")
+        assert admission.timed_out == 1
+        assert admission.stats()["queued"]["interactive"] == 0
+        holder.release()
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def run():
+        admission = controller()
+        holder = await admission.acquire("interactive")
+        waiter = asyncio.create_task(admission.acquire("interactive"))
+        await settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert admission.stats()["queued"]["interactive"] == 0
+
+        holder.release()
+        assert admission.running == 0
+        # The slot is free again for the next query
+        (await asyncio.wait_for(admission.acquire("batch"), 1)).release()
+
+    asyncio.run(run())
+
+
+def test_cancelled_query_releases_its_slot():
+    async def run():
+        admission = controller()
+        started = asyncio.Event()
+
+        async def query():
+            async with await admission.acquire("interactive"):
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(query())
+        await started.wait()
+        waiter = asyncio.create_task(admission.acquire("batch"))
+        await settle()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The slot passes straight to the waiting query
+        ticket = await asyncio.wait_for(waiter, 1)
+        assert admission.running == 1
+        ticket.release()
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_disabled_controller_admits_everything():
+    async def run():
+        admission = controller(enabled=False)
+        tickets = [await admission.acquire("batch") for _ in range(5)]
+        assert admission.running == 5
+        for ticket in tickets:
+            ticket.release()
+
+    asyncio.run(run())
+
+
+def test_queue_wait_is_exported_as_a_histogram():
+    async def run():
+        admission = controller()
+        before = wait_count("batch")
+        holder = await admission.acquire("interactive")
+        waiter = asyncio.create_task(admission.acquire("batch"))
+        await asyncio.sleep(0.02)
+        holder.release()
+        (await waiter).release()
+        assert wait_count("batch") == before + 1
+        assert admission.stats()["queue_wait_seconds"]["max"] >= 0.01
+
+    asyncio.run(run())
@@ -0,0 +1,69 @@
+import asyncio
+
+from llm.catalog import PAGE_SIZE, CatalogService
+
+
+class FakeAgentManager:
+    """Serves list_metrics pages over ``names`` and counts the calls."""
+
+    def __init__(self, names, version="v1"):
+        self.names = names
+        self.catalog_version = version
+        self.tools = {"list_metrics": None}
+        self.calls = 0
+
+    async def check_catalog_version(self):
+        pass
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls += 1
+        await asyncio.sleep(0)
+        start = int(arguments["cursor"] or 0)
+        end = start + arguments["limit"]
+        return {
+            "items": self.names[start:end],
+            "next_cursor": str(end) if end < len(self.names) else None,
+            "total": len(self.names),
+        }
+
+
+NAMES = [f"Metric {i}" for i in range(PAGE_SIZE * 2 + 10)]
+
+
+def test_list_is_fetched_page_by_page_once_per_version():
+    async def run():
+        manager = FakeAgentManager(NAMES)
+        catalog = CatalogService(manager)
+        assert await catalog.metrics() == NAMES
+        assert manager.calls == 3
+        assert await catalog.metrics() == NAMES
+        assert manager.calls == 3
+
+        manager.catalog_version = "v2"
+        manager.names = NAMES[:5]
+        assert await catalog.metrics() == NAMES[:5]
+        assert manager.calls == 4
+
+    asyncio.run(run())
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def run():
+        manager = FakeAgentManager(NAMES)
+        catalog = CatalogService(manager)
+        results = await asyncio.gather(*(catalog.metrics() for _ in range(5)))
+        assert all(result == NAMES for result in results)
+        assert manager.calls == 3
+
+    asyncio.run(run())
+
+
+def test_without_a_catalog_version_every_request_fetches():
+    async def run():
+        manager = FakeAgentManager(NAMES[:3], version=None)
+        catalog = CatalogService(manager)
+        await catalog.metrics()
+        await catalog.metrics()
+        assert manager.calls == 2
+
+    asyncio.run(run())
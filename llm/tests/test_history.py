@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from llm.agents.history import HistoryManager
+from llm.config import HistoryConfig
+
+ANSWER = "Line one\n- item a\n- item b"
+
+
+def message(role, content):
+    return SimpleNamespace(role=role, content=content)
+
+
+def manager(max_tokens, keep_turns=3):
+    history = HistoryManager(HistoryConfig(max_tokens=max_tokens, keep_turns=keep_turns), "gpt-4")
+    # One token per word keeps budgets easy to reason about
+    history._count = lambda text: len(text.split())
+    return history
+
+
+def test_single_turn_within_budget_is_kept_verbatim():
+    history = manager(max_tokens=100)
+    messages = history.build([message("user", "Which metrics?"), message("assistant", ANSWER)])
+    assert messages == [
+        {"type": "human", "content": "Which metrics?"},
+        {"type": "assistant", "content": ANSWER},
+    ]
+
+
+def test_single_turn_that_fits_exactly_is_kept_verbatim():
+    chat = [message("user", "Which metrics?"), message("assistant", ANSWER)]
+    history = manager(max_tokens=2 + len(ANSWER.split()))
+    assert [m["content"] for m in history.build(chat)] == ["Which metrics?", ANSWER]
+
+
+def test_single_turn_over_budget_is_truncated():
+    history = manager(max_tokens=6)
+    messages = history.build([message("user", "Which metrics?"), message("assistant", " ".join(["word"] * 20))])
+    # Each message gets an even share of the budget
+    assert [m["content"] for m in messages] == ["Which metrics?", "word word word …"]
+
+
+def test_older_turns_are_dropped_before_the_last_turn_is_cut():
+    chat = [
+        message("user", "first question"),
+        message("assistant", " ".join(["old"] * 30)),
+        message("user", "Which metrics?"),
+        message("assistant", ANSWER),
+    ]
+    history = manager(max_tokens=12)
+    assert [m["content"] for m in history.build(chat)] == ["Which metrics?", ANSWER]
+
+
+def test_older_turns_are_summarized():
+    chat = [message("user", f"question {i}") for i in range(4)]
+    messages = manager(max_tokens=100, keep_turns=1).build(chat)
+    assert messages[0]["type"] == "system"
+    assert "- User: question 0" in messages[0]["content"]
+    assert messages[-1] == {"type": "human", "content": "question 3"}
+
+
+def test_empty_history():
+    assert manager(max_tokens=10).build([]) == []
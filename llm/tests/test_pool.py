@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import create_autospec
+
+import pytest
+from mcp import ClientSession
+
+pytest.importorskip("agents.mcp")
+
+from llm.agents.pool import MCPConnectionPool  # noqa: E402
+from llm.config import MCPPoolConfig  # noqa: E402
+from llm.tracing import tracer  # noqa: E402
+
+
+def pool_with_session():
+    pool = MCPConnectionPool("http://mcp_server:8000/sse", MCPPoolConfig(size=1, retries=0))
+    # Autospec rejects arguments the installed ClientSession does not accept
+    session = create_autospec(ClientSession, instance=True)
+    session.call_tool.return_value = "result"
+    connection = pool.connections[0]
+    connection.server = SimpleNamespace(session=session)
+    connection.healthy = True
+    return pool, session
+
+
+def test_call_tool_sends_the_traceparent_in_meta():
+    async def run():
+        pool, session = pool_with_session()
+        with tracer.span("POST /query", "request") as span:
+            assert await pool.call_tool("list_metrics", {"limit": 5}) == "result"
+        session.call_tool.assert_awaited_once_with(
+            "list_metrics", {"limit": 5}, meta={"traceparent": span.traceparent}
+        )
+
+    asyncio.run(run())
+
+
+def test_call_tool_outside_a_span_sends_no_meta():
+    async def run():
+        pool, session = pool_with_session()
+        assert await pool.call_tool("list_domains", {}) == "result"
+        session.call_tool.assert_awaited_once_with("list_domains", {}, meta=None)
+
+    asyncio.run(run())
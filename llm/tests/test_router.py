@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from llm.agents.router import QueryRouter, render
+
+ALL_TOOLS = [
+    "get_metric_details", "get_domain_details", "get_dashboard_details", "get_domain_metrics",
+    "get_dashboard_metrics", "search_metrics", "list_metrics", "list_domains", "list_dashboards",
+    "find_dashboard_path", "find_domain_path",
+]
+
+
+class FakeTool:
+    def __init__(self, output):
+        self.output = output
+        self.calls = []
+
+    async def ainvoke(self, arguments):
+        self.calls.append(arguments)
+        return self.output
+
+
+def router(names=ALL_TOOLS, output=None):
+    return QueryRouter({name: FakeTool(output) for name in names})
+
+
+@pytest.mark.parametrize("query, tool, arguments", [
+    ("Get details for metric: Revenue", "get_metric_details", {"metric_name": "Revenue"}),
+    ("get details for metric Revenue", "get_metric_details", {"metric_name": "Revenue"}),
+    ("Show info about the metric 'Net Revenue'?", "get_metric_details", {"metric_name": "Net Revenue"}),
+    ("Tell me about metric \"Net Revenue\"", "get_metric_details", {"metric_name": "Net Revenue"}),
+    ("describe the metric Churn Rate.", "get_metric_details", {"metric_name": "Churn Rate"}),
+    ("Tell me about the metric 'Profit and Loss'", "get_metric_details", {"metric_name": "Profit and Loss"}),
+    ("List all metrics in domain: Finance", "get_domain_metrics", {"domain_name": "Finance"}),
+    ("what are the metrics of the domain Marketing?", "get_domain_metrics", {"domain_name": "Marketing"}),
+    ("metrics on dashboard: Executive Overview", "get_dashboard_metrics", {"dashboard_name": "Executive Overview"}),
+    ("Get details for domain: Sales", "get_domain_details", {"domain_name": "Sales"}),
+    ("information on dashboard Marketing Funnel", "get_dashboard_details", {"dashboard_name": "Marketing Funnel"}),
+    ("Find the shortest path between dashboards Executive Overview and Marketing Funnel",
+     "find_dashboard_path", {"dashboard1": "Executive Overview", "dashboard2": "Marketing Funnel"}),
+    ("path from dashboard: A to dashboard: B", "find_dashboard_path", {"dashboard1": "A", "dashboard2": "B"}),
+    ("connections between domains Finance and Marketing",
+     "find_domain_path", {"domain1": "Finance", "domain2": "Marketing"}),
+    ("search for metrics matching revenue", "search_metrics", {"name": "revenue"}),
+    ("Find dashboards named Overview", "list_dashboards", {"name": "Overview"}),
+    ("list metrics", "list_metrics", {}),
+    ("Show me all the available domains.", "list_domains", {}),
+    ("  what are the dashboards?  ", "list_dashboards", {"name": ""}),
+])
+def test_lookup_queries_are_routed(query, tool, arguments):
+    matched = router().match(query)
+    assert matched is not None, query
+    _, _, tool_name, tool_arguments = matched
+    assert (tool_name, tool_arguments) == (tool, arguments)
+
+
+@pytest.mark.parametrize("query", [
+    "Why did revenue drop last quarter?",
+    "Which metrics best explain churn?",
+    "Compare the metrics in domain Finance with Marketing",
+    "Who owns the metric Revenue?",
+    "Get details for metrics: Revenue, Churn",
+    "list metrics that changed last week",
+    "list the top 5 domains by size",
+    "Tell me about revenue",
+    "What is the revenue trend?",
+    "search revenue",
+    "How are the Finance and Marketing domains connected?",
+    "What is metric: Active Users?",
+    "What is the metric with the highest growth?",
+    "Tell me about the domain Finance and who owns it",
+    "describe the dashboard Marketing Funnel and compare it with Executive Overview",
+    "Get details for metric Revenue with its owner",
+    "",
+])
+def test_open_questions_fall_through(query):
+    assert router().match(query) is None
+
+
+def test_subject_names_the_entity():
+    route, subject, _, _ = router().match("Get details for domain: Sales")
+    assert route.intent == "domain_details"
+    assert subject == "domain 'Sales'"
+
+
+def test_preferred_tool_falls_back_to_the_next_available():
+    matched = router([name for name in ALL_TOOLS if name != "get_metric_details"]).match("describe metric Revenue")
+    assert matched[2:] == ("search_metrics", {"name": "Revenue"})
+
+
+def test_route_without_any_available_tool_falls_through():
+    assert router(["list_metrics"]).match("Get details for domain: Sales") is None
+
+
+def test_route_calls_the_tool_and_renders_its_output():
+    routes = router(output={"items": ["Revenue", "Churn"], "total": 5})
+    result = asyncio.run(routes.route("List all metrics in domain: Finance"))
+    assert routes.tools["get_domain_metrics"].calls == [{"domain_name": "Finance"}]
+    assert result["final_response"] == (
+        "Found 2 result(s) for metrics in domain 'Finance' (showing 2 of 5):\n- Revenue\n- Churn"
+    )
+    assert result["tool_usage"][0]["tool_name"] == "get_domain_metrics"
+    assert routes.stats() == {"routed": 1, "by_intent": {"domain_metrics": 1}}
+
+
+def test_unrouted_query_returns_none_without_calling_tools():
+    routes = router()
+    assert asyncio.run(routes.route("Why did revenue drop?")) is None
+    assert all(not tool.calls for tool in routes.tools.values())
+    assert routes.stats()["routed"] == 0
+
+
+@pytest.mark.parametrize("output", [{}, [], "", None, {"items": [], "total": 0}, "Error executing tool x: boom"])
+def test_route_without_an_answer_falls_through(output):
+    routes = router(output=output)
+    assert asyncio.run(routes.route("Get details for metric: Unknown")) is None
+    assert routes.tools["get_metric_details"].calls == [{"metric_name": "Unknown"}]
+    assert routes.stats()["routed"] == 0
+
+
+@pytest.mark.parametrize("output, expected", [
+    ({}, "No results found for metric 'X'."),
+    ([], "No results found for metric 'X'."),
+    ("", "No results found for metric 'X'."),
+    ({"name": "X", "owner": "Ann"}, "Details for metric 'X':\n- name: X\n- owner: Ann"),
+    ([{"nodes": ["A", "m", "B"]}], "Found 1 result(s) for metric 'X':\n- A → m → B"),
+])
+def test_render(output, expected):
+    assert render("metric 'X'", output) == expected
@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+import inspect
+import sys
+from pathlib import Path
+
+import pytest
+
+from llm.agents import singleflight
+
+# The MCP server keeps its own copy, since each service builds from its own directory
+MCP_SERVER_COPY = Path(__file__).resolve().parents[2] / "mcp_server" / "mcp_server" / "core" / "singleflight.py"
+
+
+def mcp_server_copy():
+    if not MCP_SERVER_COPY.exists():
+        pytest.skip("mcp_server sources are not available")
+    if "mcp_server_singleflight" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("mcp_server_singleflight", MCP_SERVER_COPY)
+        module = importlib.util.module_from_spec(spec)
+        # inspect.getsource finds a class's file through sys.modules
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return sys.modules["mcp_server_singleflight"]
+
+
+def test_copies_do_not_drift():
+    assert inspect.getsource(mcp_server_copy().SingleFlight) == inspect.getsource(singleflight.SingleFlight)
+
+
+@pytest.fixture(params=["llm", "mcp_server"])
+def SingleFlight(request):
+    return singleflight.SingleFlight if request.param == "llm" else mcp_server_copy().SingleFlight
+
+
+def test_concurrent_calls_share_one_result(SingleFlight):
+    async def run():
+        inflight, release, calls = SingleFlight(), asyncio.Event(), []
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return object()
+
+        waiting = [asyncio.ensure_future(inflight.do("key", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        first, second, third = await asyncio.gather(*waiting)
+        assert first is second is third
+        assert len(calls) == 1
+        assert inflight.stats() == {"calls": 1, "shared": 2, "in_flight": 0}
+
+    asyncio.run(run())
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others(SingleFlight):
+    async def run():
+        inflight, release = SingleFlight(), asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        cancelled = asyncio.ensure_future(inflight.do("key", call))
+        waiting = asyncio.ensure_future(inflight.do("key", call))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        assert await waiting == "done"
+        assert cancelled.cancelled()
+
+    asyncio.run(run())
+
+
+def test_failures_are_not_cached(SingleFlight):
+    async def run():
+        inflight = SingleFlight()
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def succeeding():
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await inflight.do("key", failing)
+        assert await inflight.do("key", succeeding) == "ok"
+
+    asyncio.run(run())
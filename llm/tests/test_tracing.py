@@ -0,0 +1,43 @@
+import asyncio
+
+from llm.agents.singleflight import SingleFlight
+from llm.tracing import tracer
+
+
+async def answered(release: asyncio.Event):
+    timings = tracer.collect_timings()
+    with tracer.span("llm call", "llm"):
+        await release.wait()
+    return "answer", dict(timings)
+
+
+def test_coalesced_callers_report_the_shared_call_timings():
+    async def request(inflight, release):
+        timings = tracer.collect_timings()
+        result, shared = await inflight.do("query", lambda: answered(release))
+        tracer.add_timings(shared)
+        return result, timings
+
+    async def run():
+        inflight, release = SingleFlight(), asyncio.Event()
+        leader = asyncio.ensure_future(request(inflight, release))
+        follower = asyncio.ensure_future(request(inflight, release))
+        await asyncio.sleep(0)
+        release.set()
+        (_, leader_timings), (_, follower_timings) = await asyncio.gather(leader, follower)
+        assert inflight.stats()["shared"] == 1
+        assert leader_timings["llm"] > 0
+        assert follower_timings == leader_timings
+
+    asyncio.run(run())
+
+
+def test_add_timings_outside_a_request_is_ignored():
+    async def run():
+        tracer.add_timings({"llm": 5.0})
+        timings = tracer.collect_timings()
+        tracer.add_timings({"llm": 5.0, "tool": 1.0})
+        tracer.add_timings({"llm": 1.0})
+        assert timings == {"llm": 6.0, "tool": 1.0}
+
+    asyncio.run(run())
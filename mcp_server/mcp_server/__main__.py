@@ -6,12 +6,19 @@ import asyncio
 import logging
 import signal
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import Field, BaseModel
 from fastmcp import FastMCP, Context
 from mcp_server.core.database import MetricsDatabase
 from mcp_server.core.config.settings import settings
 from mcp_server.core.agents import AgentManager
+from mcp_server.core.loader import BulkLoader, NODE_FILES
+from mcp_server.core.generator import CatalogGenerator
+from mcp_server.core.tracing import traced, tracer
+from mcp_server.core.monitoring import exposition, watch_database
+from pathlib import Path
+from starlette.requests import Request
+from starlette.responses import Response
 import click
 
 # Configure logging
@@ -21,6 +28,7 @@ logger = logging.getLogger(__name__)
 # Initialize services
 db = MetricsDatabase()
 agent_manager = AgentManager()
+watch_database(db)
 
 # Pydantic models for chat
 class ChatMessage(BaseModel):
@@ -53,22 +61,29 @@ async def wait_for_database():
 
 async def run_server():
     await wait_for_database()
+    if settings.SNAPSHOT_ENABLED:
+        await db.snapshot.start()
     await agent_manager.initialize()
 
     mcp = FastMCP("insights-analysis-tool", port=settings.PORT, log_level=settings.LOG_LEVEL, debug=True)
 
     # Metrics Tools
     @mcp.tool()
-    async def list_metrics(ctx: Context = None) -> List[str]:
-        """List all available metric names."""
+    @traced
+    async def list_metrics(
+        limit: int = Field(default=settings.PAGE_SIZE, description="Maximum number of metric names to return"),
+        cursor: Optional[str] = Field(default=None, description="Cursor from a previous page's next_cursor"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """List available metric names, one page at a time."""
         if ctx:
-            await ctx.info("Fetching all metrics...")
+            await ctx.info("Fetching metrics...")
         try:
-            metrics = await db.get_metrics()
-            logger.info(f"Retrieved {len(metrics)} metrics from database")
-            if not metrics:
+            page = await db.list_page("Metric", limit, cursor)
+            logger.info(f"Retrieved {len(page['items'])} of {page['total']} metrics from database")
+            if not page["total"]:
                 logger.warning("No metrics found in database")
-            return [metric["name"] for metric in metrics]
+            return {**page, "items": [metric["name"] for metric in page["items"]]}
         except Exception as e:
             logger.error(f"Error fetching metrics: {str(e)}")
             if ctx:
@@ -76,27 +91,119 @@ async def run_server():
             raise
 
     @mcp.tool()
-    async def search_metrics(name: str = Field(default="", description="Name of the metric to search for"), ctx: Context = None) -> List[Dict[str, Any]]:
-        """Search for metrics by name."""
+    @traced
+    async def search_metrics(
+        name: str = Field(default="", description="Name of the metric to search for"),
+        limit: int = Field(default=settings.PAGE_SIZE, description="Maximum number of metrics to return"),
+        cursor: Optional[str] = Field(default=None, description="Cursor from a previous page's next_cursor"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """Search for metrics by name, best matches first."""
         if ctx:
             await ctx.info(f"Searching for metrics matching '{name}'...")
-        return await db.search_metric_by_name(name)
+        return await db.search_page("Metric", name, limit, cursor)
+
+    @mcp.tool()
+    @traced
+    async def get_metric_details(
+        metric_name: str = Field(description="Exact name of the metric"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """Get a metric with its owner, domain, dashboards and related metrics in one call."""
+        if ctx:
+            await ctx.info(f"Fetching details for metric '{metric_name}'...")
+        return await db.get_details("Metric", metric_name) or {}
+
+    @mcp.tool()
+    @traced
+    async def get_dashboard_details(
+        dashboard_name: str = Field(description="Exact name of the dashboard"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """Get a dashboard with its owner, domain and metrics in one call."""
+        if ctx:
+            await ctx.info(f"Fetching details for dashboard '{dashboard_name}'...")
+        return await db.get_details("Dashboard", dashboard_name) or {}
 
     @mcp.tool()
-    async def list_dashboards(name: str = Field(default="", description="Name of the dashboard to search for"), ctx: Context = None) -> List[Dict[str, Any]]:
+    @traced
+    async def get_domain_details(
+        domain_name: str = Field(description="Exact name of the domain"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """Get a domain with its main owner and dashboards in one call."""
+        if ctx:
+            await ctx.info(f"Fetching details for domain '{domain_name}'...")
+        return await db.get_details("Domain", domain_name) or {}
+
+    @mcp.tool()
+    @traced
+    async def get_dashboard_metrics(
+        dashboard_name: str = Field(description="Exact name of the dashboard"),
+        limit: int = Field(default=settings.MAX_PAGE_SIZE, description="Maximum number of metrics to return"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """List the metrics a dashboard shows, by name, with their total."""
+        if ctx:
+            await ctx.info(f"Fetching metrics for dashboard '{dashboard_name}'...")
+        return await db.get_dashboard_metrics(dashboard_name, limit) or {"items": [], "total": 0}
+
+    @mcp.tool()
+    @traced
+    async def get_domain_metrics(
+        domain_name: str = Field(description="Exact name of the domain"),
+        limit: int = Field(default=settings.MAX_PAGE_SIZE, description="Maximum number of metrics to return"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """List the metrics on a domain's dashboards, by name, with their total."""
+        if ctx:
+            await ctx.info(f"Fetching metrics for domain '{domain_name}'...")
+        return await db.get_domain_metrics(domain_name, limit) or {"items": [], "total": 0}
+
+    @mcp.tool()
+    @traced
+    async def search_catalog(
+        text: str = Field(description="Words to look for in names and descriptions; typos are tolerated"),
+        labels: List[str] = Field(default=["Metric", "Dashboard", "Domain"], description="Kinds of node to search"),
+        limit: int = Field(default=settings.SEARCH_RESULT_LIMIT, description="Maximum number of hits to return"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """Fuzzy search over metrics, dashboards and domains, best matches first.
+
+        Each hit in ``items`` has the node's label, name, description and a score between 0 and 1.
+        """
+        if ctx:
+            await ctx.info(f"Searching the catalog for '{text}'...")
+        return {"items": await db.search_catalog(text, tuple(labels), limit)}
+
+    @mcp.tool()
+    @traced
+    async def list_dashboards(
+        name: str = Field(default="", description="Name of the dashboard to search for"),
+        limit: int = Field(default=settings.PAGE_SIZE, description="Maximum number of dashboards to return"),
+        cursor: Optional[str] = Field(default=None, description="Cursor from a previous page's next_cursor"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
         """Search dashboards by name."""
         if ctx:
             await ctx.info(f"Searching for dashboards matching '{name}'...")
-        return await db.search_dashboard_by_name(name)
+        return await db.search_page("Dashboard", name, limit, cursor)
 
     @mcp.tool()
-    async def list_domains(ctx: Context = None) -> List[str]:
-        """List all available domains."""
+    @traced
+    async def list_domains(
+        limit: int = Field(default=settings.PAGE_SIZE, description="Maximum number of domains to return"),
+        cursor: Optional[str] = Field(default=None, description="Cursor from a previous page's next_cursor"),
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """List available domains, one page at a time."""
         if ctx:
             await ctx.info("Fetching available domains...")
-        return await db.get_domains()
+        page = await db.list_page("Domain", limit, cursor)
+        return {**page, "items": [domain["name"] for domain in page["items"]]}
 
     @mcp.tool()
+    @traced
     async def find_dashboard_path(
         dashboard1: str = Field(description="First dashboard name"),
         dashboard2: str = Field(description="Second dashboard name"),
@@ -112,12 +219,15 @@ async def run_server():
         return await db.get_dashboard_paths(dashboard1, dashboard2)
 
     @mcp.tool()
+    @traced
     async def find_domain_path(
         domain1: str = Field(description="First domain name"),
         domain2: str = Field(description="Second domain name"),
+        max_hops: int = Field(default=settings.PATH_MAX_HOPS, description="Maximum number of hops per path"),
+        limit: int = Field(default=settings.PATH_RESULT_LIMIT, description="Maximum number of paths to return"),
         ctx: Context = None
     ) -> List[Dict[str, Any]]:
-        """Find dashboard path between two domains."""
+        """Find dashboard paths between two domains."""
         if not domain1 or not domain2:
             if ctx:
                 await ctx.error("Both domain names are required")
@@ -126,19 +236,11 @@ async def run_server():
         if ctx:
             await ctx.info(f"Finding paths between domains '{domain1}' and '{domain2}'...")
 
-        domain1_dashboards = await db.get_domain_metrics(domain1)
-        domain2_dashboards = await db.get_domain_metrics(domain2)
-
-        paths = []
-        for db1 in domain1_dashboards.get("metrics", []):
-            for db2 in domain2_dashboards.get("metrics", []):
-                dashboard_paths = await db.get_dashboard_paths(db1["name"], db2["name"])
-                if dashboard_paths:
-                    paths.extend(dashboard_paths)
-        return paths
+        return await db.get_domain_paths(domain1, domain2, max_hops=max_hops, limit=limit)
 
     # LLM Agent Tools
     @mcp.tool()
+    @traced
     async def process_query(
         query: str = Field(description="The query to process"),
         chat_history: List[Dict[str, str]] = Field(default=[], description="Chat history"),
@@ -158,14 +260,32 @@ async def run_server():
                 await ctx.error(f"Error processing query: {str(e)}")
             raise
 
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(request: Request) -> Response:
+        body, content_type = exposition()
+        return Response(body, media_type=content_type)
+
     # Resources
     @mcp.resource("config://version")
     def get_version() -> str:
         return "1.0.0"
 
+    @mcp.resource("catalog://version")
+    async def get_catalog_version() -> str:
+        """Version of the catalog the tools currently answer from."""
+        return await db.current_catalog_version()
+
+    @mcp.resource("trace://{trace_id}")
+    async def get_trace(trace_id: str) -> Dict[str, Any]:
+        """Milliseconds spent in tools and database calls for a recent trace."""
+        return tracer.timings(trace_id)
+
     @mcp.resource("metrics://{metric_name}")
     async def get_metric(metric_name: str) -> Dict[str, Any]:
-        metrics = await db.search_metric_by_name(metric_name)
+        metric = await db.get_metric(metric_name)
+        if metric:
+            return metric
+        metrics = await db.search_metric_by_name(metric_name, limit=1)
         return metrics[0] if metrics else {}
 
     def signal_handler(signum, frame):
@@ -182,10 +302,95 @@ async def run_server():
 
     await mcp.run_async(transport='sse')
 
-@click.command()
+async def bootstrap_schema():
+    await db.connect(ensure_schema=False)
+    try:
+        applied = await db.ensure_schema()
+        for statement in applied:
+            click.echo(statement)
+    finally:
+        await db.disconnect()
+
+async def bulk_load(source: Path, batch_size: int, concurrency: int, edge_concurrency: int):
+    await db.connect(ensure_schema=True)
+    try:
+        loader = BulkLoader(db, batch_size, concurrency, edge_concurrency)
+        echo_load_stats(await loader.load_directory(source))
+    finally:
+        await db.disconnect()
+
+def echo_load_stats(stats):
+    for item in stats:
+        click.echo(f"{item.source}: {item.rows} rows in {item.seconds:.2f}s ({item.rows_per_second:.0f} rows/s)")
+    rows = sum(item.rows for item in stats)
+    seconds = sum(item.seconds for item in stats)
+    click.echo(f"Total: {rows} rows in {seconds:.2f}s ({rows / seconds if seconds else 0:.0f} rows/s)")
+
+async def load_generated(generator: CatalogGenerator, batch_size: int, concurrency: int, edge_concurrency: int):
+    await db.connect(ensure_schema=True)
+    try:
+        loader = BulkLoader(db, batch_size, concurrency, edge_concurrency)
+        nodes = {label: generator.nodes(label) for label in NODE_FILES}
+        echo_load_stats(await loader.load_catalog(nodes, generator.edges(), f"generated (seed {generator.seed})"))
+    finally:
+        await db.disconnect()
+
+@click.group(invoke_without_command=True)
 @click.option("--port", default=settings.PORT, help="Port to listen", type=int)
-def main(port: int):
-    asyncio.run(run_server())
+@click.pass_context
+def main(ctx: click.Context, port: int):
+    """Run the MCP server (default) or a maintenance subcommand."""
+    if ctx.invoked_subcommand is None:
+        asyncio.run(run_server())
+
+@main.command()
+def schema():
+    """Create the Neo4j constraints and full-text indexes, then exit."""
+    asyncio.run(bootstrap_schema())
+
+@main.command()
+@click.argument("source", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--batch-size", default=settings.LOAD_BATCH_SIZE, help="Rows per UNWIND batch", type=int)
+@click.option("--concurrency", default=settings.LOAD_CONCURRENCY, help="Node batches in flight", type=int)
+@click.option("--edge-concurrency", default=settings.LOAD_EDGE_CONCURRENCY, help="Edge batches in flight", type=int)
+def load(source: Path, batch_size: int, concurrency: int, edge_concurrency: int):
+    """Bulk-load catalog CSV/JSONL files from SOURCE into Neo4j."""
+    asyncio.run(bulk_load(source, batch_size, concurrency, edge_concurrency))
+
+@main.command()
+@click.option("--metrics", default=10_000, help="Metric nodes; other node counts scale with it", type=int)
+@click.option("--seed", default=0, help="Seed; the same size and seed give the same catalog", type=int)
+@click.option("--dashboards", default=None, help="Dashboard nodes (default: metrics / 4)", type=int)
+@click.option("--domains", default=None, help="Domain nodes (default: metrics / 1000)", type=int)
+@click.option("--authors", default=None, help="Author nodes (default: metrics / 80)", type=int)
+@click.option("--output", "-o", type=click.Path(file_okay=False, path_type=Path), help="Write loader files to this directory")
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]), default="csv", help="Format of written files")
+@click.option("--load", "load_now", is_flag=True, help="Load the catalog into Neo4j instead of writing files")
+@click.option("--batch-size", default=settings.LOAD_BATCH_SIZE, help="Rows per UNWIND batch", type=int)
+@click.option("--concurrency", default=settings.LOAD_CONCURRENCY, help="Node batches in flight", type=int)
+@click.option("--edge-concurrency", default=settings.LOAD_EDGE_CONCURRENCY, help="Edge batches in flight", type=int)
+def generate(
+    metrics: int,
+    seed: int,
+    dashboards: Optional[int],
+    domains: Optional[int],
+    authors: Optional[int],
+    output: Optional[Path],
+    file_format: str,
+    load_now: bool,
+    batch_size: int,
+    concurrency: int,
+    edge_concurrency: int
+):
+    """Generate a synthetic power-law catalog as loader files or straight into Neo4j."""
+    if not output and not load_now:
+        raise click.UsageError("Pass --output DIRECTORY or --load")
+    generator = CatalogGenerator(metrics, seed, dashboards=dashboards, domains=domains, authors=authors)
+    if output:
+        for name, rows in generator.write(output, file_format).items():
+            click.echo(f"{output / name}: {rows} rows")
+    if load_now:
+        asyncio.run(load_generated(generator, batch_size, concurrency, edge_concurrency))
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,650 @@
+"""
+Storage backends behind ``MetricsDatabase``.
+
+``Neo4jBackend`` answers every read with Cypher over the async driver.
+``MemoryBackend`` keeps the catalog in process as a ``GraphSnapshot``
+(compact adjacency arrays and per-label name indexes), loaded from the same
+``seed.cypher`` script or bulk loader files Neo4j is seeded from, so a small
+deployment or a dev box needs no database server. ``create_backend`` picks
+one from ``STORAGE_BACKEND``.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS, SummaryCounters
+from neo4j.exceptions import ClientError
+
+from mcp_server.core.config.settings import settings
+from mcp_server.core.errors import ConnectionError, DatabaseError, QueryError
+from mcp_server.core.loader import catalog_files, read_catalog
+from mcp_server.core.snapshot import NODE_LABELS, EdgeRow, GraphSnapshot, NodeRow, owner_projection
+from mcp_server.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Idempotent schema statements applied by ``Neo4jBackend.ensure_schema``.
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT metric_name_unique IF NOT EXISTS "
+    "FOR (m:Metric) REQUIRE m.name IS UNIQUE",
+    "CREATE CONSTRAINT dashboard_name_unique IF NOT EXISTS "
+    "FOR (d:Dashboard) REQUIRE d.name IS UNIQUE",
+    "CREATE CONSTRAINT domain_name_unique IF NOT EXISTS "
+    "FOR (d:Domain) REQUIRE d.name IS UNIQUE",
+    "CREATE CONSTRAINT author_name_unique IF NOT EXISTS "
+    "FOR (a:Author) REQUIRE a.name IS UNIQUE",
+    "CREATE FULLTEXT INDEX metric_search IF NOT EXISTS "
+    "FOR (m:Metric) ON EACH [m.name, m.description, m.definition]",
+    "CREATE FULLTEXT INDEX dashboard_search IF NOT EXISTS "
+    "FOR (d:Dashboard) ON EACH [d.name, d.description]",
+    "CREATE FULLTEXT INDEX domain_search IF NOT EXISTS "
+    "FOR (d:Domain) ON EACH [d.name, d.description]",
+]
+
+SEARCH_INDEXES = {
+    "Metric": "metric_search",
+    "Dashboard": "dashboard_search",
+    "Domain": "domain_search",
+}
+
+CATALOG_VERSION_QUERY = """
+OPTIONAL MATCH (v:CatalogVersion)
+WITH max(v.version) as version
+CALL { MATCH (n) RETURN count(n) as nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) as relationships }
+RETURN version, nodes, relationships
+"""
+
+# Authors matched by the given pattern, most matches first, with their email and manager
+_OWNERS = """
+    owners: COLLECT {
+        MATCH %s
+        WITH a, count(*) as owned
+        RETURN a {
+            .name, .email,
+            manager: head(COLLECT { MATCH (boss:Author)-[:MANAGES]->(a) RETURN boss.name ORDER BY boss.name })
+        }
+        ORDER BY owned DESC, a.name LIMIT $limit
+    }"""
+
+# A node and its capped neighborhood in one round trip; the same projection as ``GraphSnapshot.details``
+DETAIL_QUERIES = {
+    "Metric": """
+MATCH (n:Metric {name: $name})
+RETURN n {
+    .*,
+    description: coalesce(n.description, n.definition),
+    data_source: n.source,
+    dashboards: COLLECT { MATCH (d:Dashboard)-[:SHOWS]->(n) RETURN DISTINCT d.name as name ORDER BY name LIMIT $limit },
+    dashboard_count: COUNT { (:Dashboard)-[:SHOWS]->(n) },
+    domains: COLLECT {
+        MATCH (n)<-[:SHOWS]-(:Dashboard)-[:PART_OF]->(dom:Domain) RETURN dom.name as name
+        UNION
+        MATCH (dom:Domain)-[:CONTAINS]->(n) RETURN dom.name as name
+    },""" + _OWNERS % "(a:Author)-[:OWNS]->(:Dashboard)-[:SHOWS]->(n)" + """,
+    related_metrics: COLLECT {
+        MATCH (d:Dashboard)-[:SHOWS]->(n)
+        WITH DISTINCT d ORDER BY d.name LIMIT $scan
+        MATCH (d)-[:SHOWS]->(other:Metric)
+        WHERE other <> n
+        WITH other, count(*) as shared
+        RETURN other.name ORDER BY shared DESC, other.name LIMIT $limit
+    }
+} as details
+""",
+    "Dashboard": """
+MATCH (n:Dashboard {name: $name})
+RETURN n {
+    .*,
+    domains: COLLECT { MATCH (n)-[:PART_OF]->(dom:Domain) RETURN DISTINCT dom.name as name ORDER BY name LIMIT $limit },""" + _OWNERS % "(a:Author)-[:OWNS]->(n)" + """,
+    metrics: COLLECT { MATCH (n)-[:SHOWS]->(m:Metric) RETURN DISTINCT m.name as name ORDER BY name LIMIT $limit },
+    metric_count: COUNT { (n)-[:SHOWS]->(:Metric) }
+} as details
+""",
+    "Domain": """
+MATCH (n:Domain {name: $name})
+RETURN n {
+    .*,
+    dashboards: COLLECT { MATCH (d:Dashboard)-[:PART_OF]->(n) RETURN DISTINCT d.name as name ORDER BY name LIMIT $limit },
+    dashboard_count: COUNT { (:Dashboard)-[:PART_OF]->(n) },""" + _OWNERS % "(a:Author)-[:OWNS]->(:Dashboard)-[:PART_OF]->(n)" + """
+} as details
+""",
+}
+
+# Metrics on a dashboard, or on any dashboard of (or contained by) a domain
+METRIC_LIST_QUERIES = {
+    "Dashboard": """
+MATCH (n:Dashboard {name: $name})
+WITH COLLECT { MATCH (n)-[:SHOWS]->(m:Metric) RETURN DISTINCT m } as metrics
+""",
+    "Domain": """
+MATCH (n:Domain {name: $name})
+WITH COLLECT {
+    MATCH (n)<-[:PART_OF]-(:Dashboard)-[:SHOWS]->(m:Metric) RETURN m
+    UNION
+    MATCH (n)-[:CONTAINS]->(m:Metric) RETURN m
+} as metrics
+""",
+}
+METRIC_LIST_PAGE = """
+RETURN size(metrics) as total,
+       COLLECT { UNWIND metrics as m RETURN m {.name, description: coalesce(m.description, m.definition)} ORDER BY m.name LIMIT $limit } as items
+"""
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def fulltext_query(text: str) -> str:
+    """Build a Lucene query ranking exact, prefix and infix term matches."""
+    clauses = []
+    for term in text.lower().split():
+        term = _LUCENE_SPECIAL.sub(r"\\\1", term)
+        clauses.append(f"({term}^3 OR {term}*^2 OR *{term}*)")
+    return " AND ".join(clauses)
+
+def _catalog_version(record: Dict[str, Any]) -> str:
+    return f"{record['version'] or 0}:{record['nodes']}:{record['relationships']}"
+
+def _path_data(path) -> Dict[str, Any]:
+    """Convert a Neo4j path into plain node names and relationships."""
+    return {
+        "nodes": [node["name"] for node in path.nodes],
+        "relationships": [
+            {
+                "start": rel.start_node["name"],
+                "end": rel.end_node["name"],
+                "type": rel.type
+            }
+            for rel in path.relationships
+        ]
+    }
+
+
+class StorageBackend(ABC):
+    """Where ``MetricsDatabase`` reads the catalog from when no snapshot is loaded.
+
+    Labels are validated and limits defaulted by ``MetricsDatabase``;
+    backends only answer.
+    """
+
+    # Sessions holding a pooled connection, for monitoring
+    open_sessions = 0
+
+    @abstractmethod
+    async def connect(self):
+        """Open connections or load data; called once before any read."""
+
+    @abstractmethod
+    async def disconnect(self):
+        """Release connections."""
+
+    @abstractmethod
+    async def ensure_schema(self) -> List[str]:
+        """Create constraints and indexes if missing and return the statements applied."""
+
+    @abstractmethod
+    async def write(self, query: str, **params) -> Any:
+        """Run a write query and return its counters."""
+
+    @abstractmethod
+    async def bump_catalog_version(self):
+        """Mark the catalog as changed so snapshots reload."""
+
+    @abstractmethod
+    async def get_catalog_version(self) -> str:
+        """Return a cheap fingerprint of the catalog contents."""
+
+    @abstractmethod
+    async def load_snapshot(self) -> GraphSnapshot:
+        """Return the whole catalog as an in-memory snapshot."""
+
+    @abstractmethod
+    def stream_nodes(
+        self,
+        label: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield name and description of ``label`` nodes in name order, after the name ``after``."""
+
+    @abstractmethod
+    async def count_nodes(self, label: str) -> int:
+        """Count nodes with ``label``."""
+
+    @abstractmethod
+    async def search(self, label: str, text: str, limit: int) -> List[Dict[str, Any]]:
+        """Ranked search hits for ``text``; an empty text lists nodes in name order."""
+
+    @abstractmethod
+    async def search_page(self, label: str, text: str, limit: int, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of ranked search hits and the total number of hits."""
+
+    @abstractmethod
+    async def get_node(self, label: str, name: str) -> Optional[Dict[str, Any]]:
+        """Properties of the node with an exact name."""
+
+    @abstractmethod
+    async def get_names(self, label: str) -> List[str]:
+        """Every name of ``label`` nodes."""
+
+    @abstractmethod
+    async def get_details(self, label: str, name: str, limit: int, scan: int) -> Optional[Dict[str, Any]]:
+        """A node with its capped neighborhood, or None if there is no such node."""
+
+    @abstractmethod
+    async def get_metrics_of(self, label: str, name: str, limit: int) -> Optional[Dict[str, Any]]:
+        """The first ``limit`` metrics of a dashboard or domain by name, and their total."""
+
+    @abstractmethod
+    async def get_dashboard_paths(self, dashboard1: str, dashboard2: str, max_hops: int) -> List[Dict[str, Any]]:
+        """A shortest path between two dashboards, within ``max_hops``."""
+
+    @abstractmethod
+    async def get_domain_paths(self, domain1: str, domain2: str, max_hops: int, limit: int) -> List[Dict[str, Any]]:
+        """Distinct shortest paths between the dashboards of two domains."""
+
+
+class Neo4jBackend(StorageBackend):
+    """Catalog stored in Neo4j and read with Cypher."""
+
+    def __init__(self):
+        self.driver = None
+        self.uri = settings.NEO4J_URI
+        self.user = settings.NEO4J_USER
+        self.password = settings.NEO4J_PASSWORD
+        self.database = settings.NEO4J_DATABASE
+        self.open_sessions = 0
+
+    async def connect(self):
+        """Connect to the Neo4j database."""
+        try:
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+                max_connection_lifetime=settings.NEO4J_MAX_CONNECTION_LIFETIME,
+                max_transaction_retry_time=settings.NEO4J_MAX_TRANSACTION_RETRY_TIME,
+                fetch_size=settings.NEO4J_FETCH_SIZE
+            )
+            # Verify connection
+            await self.driver.verify_connectivity()
+            logger.info("Successfully connected to Neo4j")
+        except Exception as e:
+            logger.error(f"Failed to connect to Neo4j: {e}")
+            raise
+
+    async def ensure_schema(self) -> List[str]:
+        """Create uniqueness constraints and full-text indexes if missing.
+
+        Every statement uses ``IF NOT EXISTS`` so this is safe to run on each
+        start. A statement that fails (e.g. a uniqueness constraint over
+        existing duplicate names) is logged and skipped so the server can
+        still come up.
+        """
+        applied = []
+        async with self._session(WRITE_ACCESS) as session:
+            for statement in SCHEMA_STATEMENTS:
+                try:
+                    result = await session.run(statement)
+                    await result.consume()
+                    applied.append(statement)
+                except ClientError as e:
+                    logger.warning(f"Could not apply schema statement '{statement}': {e}")
+            # Make sure freshly created indexes are usable before serving queries
+            result = await session.run("CALL db.awaitIndexes(300)")
+            await result.consume()
+        logger.info(f"Schema bootstrap applied {len(applied)}/{len(SCHEMA_STATEMENTS)} statements")
+        return applied
+
+    async def disconnect(self):
+        """Close the database connection."""
+        if self.driver:
+            await self.driver.close()
+            self.driver = None
+            logger.info("Disconnected from Neo4j")
+
+    @asynccontextmanager
+    async def _session(self, access_mode: str = READ_ACCESS):
+        """Open a session routed to readers or the writer of the configured database."""
+        self.open_sessions += 1
+        try:
+            async with self.driver.session(
+                database=self.database,
+                default_access_mode=access_mode,
+                fetch_size=settings.NEO4J_FETCH_SIZE
+            ) as session:
+                yield session
+        finally:
+            self.open_sessions -= 1
+
+    async def _read(self, query: str, **params) -> List[Dict[str, Any]]:
+        """Run a read query in a managed transaction, retried on transient errors."""
+        return (await self.read_batch([(query, params)]))[0]
+
+    async def read_batch(self, queries: List[Tuple[str, Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """Run several read queries in one session and one read transaction.
+
+        The whole batch is retried together on transient failures, and every
+        query sees the same consistent view of the graph.
+        """
+        async def work(tx):
+            results = []
+            for query, params in queries:
+                result = await tx.run(query, params)
+                results.append([dict(record) async for record in result])
+            return results
+
+        with tracer.span("neo4j read", "database", queries=len(queries)):
+            async with self._session() as session:
+                return await session.execute_read(work)
+
+    async def write(self, query: str, **params) -> SummaryCounters:
+        """Run a write query in a managed transaction and return its counters."""
+        async def work(tx):
+            result = await tx.run(query, params)
+            summary = await result.consume()
+            return summary.counters
+
+        with tracer.span("neo4j write", "database"):
+            async with self._session(WRITE_ACCESS) as session:
+                return await session.execute_write(work)
+
+    async def bump_catalog_version(self):
+        await self.write(
+            "MERGE (v:CatalogVersion {name: 'catalog'}) "
+            "SET v.version = coalesce(v.version, 0) + 1"
+        )
+
+    async def get_catalog_version(self) -> str:
+        """Combine the ``:CatalogVersion`` counter, which writers bump on every
+        change, with node and relationship counts Neo4j answers from its count store.
+        """
+        records = await self._read(CATALOG_VERSION_QUERY)
+        return _catalog_version(records[0])
+
+    async def load_snapshot(self) -> GraphSnapshot:
+        """Read the whole catalog graph into a new in-memory snapshot."""
+        labels = list(NODE_LABELS)
+        # One transaction, so the version matches the nodes and edges read
+        versions, node_records, edge_records = await self.read_batch([
+            (CATALOG_VERSION_QUERY, {}),
+            (
+                "MATCH (n) WHERE any(label IN labels(n) WHERE label IN $labels) "
+                "RETURN [label IN labels(n) WHERE label IN $labels][0] as label, properties(n) as props",
+                {"labels": labels}
+            ),
+            (
+                "MATCH (a)-[r]->(b) "
+                "WHERE a.name IS NOT NULL AND b.name IS NOT NULL "
+                "AND any(label IN labels(a) WHERE label IN $labels) "
+                "AND any(label IN labels(b) WHERE label IN $labels) "
+                "RETURN [label IN labels(a) WHERE label IN $labels][0] as start_label, a.name as start, "
+                "type(r) as type, [label IN labels(b) WHERE label IN $labels][0] as end_label, b.name as end",
+                {"labels": labels}
+            )
+        ])
+        version = _catalog_version(versions[0])
+        nodes = [(record["label"], record["props"]) for record in node_records]
+        edges = [tuple(record.values()) for record in edge_records]
+        # Indexing is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(GraphSnapshot, nodes, edges, version)
+
+    async def stream_nodes(
+        self,
+        label: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records as the driver fetches them instead of building a list."""
+        where = "n.name > $after" if after is not None else "n.name IS NOT NULL"
+        query = (
+            f"MATCH (n:{label}) WHERE {where} "
+            "RETURN n.name as name, coalesce(n.description, n.definition) as description ORDER BY n.name"
+        )
+        if limit is not None:
+            query += " LIMIT $limit"
+        # Includes the time the consumer spends between records
+        with tracer.span("neo4j stream", "database", label=label):
+            async with self._session() as session:
+                result = await session.run(query, after=after, limit=limit)
+                async for record in result:
+                    yield dict(record)
+
+    async def count_nodes(self, label: str) -> int:
+        records = await self._read(f"MATCH (n:{label}) RETURN count(n) as total")
+        return records[0]["total"]
+
+    async def search(self, label: str, text: str, limit: int) -> List[Dict[str, Any]]:
+        """Query the full-text index for ``label``; an empty text is served
+        in name order from the uniqueness index.
+        """
+        query = fulltext_query(text)
+        if not query:
+            return await self._read(
+                f"MATCH (n:{label}) WHERE n.name IS NOT NULL "
+                "RETURN n.name as name, coalesce(n.description, n.definition) as description "
+                "ORDER BY n.name LIMIT $limit",
+                limit=limit
+            )
+        return await self._read(
+            "CALL db.index.fulltext.queryNodes($index, $query, {limit: $limit}) "
+            "YIELD node, score "
+            "RETURN node.name as name, coalesce(node.description, node.definition) as description, score",
+            index=SEARCH_INDEXES[label],
+            query=query,
+            limit=limit
+        )
+
+    async def search_page(self, label: str, text: str, limit: int, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        query = fulltext_query(text)
+        index = SEARCH_INDEXES[label]
+        items, counts = await self.read_batch([
+            (
+                "CALL db.index.fulltext.queryNodes($index, $query, {skip: $skip, limit: $limit}) "
+                "YIELD node, score "
+                "RETURN node.name as name, coalesce(node.description, node.definition) as description, score",
+                {"index": index, "query": query, "skip": offset, "limit": limit}
+            ),
+            (
+                "CALL db.index.fulltext.queryNodes($index, $query) YIELD node "
+                "RETURN count(node) as total",
+                {"index": index, "query": query}
+            )
+        ])
+        return items, counts[0]["total"]
+
+    async def get_node(self, label: str, name: str) -> Optional[Dict[str, Any]]:
+        records = await self._read(
+            f"MATCH (n:{label} {{name: $name}}) RETURN properties(n) as props",
+            name=name
+        )
+        return records[0]["props"] if records else None
+
+    async def get_names(self, label: str) -> List[str]:
+        records = await self._read(f"MATCH (n:{label}) RETURN n.name as name")
+        return [record["name"] for record in records]
+
+    async def get_details(self, label: str, name: str, limit: int, scan: int) -> Optional[Dict[str, Any]]:
+        records = await self._read(DETAIL_QUERIES[label], name=name, limit=limit, scan=scan)
+        if not records:
+            return None
+        details = dict(records[0]["details"])
+        if "domains" in details:
+            # UNION results cannot be ordered inside the subquery
+            details["domains"] = sorted(details["domains"])[:limit]
+        return owner_projection(details)
+
+    async def get_metrics_of(self, label: str, name: str, limit: int) -> Optional[Dict[str, Any]]:
+        records = await self._read(METRIC_LIST_QUERIES[label] + METRIC_LIST_PAGE, name=name, limit=limit)
+        if not records:
+            return None
+        return {label.lower(): name, "items": records[0]["items"], "total": records[0]["total"]}
+
+    async def get_dashboard_paths(self, dashboard1: str, dashboard2: str, max_hops: int) -> List[Dict[str, Any]]:
+        # Variable-length bounds cannot be query parameters
+        records = await self._read(
+            f"""
+            MATCH path = shortestPath((d1:Dashboard {{name: $d1}})-[*..{int(max_hops)}]-(d2:Dashboard {{name: $d2}}))
+            RETURN path
+            """,
+            d1=dashboard1,
+            d2=dashboard2
+        )
+        return [_path_data(record["path"]) for record in records]
+
+    async def get_domain_paths(self, domain1: str, domain2: str, max_hops: int, limit: int) -> List[Dict[str, Any]]:
+        records = await self._read(
+            f"""
+            MATCH (:Domain {{name: $domain1}})<-[:PART_OF]-(d1:Dashboard)
+            WITH collect(DISTINCT d1) as sources
+            MATCH (:Domain {{name: $domain2}})<-[:PART_OF]-(d2:Dashboard)
+            WITH sources, collect(DISTINCT d2) as targets
+            UNWIND sources as d1
+            UNWIND targets as d2
+            WITH d1, d2 WHERE d1 <> d2
+            MATCH path = shortestPath((d1)-[*..{int(max_hops)}]-(d2))
+            RETURN path
+            """,
+            domain1=domain1,
+            domain2=domain2
+        )
+        paths = []
+        seen = set()
+        for record in records:
+            path_data = _path_data(record["path"])
+            key = tuple(path_data["nodes"])
+            key = min(key, key[::-1])
+            if key in seen:
+                continue
+            seen.add(key)
+            paths.append(path_data)
+            if len(paths) >= limit:
+                break
+        return paths
+
+
+class MemoryBackend(StorageBackend):
+    """Catalog held in process as a ``GraphSnapshot``.
+
+    Loaded from ``path``, a ``seed.cypher`` script or a bulk loader directory,
+    or from ready-made ``rows``. The catalog version follows the files'
+    modification times, so the snapshot poll reloads the graph when they are
+    edited. Writes are not supported: change the files instead.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        rows: Optional[Tuple[List[NodeRow], List[EdgeRow]]] = None
+    ):
+        self.path = path
+        self.rows = rows
+        self.graph: Optional[GraphSnapshot] = None
+        self.generation = 0
+
+    async def connect(self):
+        """Load the catalog files into the in-process graph."""
+        if self.rows is None and (self.path is None or not self.path.exists()):
+            raise ConnectionError(
+                f"Memory backend needs MEMORY_CATALOG_PATH to name a seed.cypher file or loader directory, got {self.path}"
+            )
+        started = time.monotonic()
+        graph = await self.load_snapshot()
+        logger.info(
+            f"Loaded in-memory catalog: {len(graph.names)} nodes, {graph.edge_count} edges "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+
+    async def disconnect(self):
+        pass
+
+    async def ensure_schema(self) -> List[str]:
+        # Name indexes are built with the graph
+        return []
+
+    async def write(self, query: str, **params) -> Any:
+        raise QueryError("The memory backend is read-only; edit its catalog files instead")
+
+    async def bump_catalog_version(self):
+        self.generation += 1
+
+    async def get_catalog_version(self) -> str:
+        if self.path is None:
+            return str(self.generation)
+        stats = [path.stat() for path in catalog_files(self.path)]
+        return f"{self.generation}:{max((stat.st_mtime_ns for stat in stats), default=0)}:{sum(stat.st_size for stat in stats)}"
+
+    async def load_snapshot(self) -> GraphSnapshot:
+        """Return the graph, re-reading the files first if they changed."""
+        version = await self.get_catalog_version()
+        if self.graph is None or self.graph.version != version:
+            self.graph = await asyncio.to_thread(self._build, version)
+        return self.graph
+
+    def _build(self, version: str) -> GraphSnapshot:
+        nodes, edges = self.rows if self.rows is not None else read_catalog(self.path)
+        return GraphSnapshot(nodes, edges, version)
+
+    def _current(self) -> GraphSnapshot:
+        if self.graph is None:
+            raise ConnectionError("Memory backend is not connected")
+        return self.graph
+
+    async def stream_nodes(
+        self,
+        label: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        for item in self._current().page(label, after, limit):
+            yield item
+
+    async def count_nodes(self, label: str) -> int:
+        return len(self._current().index[label])
+
+    async def search(self, label: str, text: str, limit: int) -> List[Dict[str, Any]]:
+        return self._current().search(label, text, limit)
+
+    async def search_page(self, label: str, text: str, limit: int, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        hits = self._current().search(label, text)
+        return hits[offset:offset + limit], len(hits)
+
+    async def get_node(self, label: str, name: str) -> Optional[Dict[str, Any]]:
+        return self._current().node(label, name)
+
+    async def get_names(self, label: str) -> List[str]:
+        return list(self._current().sorted_names[label])
+
+    async def get_details(self, label: str, name: str, limit: int, scan: int) -> Optional[Dict[str, Any]]:
+        return self._current().details(label, name, limit, scan)
+
+    async def get_metrics_of(self, label: str, name: str, limit: int) -> Optional[Dict[str, Any]]:
+        return self._current().metrics_of(label, name, limit)
+
+    async def get_dashboard_paths(self, dashboard1: str, dashboard2: str, max_hops: int) -> List[Dict[str, Any]]:
+        graph = self._current()
+        start = graph.node_id("Dashboard", dashboard1)
+        end = graph.node_id("Dashboard", dashboard2)
+        if start is None or end is None or start == end:
+            return []
+        return graph.shortest_paths([start], [end], max_hops, limit=1)
+
+    async def get_domain_paths(self, domain1: str, domain2: str, max_hops: int, limit: int) -> List[Dict[str, Any]]:
+        return self._current().domain_paths(domain1, domain2, max_hops, limit)
+
+
+def create_backend() -> StorageBackend:
+    """The storage backend named by ``STORAGE_BACKEND``."""
+    if settings.STORAGE_BACKEND == "neo4j":
+        return Neo4jBackend()
+    if settings.STORAGE_BACKEND == "memory":
+        path = settings.MEMORY_CATALOG_PATH
+        return MemoryBackend(Path(path) if path else None)
+    raise DatabaseError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND} (expected neo4j or memory)")
@@ -9,10 +9,53 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
 
+    # Storage backend settings: "neo4j", or "memory" to serve the catalog
+    # in process from a seed.cypher file or bulk loader directory
+    STORAGE_BACKEND: str = "neo4j"
+    MEMORY_CATALOG_PATH: Optional[str] = None
+
     # Database settings
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
+    NEO4J_DATABASE: Optional[str] = None
+
+    # Neo4j driver pool settings
+    NEO4J_MAX_CONNECTION_POOL_SIZE: int = 100
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT: float = 60.0
+    NEO4J_MAX_CONNECTION_LIFETIME: float = 3600.0
+    NEO4J_MAX_TRANSACTION_RETRY_TIME: float = 15.0
+    NEO4J_FETCH_SIZE: int = 1000
+
+    # Bulk loader settings
+    LOAD_BATCH_SIZE: int = 5000
+    LOAD_CONCURRENCY: int = 4
+    LOAD_EDGE_CONCURRENCY: int = 2
+
+    # Schema and search settings
+    SCHEMA_BOOTSTRAP: bool = True
+    SEARCH_RESULT_LIMIT: int = 25
+    PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
+    PATH_MAX_HOPS: int = 5
+    PATH_RESULT_LIMIT: int = 100
+
+    # In-memory catalog snapshot settings
+    SNAPSHOT_ENABLED: bool = True
+    SNAPSHOT_REFRESH_INTERVAL: int = 3600
+    SNAPSHOT_POLL_INTERVAL: int = 30
+
+    # Precomputed dashboard path index settings
+    PATH_INDEX_ENABLED: bool = True
+    PATH_INDEX_MAX_CELLS: int = 20_000_000
+
+    # Fuzzy catalog search settings
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_MIN_SCORE: float = 0.45
+
+    # Entity detail settings
+    DETAIL_LIST_LIMIT: int = 25
+    DETAIL_SCAN_LIMIT: int = 1000
 
     # LLM settings
     OPENAI_API_KEY: Optional[str] = None
@@ -20,6 +63,11 @@ class Settings(BaseSettings):
     MAX_TOKENS: int = 2000
     TEMPERATURE: float = 0.7
 
+    # Tracing settings
+    TRACE_EXPORT_PATH: Optional[str] = None
+    TRACE_SERVICE_NAME: str = "mcp_server"
+    TRACE_LOG_SIZE: int = 1024
+
     #HEALTHCHECK
     HEALTH_CHECK_INTERVAL: int = 30
     HEALTH_CHECK_TIMEOUT: int = 5
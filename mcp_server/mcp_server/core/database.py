@@ -2,110 +2,369 @@
 Database module for FastMCP server.
 
 This module provides database functionality for storing and retrieving metrics.
+Reads are answered from the in-memory catalog snapshot when one is loaded and
+from the configured storage backend (see ``backends``) otherwise.
 """
 
+import asyncio
+import base64
+import json
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from neo4j import AsyncGraphDatabase
-from neo4j.exceptions import ServiceUnavailable, AuthError, ClientError
+from typing import AsyncIterator, Coroutine, Iterable, List, Dict, Any, Optional, Set
 from mcp_server.core.config.settings import settings
+from mcp_server.core.backends import DETAIL_QUERIES, METRIC_LIST_QUERIES, StorageBackend, create_backend
+from mcp_server.core.errors import DatabaseError, ConnectionError, QueryError
+from mcp_server.core.snapshot import GraphSnapshot, SnapshotCache, NODE_LABELS
+from mcp_server.core.path_index import DashboardPathIndex
+from mcp_server.core.search_index import SEARCH_LABELS, CatalogSearchIndex
+from mcp_server.core.singleflight import SingleFlight, coalesced
+from mcp_server.core.monitoring import measured
 
 
 logger = logging.getLogger(__name__)
 
-class DatabaseError(Exception):
-    """Base exception for database operations."""
-    pass
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a page position as an opaque cursor string."""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
 
-class ConnectionError(DatabaseError):
-    """Raised when there are issues connecting to the database."""
-    pass
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``; None means the first page."""
+    if not cursor:
+        return {}
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise QueryError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, dict):
+        raise QueryError(f"Invalid cursor: {cursor}")
+    after, offset = position.get("after"), position.get("offset", 0)
+    if after is not None and not isinstance(after, str):
+        raise QueryError(f"Invalid cursor: {cursor}")
+    if isinstance(offset, bool) or not isinstance(offset, int) or offset < 0:
+        raise QueryError(f"Invalid cursor: {cursor}")
+    return position
 
-class QueryError(DatabaseError):
-    """Raised when there are issues executing queries."""
-    pass
+def _page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or settings.PAGE_SIZE, settings.MAX_PAGE_SIZE))
 
 class MetricsDatabase:
     """Database class for metrics storage."""
 
-    def __init__(self):
-        self.driver = None
-        self.uri = settings.NEO4J_URI
-        self.user = settings.NEO4J_USER
-        self.password = settings.NEO4J_PASSWORD
-
-    async def connect(self):
-        """Connect to the Neo4j database."""
-        try:
-            self.driver = AsyncGraphDatabase.driver(
-                self.uri,
-                auth=(self.user, self.password)
-            )
-            # Verify connection
-            async with self.driver.session() as session:
-                await session.run("RETURN 1")
-            logger.info("Successfully connected to Neo4j")
-        except Exception as e:
-            logger.error(f"Failed to connect to Neo4j: {e}")
-            raise
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or create_backend()
+        # Identical reads that overlap share one query; see ``coalesced``
+        self.inflight = SingleFlight()
+        self.snapshot = SnapshotCache(
+            loader=self.load_snapshot,
+            version_probe=self.get_catalog_version,
+            refresh_interval=settings.SNAPSHOT_REFRESH_INTERVAL,
+            poll_interval=settings.SNAPSHOT_POLL_INTERVAL
+        )
+        # The loop only keeps weak references to tasks; hold index updates until they finish
+        self._background: Set[asyncio.Task] = set()
+        self.path_index: Optional[DashboardPathIndex] = None
+        self._path_index_lock = asyncio.Lock()
+        if settings.PATH_INDEX_ENABLED:
+            self.snapshot.add_listener(self._schedule_path_index)
+        self.search_index: Optional[CatalogSearchIndex] = None
+        self._search_index_lock = asyncio.Lock()
+        if settings.SEARCH_INDEX_ENABLED:
+            self.snapshot.add_listener(self._schedule_search_index)
+
+    @property
+    def open_sessions(self) -> int:
+        return self.backend.open_sessions
+
+    async def connect(self, ensure_schema: Optional[bool] = None):
+        """Connect to the storage backend."""
+        await self.backend.connect()
+        if ensure_schema is None:
+            ensure_schema = settings.SCHEMA_BOOTSTRAP
+        if ensure_schema:
+            await self.ensure_schema()
+
+    async def ensure_schema(self) -> List[str]:
+        """Create uniqueness constraints and full-text indexes if missing."""
+        return await self.backend.ensure_schema()
 
     async def disconnect(self):
         """Close the database connection."""
-        if self.driver:
-            await self.driver.close()
-            self.driver = None
-            logger.info("Disconnected from Neo4j")
+        self.snapshot.stop()
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        await self.backend.disconnect()
+
+    async def write(self, query: str, **params) -> Any:
+        """Run a write query in a managed transaction and return its counters."""
+        return await self.backend.write(query, **params)
+
+    @measured
+    async def bump_catalog_version(self):
+        """Increment the catalog version so snapshots notice a content change."""
+        await self.backend.bump_catalog_version()
+
+    @coalesced
+    @measured
+    async def get_catalog_version(self) -> str:
+        """Return a cheap fingerprint of the catalog contents."""
+        return await self.backend.get_catalog_version()
+
+    async def current_catalog_version(self) -> str:
+        """Version of the data reads are served from: the snapshot's if one is loaded."""
+        if self.snapshot.current is not None:
+            return self.snapshot.current.version
+        return await self.get_catalog_version()
+
+    @measured
+    async def load_snapshot(self) -> GraphSnapshot:
+        """Read the whole catalog graph into a new in-memory snapshot."""
+        return await self.backend.load_snapshot()
+
+    def _schedule_path_index(self, snapshot: GraphSnapshot):
+        """Rebuild the dashboard path index for a new snapshot in the background."""
+        self._spawn(self._update_path_index(snapshot))
+
+    def _spawn(self, coroutine: Coroutine) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def _update_path_index(self, snapshot: GraphSnapshot):
+        async with self._path_index_lock:
+            # A newer snapshot already queued its own update
+            if snapshot is not self.snapshot.current:
+                return
+            try:
+                if self.path_index is None:
+                    index = await asyncio.to_thread(
+                        DashboardPathIndex.build, snapshot, settings.PATH_INDEX_MAX_CELLS
+                    )
+                else:
+                    index = await asyncio.to_thread(
+                        self.path_index.updated, snapshot, settings.PATH_INDEX_MAX_CELLS
+                    )
+                self.path_index = index
+            except Exception as e:
+                logger.error(f"Failed to update dashboard path index: {e}")
 
+    def _schedule_search_index(self, snapshot: GraphSnapshot):
+        """Bring the fuzzy search index up to a new snapshot in the background."""
+        self._spawn(self._update_search_index(snapshot))
+
+    async def _update_search_index(self, snapshot: GraphSnapshot):
+        async with self._search_index_lock:
+            if snapshot is not self.snapshot.current:
+                return
+            try:
+                if self.search_index is None:
+                    index = await asyncio.to_thread(CatalogSearchIndex.build, snapshot, settings.SEARCH_MIN_SCORE)
+                else:
+                    index = await asyncio.to_thread(self.search_index.updated, snapshot)
+                self.search_index = index
+            except Exception as e:
+                logger.error(f"Failed to update catalog search index: {e}")
+
+    @coalesced
+    @measured
     async def get_metrics(self) -> List[Dict[str, Any]]:
         """Get all metrics."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                "MATCH (m:Metric) RETURN m.name as name, m.description as description"
-            )
-            return [dict(record) async for record in result]
-
-    async def search_metric_by_name(self, name: str) -> List[Dict[str, Any]]:
-        """Search metrics by name."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                "MATCH (m:Metric) WHERE m.name CONTAINS $name "
-                "RETURN m.name as name, m.description as description",
-                name=name
-            )
-            return [dict(record) async for record in result]
-
-    async def search_dashboard_by_name(self, name: str) -> List[Dict[str, Any]]:
-        """Search dashboards by name."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                "MATCH (d:Dashboard) WHERE d.name CONTAINS $name "
-                "RETURN d.name as name, d.description as description",
-                name=name
-            )
-            return [dict(record) async for record in result]
+        return [metric async for metric in self.stream_nodes("Metric")]
+
+    async def stream_nodes(
+        self,
+        label: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield name and description of ``label`` nodes in name order.
+
+        Starts after the name ``after`` (keyset pagination) and streams records
+        as the backend produces them instead of building a list.
+        """
+        if label not in NODE_LABELS:
+            raise QueryError(f"Unknown label: {label}")
+        snapshot = self.snapshot.current
+        if snapshot is not None:
+            for item in snapshot.page(label, after, limit):
+                yield item
+            return
+        async for item in self.backend.stream_nodes(label, after, limit):
+            yield item
 
+    @coalesced
+    @measured
+    async def count_nodes(self, label: str) -> int:
+        """Count nodes with ``label``."""
+        if label not in NODE_LABELS:
+            raise QueryError(f"Unknown label: {label}")
+        if self.snapshot.current is not None:
+            return len(self.snapshot.current.index[label])
+        return await self.backend.count_nodes(label)
+
+    @coalesced
+    @measured
+    async def list_page(
+        self,
+        label: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return one page of ``label`` nodes in name order.
+
+        The result holds ``items``, the ``next_cursor`` to pass back for the
+        following page (None on the last page) and the ``total`` node count.
+        """
+        limit = _page_size(limit)
+        after = decode_cursor(cursor).get("after")
+        # Fetch one extra row to learn whether another page exists
+        items = [item async for item in self.stream_nodes(label, after, limit + 1)]
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor({"after": items[-1]["name"]})
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "total": await self.count_nodes(label)
+        }
+
+    @coalesced
+    @measured
+    async def search_page(
+        self,
+        label: str,
+        text: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return one page of ranked search hits, shaped like ``list_page``.
+
+        Ranked results have no stable key to seek on, so search cursors hold
+        an offset into the ranking. An empty search lists in name order.
+        """
+        if not text.strip():
+            return await self.list_page(label, limit, cursor)
+        limit = _page_size(limit)
+        offset = decode_cursor(cursor).get("offset", 0)
+        snapshot = self.snapshot.current
+        if snapshot is not None:
+            hits = snapshot.search(label, text)
+            items, total = hits[offset:offset + limit], len(hits)
+        else:
+            items, total = await self.backend.search_page(label, text, limit, offset)
+        next_offset = offset + len(items)
+        return {
+            "items": items,
+            "next_cursor": encode_cursor({"offset": next_offset}) if next_offset < total else None,
+            "total": total
+        }
+
+    @coalesced
+    @measured
+    async def get_metric(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a single metric by exact name."""
+        if self.snapshot.current is not None:
+            return self.snapshot.current.node("Metric", name)
+        return await self.backend.get_node("Metric", name)
+
+    @coalesced
+    @measured
+    async def search_metric_by_name(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search metrics by name, best matches first."""
+        return await self._search("Metric", name, limit)
+
+    @coalesced
+    @measured
+    async def search_dashboard_by_name(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search dashboards by name, best matches first."""
+        return await self._search("Dashboard", name, limit)
+
+    async def _search(self, label: str, text: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Run a ranked full-text search over the index for ``label``.
+
+        An empty search text matches everything, as the previous ``CONTAINS ''``
+        scan did, and is served in name order.
+        """
+        limit = limit or settings.SEARCH_RESULT_LIMIT
+        if self.snapshot.current is not None:
+            return self.snapshot.current.search(label, text, limit)
+        return await self.backend.search(label, text, limit)
+
+    @coalesced
+    @measured
+    async def search_catalog(
+        self,
+        text: str,
+        labels: Iterable[str] = SEARCH_LABELS,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Fuzzy search over metric, dashboard and domain names and descriptions.
+
+        Served from the trigram index once it has caught up with the current
+        snapshot. Until then, or without a snapshot, the backend's search is
+        run per label and its hits merged by score.
+        """
+        labels = tuple(dict.fromkeys(labels))
+        unknown = [label for label in labels if label not in SEARCH_LABELS]
+        if unknown:
+            raise QueryError(f"Unknown label: {unknown[0]}")
+        limit = limit or settings.SEARCH_RESULT_LIMIT
+        if not text.strip():
+            return []
+        index, snapshot = self.search_index, self.snapshot.current
+        if index is not None and snapshot is not None and index.version == snapshot.version:
+            return index.search(text, labels, limit)
+        hits = [{"label": label, **hit} for label in labels for hit in await self._search(label, text, limit)]
+        hits.sort(key=lambda hit: -hit.get("score", 0.0))
+        return hits[:limit]
+
+    @coalesced
+    @measured
     async def get_domains(self) -> List[str]:
         """Get all domains."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                "MATCH (d:Domain) RETURN d.name as name"
-            )
-            return [record["name"] async for record in result]
-
-    async def get_domain_metrics(self, domain: str) -> Dict[str, Any]:
-        """Get all metrics for a domain."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (d:Domain {name: $domain})-[:CONTAINS]->(m:Metric)
-                RETURN d.name as domain, collect(m) as metrics
-                """,
-                domain=domain
-            )
-            record = await result.single()
-            return dict(record) if record else {"domain": domain, "metrics": []}
+        if self.snapshot.current is not None:
+            return list(self.snapshot.current.sorted_names["Domain"])
+        return await self.backend.get_names("Domain")
+
+    @coalesced
+    @measured
+    async def get_details(self, label: str, name: str) -> Optional[Dict[str, Any]]:
+        """Get a metric, dashboard or domain with its owner, domain, dashboards and related metrics.
+
+        Lists are capped at ``DETAIL_LIST_LIMIT`` names; counts give their
+        full size. Returns None if there is no such node.
+        """
+        if label not in DETAIL_QUERIES:
+            raise QueryError(f"Unknown label: {label}")
+        limit, scan = settings.DETAIL_LIST_LIMIT, settings.DETAIL_SCAN_LIMIT
+        if self.snapshot.current is not None:
+            return self.snapshot.current.details(label, name, limit, scan)
+        return await self.backend.get_details(label, name, limit, scan)
+
+    async def _metrics_of(self, label: str, name: str, limit: Optional[int]) -> Optional[Dict[str, Any]]:
+        if label not in METRIC_LIST_QUERIES:
+            raise QueryError(f"Unknown label: {label}")
+        limit = _page_size(limit)
+        if self.snapshot.current is not None:
+            return self.snapshot.current.metrics_of(label, name, limit)
+        return await self.backend.get_metrics_of(label, name, limit)
+
+    @coalesced
+    @measured
+    async def get_domain_metrics(self, domain: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get the metrics on a domain's dashboards, or contained by it, by name."""
+        return await self._metrics_of("Domain", domain, limit)
 
+    @coalesced
+    @measured
+    async def get_dashboard_metrics(self, dashboard: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get the metrics a dashboard shows, by name."""
+        return await self._metrics_of("Dashboard", dashboard, limit)
+
+    @coalesced
+    @measured
     async def get_dashboard_paths(
         self,
         dashboard1: str,
@@ -113,32 +372,40 @@ class MetricsDatabase:
         max_hops: int = 5  # Default maximum number of hops
     ) -> List[Dict[str, Any]]:
         """Find paths between two dashboards."""
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH path = shortestPath((d1:Dashboard {name: $d1})-[*..$max_hops]-(d2:Dashboard {name: $d2}))
-                RETURN path
-                """,
-                d1=dashboard1,
-                d2=dashboard2,
-                max_hops=max_hops
-            )
-            paths = []
-            async for record in result:
-                path = record["path"]
-                path_data = {
-                    "nodes": [node["name"] for node in path.nodes],
-                    "relationships": [
-                        {
-                            "start": rel.start_node["name"],
-                            "end": rel.end_node["name"],
-                            "type": type(rel).__name__
-                        }
-                        for rel in path.relationships
-                    ]
-                }
-                paths.append(path_data)
-            return paths
+        snapshot = self.snapshot.current
+        if snapshot is not None:
+            start = snapshot.node_id("Dashboard", dashboard1)
+            end = snapshot.node_id("Dashboard", dashboard2)
+            if start is None or end is None or start == end:
+                return []
+            index = self.path_index
+            if index is not None and index.snapshot is snapshot:
+                path = index.path(start, end, max_hops)
+                # A landmark route can be longer than the true shortest path
+                if path is not None or index.exact:
+                    return [snapshot.path_data(path)] if path else []
+            return snapshot.shortest_paths([start], [end], max_hops, limit=1)
+        return await self.backend.get_dashboard_paths(dashboard1, dashboard2, max_hops)
+
+    @coalesced
+    @measured
+    async def get_domain_paths(
+        self,
+        domain1: str,
+        domain2: str,
+        max_hops: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find shortest paths between every dashboard pair of two domains in one pass.
+
+        Dashboards belong to a domain through ``PART_OF``. Identical paths
+        (including the same path walked in reverse) are returned once.
+        """
+        max_hops = max_hops or settings.PATH_MAX_HOPS
+        limit = limit or settings.PATH_RESULT_LIMIT
+        if self.snapshot.current is not None:
+            return self.snapshot.current.domain_paths(domain1, domain2, max_hops, limit)
+        return await self.backend.get_domain_paths(domain1, domain2, max_hops, limit)
 
     # Add other methods as needed, following same pattern...
 
@@ -0,0 +1,16 @@
+"""
+Exceptions raised by the database layer and its storage backends.
+"""
+
+
+class DatabaseError(Exception):
+    """Base exception for database operations."""
+    pass
+
+class ConnectionError(DatabaseError):
+    """Raised when there are issues connecting to the database."""
+    pass
+
+class QueryError(DatabaseError):
+    """Raised when there are issues executing queries."""
+    pass
@@ -0,0 +1,176 @@
+"""
+Synthetic catalog generator.
+
+Builds catalogs of any size whose shape follows the power laws real metric
+catalogs show: a few metrics appear on many dashboards while most appear on
+one or two, dashboard sizes are Pareto distributed, a few domains and
+authors hold most dashboards, and the management tree grows by preferential
+attachment. The same size and seed always produce the same catalog.
+
+Rows are produced lazily in the bulk loader's format (see ``loader``), so a
+catalog can be written to CSV/JSONL files or loaded straight into Neo4j
+without holding it in memory.
+"""
+
+import bisect
+import csv
+import hashlib
+import itertools
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from mcp_server.core.loader import EDGE_FILE, NODE_FILES
+
+QUALIFIERS = [
+    "Daily", "Weekly", "Monthly", "Quarterly", "Net", "Gross", "Average", "Median",
+    "Total", "Active", "New", "Returning", "Paid", "Organic", "Mobile", "Web"
+]
+SUBJECTS = [
+    "Revenue", "Orders", "Sessions", "Clicks", "Leads", "Signups", "Churn", "Retention",
+    "Conversion Rate", "Latency", "Cost", "Margin", "Refunds", "Tickets", "Users", "Page Views",
+    "Bookings", "Invoices", "Deployments", "Incidents", "Impressions", "Installs", "Trials", "Renewals"
+]
+AREAS = [
+    "Finance", "Marketing", "Sales", "Product", "Support", "Operations", "Growth", "Platform",
+    "Engineering", "Security", "People", "Legal", "Logistics", "Partnerships", "Data", "Research"
+]
+SOURCES = ["ERP", "CRM", "Web Logs", "Billing", "Data Warehouse", "Ticketing", "App Events"]
+FIRST_NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory", "Olivia"]
+LAST_NAMES = ["Smith", "Johnson", "White", "Brown", "Garcia", "Miller", "Davis", "Lopez", "Wilson", "Taylor"]
+
+FIELDS = {
+    "Author": ["name", "email"],
+    "Domain": ["name"],
+    "Metric": ["name", "definition", "source"],
+    "Dashboard": ["name"],
+}
+EDGE_FIELDS = ["type", "start", "end"]
+
+
+def _zipf_table(count: int, exponent: float) -> List[float]:
+    """Cumulative weights where rank ``i`` has weight ``1 / (i + 1) ** exponent``."""
+    return list(itertools.accumulate(1 / (i + 1) ** exponent for i in range(count)))
+
+
+def _draw(rng: random.Random, table: List[float]) -> int:
+    return bisect.bisect_left(table, rng.random() * table[-1])
+
+
+class CatalogGenerator:
+    """Generates Author/Domain/Metric/Dashboard nodes and the edges between them.
+
+    Other node counts default to fixed ratios of ``metrics``. Popularity
+    (how often a metric is shown, how many dashboards a domain or author
+    has) follows Zipf's law with the given exponents; the number of metrics
+    on a dashboard follows a Pareto law with shape ``dashboard_alpha``.
+    """
+
+    def __init__(
+        self,
+        metrics: int,
+        seed: int = 0,
+        dashboards: Optional[int] = None,
+        domains: Optional[int] = None,
+        authors: Optional[int] = None,
+        metric_exponent: float = 1.0,
+        owner_exponent: float = 1.1,
+        dashboard_alpha: float = 1.5,
+        max_dashboard_metrics: int = 200
+    ):
+        self.seed = seed
+        self.counts = {
+            "Metric": max(1, metrics),
+            "Dashboard": dashboards if dashboards is not None else max(2, metrics // 4),
+            "Domain": domains if domains is not None else max(2, metrics // 1000),
+            "Author": authors if authors is not None else max(2, metrics // 80),
+        }
+        self.metric_exponent = metric_exponent
+        self.owner_exponent = owner_exponent
+        self.dashboard_alpha = dashboard_alpha
+        self.max_dashboard_metrics = max_dashboard_metrics
+
+    def _mix(self, label: str, i: int) -> int:
+        """Stable per-node randomness, independent of generation order."""
+        digest = hashlib.blake2b(f"{self.seed}:{label}:{i}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def name(self, label: str, i: int) -> str:
+        h = self._mix(label, i)
+        if label == "Metric":
+            return f"{QUALIFIERS[h % len(QUALIFIERS)]} {SUBJECTS[(h >> 8) % len(SUBJECTS)]} {i}"
+        if label == "Dashboard":
+            return f"{AREAS[h % len(AREAS)]} {SUBJECTS[(h >> 8) % len(SUBJECTS)]} Overview {i}"
+        if label == "Domain":
+            return f"{AREAS[i % len(AREAS)]}" + (f" {i // len(AREAS) + 1}" if i >= len(AREAS) else "")
+        return f"{FIRST_NAMES[h % len(FIRST_NAMES)]} {LAST_NAMES[(h >> 8) % len(LAST_NAMES)]} {i}"
+
+    def nodes(self, label: str) -> Iterator[Dict[str, Any]]:
+        """Yield loader rows for every ``label`` node."""
+        for i in range(self.counts[label]):
+            name = self.name(label, i)
+            if label == "Metric":
+                h = self._mix("MetricSource", i)
+                yield {"name": name, "definition": f"{name.rsplit(' ', 1)[0]} as reported by source systems",
+                       "source": SOURCES[h % len(SOURCES)]}
+            elif label == "Author":
+                yield {"name": name, "email": f"{name.lower().replace(' ', '.')}@example.com"}
+            else:
+                yield {"name": name}
+
+    def edges(self) -> Iterator[Dict[str, Any]]:
+        """Yield loader rows for SHOWS, PART_OF, OWNS and MANAGES edges."""
+        rng = random.Random(self.seed)
+        metric_table = _zipf_table(self.counts["Metric"], self.metric_exponent)
+        domain_table = _zipf_table(self.counts["Domain"], self.owner_exponent)
+        author_table = _zipf_table(self.counts["Author"], self.owner_exponent)
+        shown_limit = min(self.max_dashboard_metrics, self.counts["Metric"])
+
+        for j in range(self.counts["Dashboard"]):
+            dashboard = self.name("Dashboard", j)
+            size = min(shown_limit, int(rng.paretovariate(self.dashboard_alpha)) + 1)
+            shown = set()
+            # Popular metrics repeat; a few extra draws keep small dashboards at their size
+            for _ in range(size * 2):
+                shown.add(_draw(rng, metric_table))
+                if len(shown) >= size:
+                    break
+            for i in sorted(shown):
+                yield {"type": "SHOWS", "start": dashboard, "end": self.name("Metric", i)}
+            yield {"type": "PART_OF", "start": dashboard, "end": self.name("Domain", _draw(rng, domain_table))}
+            yield {"type": "OWNS", "start": self.name("Author", _draw(rng, author_table)), "end": dashboard}
+
+        # Preferential attachment: a manager with more reports is likelier to get the next one
+        attachment = [0]
+        for i in range(1, self.counts["Author"]):
+            manager = rng.choice(attachment)
+            yield {"type": "MANAGES", "start": self.name("Author", manager), "end": self.name("Author", i)}
+            attachment += [manager, i]
+
+    def write(self, directory: Path, file_format: str = "csv") -> Dict[str, int]:
+        """Write the catalog as bulk loader files and return rows written per file."""
+        directory.mkdir(parents=True, exist_ok=True)
+        written = {}
+        for label, stem in NODE_FILES.items():
+            path = directory / f"{stem}.{file_format}"
+            written[path.name] = _write_rows(path, file_format, FIELDS[label], self.nodes(label))
+        path = directory / f"{EDGE_FILE}.{file_format}"
+        written[path.name] = _write_rows(path, file_format, EDGE_FIELDS, self.edges())
+        return written
+
+
+def _write_rows(path: Path, file_format: str, fields: List[str], rows: Iterator[Dict[str, Any]]) -> int:
+    count = 0
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            writer = csv.DictWriter(handle, fieldnames=fields)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                handle.write(json.dumps(row) + "\n")
+                count += 1
+    return count
@@ -0,0 +1,317 @@
+"""
+Bulk catalog loader.
+
+Streams authors, domains, metrics, dashboards and edges from CSV or JSONL
+files into Neo4j with ``UNWIND`` batches. Every batch is its own bounded write
+transaction, batches run concurrently, and all writes ``MERGE`` on the
+uniquely constrained ``name`` so a load can be re-run safely.
+
+A source directory may contain any of::
+
+    authors.csv|jsonl     domains.csv|jsonl     metrics.csv|jsonl
+    dashboards.csv|jsonl  edges.csv|jsonl
+
+Rows can also be streamed in directly (see ``load_catalog``), as the
+synthetic catalog generator does. ``read_catalog`` reads the same files, or
+a ``seed.cypher`` script, into rows for the in-process storage backend.
+
+Node rows need a ``name``; every other column becomes a property. Edge rows
+need ``type``, ``start`` and ``end`` (node names). ``start_label`` and
+``end_label`` are optional for the relationship types in
+``RELATIONSHIP_LABELS``; any other column becomes a relationship property.
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from mcp_server.core.errors import QueryError
+from mcp_server.core.snapshot import NODE_LABELS, EdgeRow, NodeRow
+
+if TYPE_CHECKING:
+    from mcp_server.core.database import MetricsDatabase
+
+logger = logging.getLogger(__name__)
+
+NODE_FILES = {
+    "Author": "authors",
+    "Domain": "domains",
+    "Metric": "metrics",
+    "Dashboard": "dashboards",
+}
+EDGE_FILE = "edges"
+FILE_SUFFIXES = (".csv", ".jsonl", ".ndjson")
+
+# Default (start label, end label) for each relationship type of the catalog
+RELATIONSHIP_LABELS = {
+    "MANAGES": ("Author", "Author"),
+    "OWNS": ("Author", "Dashboard"),
+    "SHOWS": ("Dashboard", "Metric"),
+    "PART_OF": ("Dashboard", "Domain"),
+    "CONTAINS": ("Domain", "Metric"),
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# The statement shapes neo4j/seed.cypher uses
+_SEED_NODE = re.compile(r"^CREATE\s*\((\w+):(\w+)\s*(\{.*\})?\s*\)$", re.DOTALL)
+_SEED_EDGE = re.compile(r"^CREATE\s*\((\w+)\)\s*-\[:(\w+)\s*(\{.*\})?\]->\s*\((\w+)\)$", re.DOTALL)
+_SEED_PROPERTY = re.compile(r"""(\w+)\s*:\s*("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^,]+)\s*(?:,|$)""")
+
+EdgeKey = Tuple[str, str, str]
+
+
+@dataclass
+class LoadStats:
+    """Row counts and throughput of one loaded file."""
+    source: str
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def iter_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream rows of a CSV or JSONL file, dropping empty CSV values."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        if path.suffix == ".csv":
+            for row in csv.DictReader(handle):
+                yield {key: value for key, value in row.items() if key and value not in (None, "")}
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group a row stream into lists of at most ``size`` rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def find_source(directory: Path, stem: str) -> Optional[Path]:
+    """Return ``directory/stem`` with the first supported suffix that exists."""
+    for suffix in FILE_SUFFIXES:
+        path = directory / f"{stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def edge_row(row: Dict[str, Any]) -> EdgeRow:
+    """Turn an edge file row into ``(start label, start, type, end label, end)``."""
+    start_label, end_label = RELATIONSHIP_LABELS.get(row["type"], (None, None))
+    return (row.get("start_label", start_label), row["start"], row["type"], row.get("end_label", end_label), row["end"])
+
+
+def catalog_files(path: Path) -> List[Path]:
+    """The files ``read_catalog`` reads for a seed script or a loader directory."""
+    if path.is_file():
+        return [path]
+    return [source for source in (find_source(path, stem) for stem in [*NODE_FILES.values(), EDGE_FILE]) if source]
+
+
+def read_catalog(path: Path) -> Tuple[List[NodeRow], List[EdgeRow]]:
+    """Read a ``.cypher`` seed script or a directory of loader files into node and edge rows."""
+    if path.is_file():
+        return read_seed(path)
+    nodes: List[NodeRow] = []
+    for label, stem in NODE_FILES.items():
+        source = find_source(path, stem)
+        if source:
+            nodes += [(label, row) for row in iter_rows(source)]
+    if not nodes:
+        raise FileNotFoundError(f"No catalog files found in {path}")
+    source = find_source(path, EDGE_FILE)
+    return nodes, [edge_row(row) for row in iter_rows(source)] if source else []
+
+
+def _seed_value(value: str) -> Any:
+    if value.startswith("'"):
+        return value[1:-1].replace("\\'", "'")
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        raise QueryError(f"Unsupported seed property value: {value}") from e
+
+
+def read_seed(path: Path) -> Tuple[List[NodeRow], List[EdgeRow]]:
+    """Read the ``CREATE`` statements of a seed script into node and edge rows.
+
+    Supports the two statement shapes ``neo4j/seed.cypher`` is written in,
+    ``CREATE (var:Label {...})`` and ``CREATE (a)-[:TYPE]->(b)``, where edges
+    refer to variables of nodes created earlier in the file.
+    """
+    lines = path.read_text(encoding="utf-8").splitlines()
+    text = "\n".join(line for line in lines if not line.strip().startswith("//"))
+    variables: Dict[str, Tuple[str, str]] = {}
+    nodes: List[NodeRow] = []
+    edges: List[EdgeRow] = []
+    for statement in filter(None, (part.strip() for part in text.split(";"))):
+        node = _SEED_NODE.match(statement)
+        edge = _SEED_EDGE.match(statement)
+        if node:
+            variable, label, properties = node.groups()
+            props = {key: _seed_value(value.strip()) for key, value in _SEED_PROPERTY.findall((properties or "{}")[1:-1])}
+            if "name" not in props:
+                raise QueryError(f"Seed node without a name: {statement}")
+            variables[variable] = (label, props["name"])
+            nodes.append((label, props))
+        elif edge and edge.group(1) in variables and edge.group(4) in variables:
+            start, rel_type, _, end = edge.groups()
+            edges.append((*variables[start], rel_type, *variables[end]))
+        else:
+            raise QueryError(f"Unsupported seed statement: {statement}")
+    return nodes, edges
+
+
+def node_query(label: str) -> str:
+    if label not in NODE_LABELS:
+        raise QueryError(f"Unknown label: {label}")
+    return (
+        f"UNWIND $rows as row "
+        f"MERGE (n:{label} {{name: row.name}}) "
+        f"SET n += row"
+    )
+
+
+def edge_query(start_label: str, rel_type: str, end_label: str) -> str:
+    if start_label not in NODE_LABELS or end_label not in NODE_LABELS:
+        raise QueryError(f"Unknown label in {start_label}-[:{rel_type}]->{end_label}")
+    if not _IDENTIFIER.match(rel_type):
+        raise QueryError(f"Invalid relationship type: {rel_type}")
+    return (
+        f"UNWIND $rows as row "
+        f"MATCH (a:{start_label} {{name: row.start}}) "
+        f"MATCH (b:{end_label} {{name: row.end}}) "
+        f"MERGE (a)-[r:{rel_type}]->(b) "
+        f"SET r += row.props"
+    )
+
+
+class BulkLoader:
+    """Loads catalog files into Neo4j in concurrent ``UNWIND`` batches."""
+
+    def __init__(
+        self,
+        db: "MetricsDatabase",
+        batch_size: int,
+        concurrency: int,
+        edge_concurrency: int
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        # Edge batches lock both endpoints; fewer writers means fewer deadlock retries
+        self.edge_concurrency = edge_concurrency
+
+    async def load_directory(self, directory: Path) -> List[LoadStats]:
+        """Load every catalog file found in ``directory``, nodes before edges."""
+        stats = []
+        for label, stem in NODE_FILES.items():
+            path = find_source(directory, stem)
+            if path:
+                stats.append(await self.load_nodes(label, path))
+        path = find_source(directory, EDGE_FILE)
+        if path:
+            stats.append(await self.load_edges(path))
+        if not stats:
+            raise FileNotFoundError(f"No catalog files found in {directory}")
+        await self.db.bump_catalog_version()
+        return stats
+
+    async def load_catalog(
+        self,
+        nodes: Dict[str, Iterable[Dict[str, Any]]],
+        edges: Iterable[Dict[str, Any]],
+        source: str
+    ) -> List[LoadStats]:
+        """Load row streams, e.g. from the catalog generator, nodes before edges."""
+        stats = [await self.load_node_rows(label, rows, f"{source} {label}") for label, rows in nodes.items()]
+        stats.append(await self.load_edge_rows(edges, f"{source} edges"))
+        await self.db.bump_catalog_version()
+        return stats
+
+    async def load_nodes(self, label: str, path: Path) -> LoadStats:
+        """MERGE every row of ``path`` as a ``label`` node."""
+        return await self.load_node_rows(label, iter_rows(path), str(path))
+
+    async def load_node_rows(self, label: str, rows: Iterable[Dict[str, Any]], source: str) -> LoadStats:
+        query = node_query(label)
+        batches = ((query, batch) for batch in chunks(rows, self.batch_size))
+        return await self._load(source, batches, self.concurrency)
+
+    async def load_edges(self, path: Path) -> LoadStats:
+        """MERGE every row of ``path`` as a relationship between existing nodes."""
+        return await self.load_edge_rows(iter_rows(path), str(path))
+
+    async def load_edge_rows(self, rows: Iterable[Dict[str, Any]], source: str) -> LoadStats:
+        return await self._load(source, self._edge_batches(rows), self.edge_concurrency)
+
+    def _edge_batches(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Group edge rows by (start label, type, end label) into full batches."""
+        buffers: Dict[EdgeKey, List[Dict[str, Any]]] = {}
+        for row in rows:
+            row = dict(row)
+            rel_type = row.pop("type")
+            default_start, default_end = RELATIONSHIP_LABELS.get(rel_type, (None, None))
+            key = (row.pop("start_label", default_start), rel_type, row.pop("end_label", default_end))
+            if key[0] is None or key[2] is None:
+                raise QueryError(f"Edge type {rel_type} needs start_label and end_label columns")
+            buffer = buffers.setdefault(key, [])
+            buffer.append({"start": row.pop("start"), "end": row.pop("end"), "props": row})
+            if len(buffer) >= self.batch_size:
+                yield edge_query(*key), buffers.pop(key)
+        for key, buffer in buffers.items():
+            yield edge_query(*key), buffer
+
+    async def _load(
+        self,
+        source: str,
+        batches: Iterator[Tuple[str, List[Dict[str, Any]]]],
+        concurrency: int
+    ) -> LoadStats:
+        """Run batches with at most ``concurrency`` in flight, reading input lazily."""
+        stats = LoadStats(source)
+        started = time.monotonic()
+        pending: Set[asyncio.Task] = set()
+
+        async def run(query: str, rows: List[Dict[str, Any]]):
+            await self.db.write(query, rows=rows)
+            stats.rows += len(rows)
+
+        try:
+            for query, rows in batches:
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                pending.add(asyncio.create_task(run(query, rows)))
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                for task in done:
+                    task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        stats.seconds = time.monotonic() - started
+        logger.info(
+            f"Loaded {stats.rows} rows from {source} in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/s)"
+        )
+        return stats
@@ -0,0 +1,56 @@
+"""
+Prometheus metrics for the MCP server.
+
+``MetricsDatabase`` methods decorated with ``measured`` report their latency
+by method name; Neo4j session and coalescing figures are read at scrape time.
+"""
+
+import functools
+import time
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Gauge, Histogram, generate_latest
+
+from mcp_server.core.config.settings import settings
+
+# Seconds; snapshot reads take microseconds, Cypher queries up to seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DATABASE_SECONDS = Histogram(
+    "mcp_database_seconds", "Latency of MetricsDatabase calls", ["method", "outcome"], buckets=LATENCY_BUCKETS
+)
+DATABASE_IN_FLIGHT = Gauge("mcp_database_calls_in_flight", "MetricsDatabase calls in flight")
+NEO4J_SESSIONS = Gauge("mcp_neo4j_sessions_open", "Neo4j sessions open, each holding a pooled connection")
+NEO4J_POOL_UTILIZATION = Gauge(
+    "mcp_neo4j_pool_utilization", "Open Neo4j sessions over the driver's maximum pool size"
+)
+SINGLE_FLIGHT_SHARED = Gauge("mcp_single_flight_shared", "Database reads answered by an identical in-flight read")
+
+
+def measured(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Observe an async method's latency under its name, with an ``ok``/``error`` outcome."""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        DATABASE_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await method(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            DATABASE_IN_FLIGHT.dec()
+            DATABASE_SECONDS.labels(method=method.__name__, outcome=outcome).observe(time.perf_counter() - started)
+    return wrapper
+
+
+def watch_database(db: Any):
+    """Report ``db``'s open sessions and coalesced reads when Prometheus scrapes."""
+    NEO4J_SESSIONS.set_function(lambda: db.open_sessions)
+    NEO4J_POOL_UTILIZATION.set_function(lambda: db.open_sessions / settings.NEO4J_MAX_CONNECTION_POOL_SIZE)
+    SINGLE_FLIGHT_SHARED.set_function(lambda: db.inflight.shared)
+
+
+def exposition() -> tuple:
+    """Current metrics in the Prometheus text format, with their content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
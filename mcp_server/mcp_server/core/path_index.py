@@ -0,0 +1,192 @@
+"""
+Precomputed hop distances between dashboards.
+
+For every target dashboard the index stores, for every node of the catalog
+graph, the hop distance to that dashboard and the next node on a shortest
+path towards it. Looking up a path is then a walk along next-hop pointers,
+O(path length), instead of a shortest-path search per request.
+
+When storing one row per dashboard would exceed the configured cell budget
+the index switches to a landmark approximation: rows are kept only for the
+best-connected dashboards, and a path between two dashboards is routed
+through the landmark that minimises the combined distance.
+"""
+
+import logging
+import time
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from mcp_server.core.snapshot import GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+UNREACHABLE = 255
+MAX_DISTANCE = UNREACHABLE - 1
+
+Edge = Tuple[int, str, int]
+
+
+class DashboardPathIndex:
+    """Array-backed distance and next-hop table over a ``GraphSnapshot``."""
+
+    def __init__(
+        self,
+        snapshot: GraphSnapshot,
+        targets: List[int],
+        distances: List[array],
+        next_hops: List[array],
+        exact: bool
+    ):
+        self.snapshot = snapshot
+        self.targets = targets
+        self.slots: Dict[int, int] = {target: slot for slot, target in enumerate(targets)}
+        self.distances = distances
+        self.next_hops = next_hops
+        self.exact = exact
+
+    @classmethod
+    def build(cls, snapshot: GraphSnapshot, max_cells: int) -> "DashboardPathIndex":
+        """Compute the index for every dashboard, or for landmarks if too large."""
+        started = time.monotonic()
+        dashboards = sorted(snapshot.index["Dashboard"].values())
+        node_count = max(len(snapshot.names), 1)
+        exact = len(dashboards) * node_count <= max_cells
+        if exact:
+            targets = dashboards
+        else:
+            budget = max(1, max_cells // node_count)
+            targets = sorted(dashboards, key=lambda node: -snapshot.degree(node))[:budget]
+
+        distances, next_hops = [], []
+        for target in targets:
+            distance, next_hop = _bfs(snapshot, target)
+            distances.append(distance)
+            next_hops.append(next_hop)
+
+        logger.info(
+            f"Built {'exact' if exact else 'landmark'} dashboard path index over {len(targets)} "
+            f"targets and {len(snapshot.names)} nodes in {time.monotonic() - started:.2f}s"
+        )
+        return cls(snapshot, targets, distances, next_hops, exact)
+
+    def updated(self, snapshot: GraphSnapshot, max_cells: int) -> "DashboardPathIndex":
+        """Return an index for ``snapshot``, reusing rows the change did not touch.
+
+        If the node set is unchanged only the rows whose shortest-path tree is
+        affected by an added or removed edge are recomputed. Any change to the
+        node set triggers a full rebuild. The current index is never mutated,
+        so concurrent lookups stay consistent.
+        """
+        if snapshot.labels != self.snapshot.labels or snapshot.names != self.snapshot.names:
+            return self.build(snapshot, max_cells)
+
+        old_edges = _edge_set(self.snapshot)
+        new_edges = _edge_set(snapshot)
+        added = new_edges - old_edges
+        removed = old_edges - new_edges
+        if not added and not removed:
+            return DashboardPathIndex(snapshot, self.targets, self.distances, self.next_hops, self.exact)
+
+        distances = list(self.distances)
+        next_hops = list(self.next_hops)
+        stale = [
+            slot for slot in range(len(self.targets))
+            if _affected(distances[slot], next_hops[slot], added, removed)
+        ]
+        for slot in stale:
+            distances[slot], next_hops[slot] = _bfs(snapshot, self.targets[slot])
+
+        logger.info(
+            f"Updated dashboard path index: {len(added)} edges added, {len(removed)} removed, "
+            f"{len(stale)}/{len(self.targets)} rows recomputed"
+        )
+        return DashboardPathIndex(snapshot, self.targets, distances, next_hops, self.exact)
+
+    def path(self, start: int, end: int, max_hops: int) -> Optional[List[int]]:
+        """Return node ids of a path from ``start`` to ``end`` of at most ``max_hops``."""
+        if start == end:
+            return [start]
+
+        slot = self.slots.get(end)
+        if slot is not None:
+            path = self._walk(start, slot)
+        elif start in self.slots:
+            path = self._walk(end, self.slots[start])
+            path = path[::-1] if path else None
+        else:
+            path = self._via_landmark(start, end)
+        if path is None or len(path) - 1 > max_hops:
+            return None
+        return path
+
+    def _walk(self, node: int, slot: int) -> Optional[List[int]]:
+        if self.distances[slot][node] == UNREACHABLE:
+            return None
+        next_hop = self.next_hops[slot]
+        path = [node]
+        while next_hop[path[-1]] != -1:
+            path.append(next_hop[path[-1]])
+        return path
+
+    def _via_landmark(self, start: int, end: int) -> Optional[List[int]]:
+        best = None
+        for slot in range(len(self.targets)):
+            to_start = self.distances[slot][start]
+            to_end = self.distances[slot][end]
+            if to_start == UNREACHABLE or to_end == UNREACHABLE:
+                continue
+            if best is None or to_start + to_end < best[0]:
+                best = (to_start + to_end, slot)
+        if best is None:
+            return None
+
+        slot = best[1]
+        path = self._walk(start, slot) + self._walk(end, slot)[::-1][1:]
+        # Both halves can share a prefix towards the landmark; cut the loop
+        positions: Dict[int, int] = {}
+        simplified: List[int] = []
+        for node in path:
+            if node in positions:
+                del simplified[positions[node] + 1:]
+                positions = {kept: index for index, kept in enumerate(simplified)}
+                continue
+            positions[node] = len(simplified)
+            simplified.append(node)
+        return simplified
+
+
+def _bfs(snapshot: GraphSnapshot, target: int) -> Tuple[array, array]:
+    """Undirected BFS from ``target`` filling distance and next-hop rows."""
+    node_count = len(snapshot.names)
+    distance = array("B", [UNREACHABLE]) * node_count
+    next_hop = array("i", [-1]) * node_count
+    distance[target] = 0
+    frontier = [target]
+    depth = 0
+    while frontier and depth < MAX_DISTANCE:
+        depth += 1
+        next_frontier = []
+        for node in frontier:
+            for other in snapshot.adjacent(node):
+                if distance[other] == UNREACHABLE:
+                    distance[other] = depth
+                    next_hop[other] = node
+                    next_frontier.append(other)
+        frontier = next_frontier
+    return distance, next_hop
+
+
+def _edge_set(snapshot: GraphSnapshot) -> Set[Edge]:
+    return set(snapshot.edges())
+
+
+def _affected(distance: array, next_hop: array, added: Set[Edge], removed: Set[Edge]) -> bool:
+    """Whether an edge change can alter the shortest-path tree of one row."""
+    for start, _, end in removed:
+        if next_hop[start] == end or next_hop[end] == start:
+            return True
+    for start, _, end in added:
+        if abs(distance[start] - distance[end]) > 1:
+            return True
+    return False
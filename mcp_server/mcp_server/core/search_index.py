@@ -0,0 +1,226 @@
+"""
+Fuzzy search over catalog names and descriptions.
+
+An inverted index from character trigrams to the nodes whose name or
+description contains them. A query matches the nodes that share enough of
+its trigrams, so "revnue" still finds "Revenue": a typo only changes the
+few trigrams that overlap it. Hits are scored by the share of the query's
+trigrams they contain, nudged towards names that contain little else, and
+the best ``limit`` are returned.
+
+The index follows catalog snapshots incrementally: only nodes that were
+added, removed, or whose description changed are re-indexed, in a copy
+that replaces the index once it is complete.
+"""
+
+import heapq
+import logging
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from mcp_server.core.snapshot import GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LABELS = ("Metric", "Dashboard", "Domain")
+
+# A hit's score blends query coverage with how much of the name the query covers
+COVERAGE_WEIGHT = 0.8
+# Description matches count half as much as name matches
+DESCRIPTION_WEIGHT = 0.5
+
+_EMPTY: Set[int] = set()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Lowercase trigrams of every word, padded so word starts weigh more."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _shared_counts(postings: Dict[str, Set[int]], grams: Iterable[str], needed: int) -> Dict[int, int]:
+    """Documents sharing at least ``needed`` of ``grams``, with the number they share.
+
+    A document missing from the postings of all but ``needed - 1`` grams
+    cannot reach ``needed``, so candidates only come from the postings of
+    the rarest ``len(grams) - needed + 1`` grams.
+    """
+    lists = sorted((postings.get(gram, _EMPTY) for gram in grams), key=len)
+    seeds = len(lists) - max(needed, 1) + 1
+    if seeds <= 0:
+        return {}
+    counts = {}
+    for doc in set().union(*lists[:seeds]):
+        shared = sum(1 for posting in lists if doc in posting)
+        if shared >= needed:
+            counts[doc] = shared
+    return counts
+
+
+class TrigramIndex:
+    """Trigram postings over the names and descriptions of one label's nodes."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        # Document id -> (name, description, trigrams in the name)
+        self.documents: Dict[int, Tuple[str, Optional[str], int]] = {}
+        self.name_postings: Dict[str, Set[int]] = {}
+        self.description_postings: Dict[str, Set[int]] = {}
+        self._next_id = 0
+        # Grams whose posting sets belong to this index rather than to the one it was copied from
+        self._owned_name_grams: Set[str] = set()
+        self._owned_description_grams: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def description(self, name: str) -> Optional[str]:
+        return self.documents[self.ids[name]][1]
+
+    def copy(self) -> "TrigramIndex":
+        """A copy that shares posting sets with this index until it writes to them."""
+        clone = TrigramIndex()
+        clone.ids = dict(self.ids)
+        clone.documents = dict(self.documents)
+        clone.name_postings = dict(self.name_postings)
+        clone.description_postings = dict(self.description_postings)
+        clone._next_id = self._next_id
+        return clone
+
+    @staticmethod
+    def _posting(postings: Dict[str, Set[int]], owned: Set[str], gram: str) -> Set[int]:
+        """The posting set of ``gram``, copied first if it may still be shared."""
+        if gram not in owned:
+            postings[gram] = set(postings.get(gram, ()))
+            owned.add(gram)
+        return postings.setdefault(gram, set())
+
+    def add(self, name: str, description: Optional[str] = None):
+        """Index a node, replacing an earlier entry with the same name."""
+        if name in self.ids:
+            self.remove(name)
+        doc = self._next_id
+        self._next_id += 1
+        grams = trigrams(name)
+        self.ids[name] = doc
+        self.documents[doc] = (name, description, len(grams))
+        for gram in grams:
+            self._posting(self.name_postings, self._owned_name_grams, gram).add(doc)
+        for gram in trigrams(description or ""):
+            self._posting(self.description_postings, self._owned_description_grams, gram).add(doc)
+
+    def remove(self, name: str):
+        doc = self.ids.pop(name, None)
+        if doc is None:
+            return
+        _, description, _ = self.documents.pop(doc)
+        for postings, owned, text in (
+            (self.name_postings, self._owned_name_grams, name),
+            (self.description_postings, self._owned_description_grams, description or "")
+        ):
+            for gram in trigrams(text):
+                posting = self._posting(postings, owned, gram)
+                posting.discard(doc)
+                if not posting:
+                    del postings[gram]
+
+    def search(self, text: str, limit: int, min_score: float) -> List[Tuple[float, str, Optional[str]]]:
+        """Return ``(score, name, description)`` of the best hits scoring at least ``min_score``.
+
+        A name score never exceeds the query coverage and a description score
+        never exceeds half of it, which bounds how many trigrams a hit must
+        share and so which postings have to be read.
+        """
+        query = trigrams(text)
+        if not query:
+            return []
+        size = len(query)
+        names = _shared_counts(self.name_postings, query, math.ceil(min_score * size))
+        descriptions = _shared_counts(
+            self.description_postings, query, math.ceil(min(1.0, min_score / DESCRIPTION_WEIGHT) * size)
+        )
+
+        hits = []
+        for doc in names.keys() | descriptions.keys():
+            name, description, name_size = self.documents[doc]
+            shared = names.get(doc, 0)
+            score = COVERAGE_WEIGHT * shared / size + (1 - COVERAGE_WEIGHT) * shared / (size + name_size - shared)
+            score = max(score, DESCRIPTION_WEIGHT * descriptions.get(doc, 0) / size)
+            if score >= min_score:
+                hits.append((score, name, description))
+        return heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0], hit[1]))
+
+
+class CatalogSearchIndex:
+    """Trigram indexes over the metrics, dashboards and domains of a snapshot.
+
+    An index is never modified once it answers searches: ``updated`` returns
+    a patched copy for a newer snapshot, or a fresh index if a large share
+    of nodes changed, which the caller swaps in. Searches therefore need no
+    lock and never wait for an update.
+    """
+
+    # Share of changed nodes above which a rebuild is cheaper than patching
+    REBUILD_FRACTION = 0.25
+
+    def __init__(self, min_score: float):
+        self.min_score = min_score
+        self.indexes = {label: TrigramIndex() for label in SEARCH_LABELS}
+        self.version: Any = None
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self.indexes.values())
+
+    @classmethod
+    def build(cls, snapshot: GraphSnapshot, min_score: float) -> "CatalogSearchIndex":
+        """Index every searchable node of ``snapshot``."""
+        started = time.monotonic()
+        search_index = cls(min_score)
+        for label, index in search_index.indexes.items():
+            for name, node_id in snapshot.index[label].items():
+                index.add(name, snapshot.description(node_id))
+        search_index.version = snapshot.version
+        logger.info(f"Built catalog search index over {len(search_index)} nodes in {time.monotonic() - started:.2f}s")
+        return search_index
+
+    def updated(self, snapshot: GraphSnapshot) -> "CatalogSearchIndex":
+        """An index for ``snapshot``: a patched copy of this one, or a rebuild if many nodes changed."""
+        started = time.monotonic()
+        changes = []
+        for label, index in self.indexes.items():
+            names = snapshot.index[label]
+            changes += [(label, name, None, True) for name in index.ids if name not in names]
+            for name, node_id in names.items():
+                description = snapshot.description(node_id)
+                if name not in index.ids or index.description(name) != description:
+                    changes.append((label, name, description, False))
+        if len(changes) > self.REBUILD_FRACTION * max(len(self), 1):
+            return self.build(snapshot, self.min_score)
+
+        patched = CatalogSearchIndex(self.min_score)
+        patched.indexes = {label: index.copy() for label, index in self.indexes.items()}
+        for label, name, description, removed in changes:
+            if removed:
+                patched.indexes[label].remove(name)
+            else:
+                patched.indexes[label].add(name, description)
+        patched.version = snapshot.version
+        logger.info(f"Updated catalog search index: {len(changes)} nodes re-indexed in {time.monotonic() - started:.2f}s")
+        return patched
+
+    def search(self, text: str, labels: Iterable[str] = SEARCH_LABELS, limit: int = 25) -> List[Dict[str, Any]]:
+        """Best hits across ``labels``, each with its label, name, description and score."""
+        hits = []
+        for label in labels:
+            hits += [
+                (score, label, name, description)
+                for score, name, description in self.indexes[label].search(text, limit, self.min_score)
+            ]
+        return [
+            {"label": label, "name": name, "description": description, "score": round(score, 3)}
+            for score, label, name, description in heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0], hit[2]))
+        ]
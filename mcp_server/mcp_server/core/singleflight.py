@@ -0,0 +1,65 @@
+"""
+Request coalescing.
+
+When the same read is requested again while an identical one is still in
+flight, the later callers await the first call's result instead of running
+the query a second time.
+
+``SingleFlight`` is also copied in the LLM service's
+``llm/agents/singleflight.py``; its tests fail if the two copies differ.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Shares one in-flight call among all callers of the same key.
+
+    The call runs in its own task, so a caller that is cancelled does not
+    cancel the work for the others. Every caller receives the same result
+    object and must not mutate it.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._inflight)}
+
+
+def coalesced(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Coalesce concurrent calls of an async method with equal arguments.
+
+    The instance must provide a ``SingleFlight`` as ``self.inflight``.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return await method(self, *args, **kwargs)
+        return await self.inflight.do(key, lambda: method(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,495 @@
+"""
+In-memory snapshot of the metrics catalog graph.
+
+The catalog (authors, domains, metrics, dashboards and the edges between them)
+changes a few times a day but is read on almost every MCP tool call. This
+module keeps an immutable copy of it in memory so read-only tools can be
+answered without a Neo4j round trip, and refreshes that copy in the background.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NODE_LABELS = ("Author", "Domain", "Metric", "Dashboard")
+
+# (label, properties) and (start label, start name, type, end label, end name)
+NodeRow = Tuple[str, Dict[str, Any]]
+EdgeRow = Tuple[str, str, str, str, str]
+
+
+def _csr(node_count: int, sources: array, targets: array, types: array) -> Tuple[array, array, array]:
+    """Group edges by source into compressed sparse rows.
+
+    The edges of node ``i`` sit at positions ``offsets[i]`` to
+    ``offsets[i + 1]`` of ``targets`` and ``types``, in input order.
+    """
+    offsets = array("i", [0]) * (node_count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    position = offsets[:-1]
+    row_targets = array("i", [0]) * len(sources)
+    row_types = array("H", [0]) * len(sources)
+    for source, target, code in zip(sources, targets, types):
+        slot = position[source]
+        position[source] += 1
+        row_targets[slot] = target
+        row_types[slot] = code
+    return offsets, row_targets, row_types
+
+
+def owner_projection(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten ranked ``owners`` (name, email and manager) into the top owner's fields."""
+    owners = details.get("owners") or []
+    top = owners[0] if owners else {}
+    details["owners"] = [owner["name"] for owner in owners]
+    details["owner"] = top.get("name")
+    details["owner_email"] = top.get("email")
+    details["manager"] = top.get("manager")
+    if "domains" in details:
+        details["domain"] = details["domains"][0] if details["domains"] else None
+    return details
+
+
+class GraphSnapshot:
+    """Immutable, indexed view of the catalog graph.
+
+    Nodes are addressed by integer ids; ``index`` maps label and name to an id.
+    Edges are kept twice, grouped by start and by end node, as compressed
+    sparse rows: flat ``array`` columns of neighbor ids and relationship type
+    codes (``rel_types``) plus per-node offsets, a few bytes per edge instead
+    of a tuple each. Ids are assigned in (label, name) order, so two
+    snapshots of the same node set share ids.
+    """
+
+    def __init__(self, nodes: Iterable[NodeRow], edges: Iterable[EdgeRow], version: Any = None):
+        self.version = version
+        self.loaded_at = time.time()
+        self.labels: List[str] = []
+        self.names: List[str] = []
+        self.properties: List[Dict[str, Any]] = []
+        self.index: Dict[str, Dict[str, int]] = {label: {} for label in NODE_LABELS}
+
+        for label, props in sorted(nodes, key=lambda row: (row[0], str(row[1].get("name")))):
+            name = props.get("name")
+            if name is None or label not in self.index or name in self.index[label]:
+                continue
+            self.index[label][name] = len(self.names)
+            self.labels.append(label)
+            self.names.append(name)
+            self.properties.append(dict(props))
+
+        self.rel_types: List[str] = []
+        codes: Dict[str, int] = {}
+        starts, ends, types = array("i"), array("i"), array("H")
+        for start_label, start_name, rel_type, end_label, end_name in edges:
+            start = self.node_id(start_label, start_name)
+            end = self.node_id(end_label, end_name)
+            if start is None or end is None:
+                continue
+            code = codes.get(rel_type)
+            if code is None:
+                code = codes[rel_type] = len(self.rel_types)
+                self.rel_types.append(rel_type)
+            starts.append(start)
+            ends.append(end)
+            types.append(code)
+        self.edge_count = len(starts)
+        self.out_offsets, self.out_targets, self.out_types = _csr(len(self.names), starts, ends, types)
+        self.in_offsets, self.in_targets, self.in_types = _csr(len(self.names), ends, starts, types)
+
+        self.sorted_names: Dict[str, List[str]] = {
+            label: sorted(names) for label, names in self.index.items()
+        }
+
+    def node_id(self, label: str, name: str) -> Optional[int]:
+        """Return the id of a node, or None if it is not in the snapshot."""
+        return self.index.get(label, {}).get(name)
+
+    def node(self, label: str, name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a node's properties."""
+        node_id = self.node_id(label, name)
+        return dict(self.properties[node_id]) if node_id is not None else None
+
+    def nodes(self, label: str) -> List[Dict[str, Any]]:
+        """Return name and description of every node with ``label``, by name."""
+        return [self.summary(self.index[label][name]) for name in self.sorted_names.get(label, [])]
+
+    def page(self, label: str, after: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return summaries of ``label`` nodes in name order, starting after the name ``after``."""
+        names = self.sorted_names[label]
+        start = bisect.bisect_right(names, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        return [self.summary(self.index[label][name]) for name in islice(names, start, stop)]
+
+    def edges_of(self, node_id: int, direction: str = "out") -> Iterator[Tuple[str, int]]:
+        """Yield ``(relationship type, node id)`` for the edges leaving or entering a node."""
+        if direction in ("out", "both"):
+            start, stop = self.out_offsets[node_id], self.out_offsets[node_id + 1]
+            for code, other in zip(self.out_types[start:stop], self.out_targets[start:stop]):
+                yield self.rel_types[code], other
+        if direction in ("in", "both"):
+            start, stop = self.in_offsets[node_id], self.in_offsets[node_id + 1]
+            for code, other in zip(self.in_types[start:stop], self.in_targets[start:stop]):
+                yield self.rel_types[code], other
+
+    def edges(self) -> Iterator[Tuple[int, str, int]]:
+        """Yield every edge as ``(start id, relationship type, end id)``."""
+        for start in range(len(self.names)):
+            for rel_type, end in self.edges_of(start):
+                yield start, rel_type, end
+
+    def adjacent(self, node_id: int) -> array:
+        """Ids of the nodes joined to ``node_id`` by an edge in either direction."""
+        return (
+            self.out_targets[self.out_offsets[node_id]:self.out_offsets[node_id + 1]]
+            + self.in_targets[self.in_offsets[node_id]:self.in_offsets[node_id + 1]]
+        )
+
+    def degree(self, node_id: int) -> int:
+        return (
+            self.out_offsets[node_id + 1] - self.out_offsets[node_id]
+            + self.in_offsets[node_id + 1] - self.in_offsets[node_id]
+        )
+
+    def neighbors(
+        self,
+        node_id: int,
+        rel_type: Optional[str] = None,
+        label: Optional[str] = None,
+        direction: str = "out"
+    ) -> List[int]:
+        """Return neighbor ids, optionally filtered by relationship type and label."""
+        return [
+            other for edge_type, other in self.edges_of(node_id, direction)
+            if (rel_type is None or edge_type == rel_type)
+            and (label is None or self.labels[other] == label)
+        ]
+
+    def _sorted_names(self, node_ids: Iterable[int], limit: int) -> List[str]:
+        return sorted({self.names[node_id] for node_id in node_ids})[:limit]
+
+    def _ranked_names(self, counts: Counter, limit: int) -> List[str]:
+        """Names of the most counted nodes, ties broken by name."""
+        ranked = sorted(counts, key=lambda node_id: (-counts[node_id], self.names[node_id]))
+        return [self.names[node_id] for node_id in ranked[:limit]]
+
+    def _owners(self, dashboards: Iterable[int], limit: int) -> List[Dict[str, Any]]:
+        """Authors owning ``dashboards``, most dashboards first, with their email and manager."""
+        owned = Counter(
+            author for dashboard in dashboards for author in self.neighbors(dashboard, "OWNS", "Author", "in")
+        )
+        owners = []
+        for name in self._ranked_names(owned, limit):
+            author = self.index["Author"][name]
+            managers = self._sorted_names(self.neighbors(author, "MANAGES", "Author", "in"), 1)
+            owners.append({
+                "name": name,
+                "email": self.properties[author].get("email"),
+                "manager": managers[0] if managers else None
+            })
+        return owners
+
+    def details(self, label: str, name: str, limit: int, scan: int) -> Optional[Dict[str, Any]]:
+        """A node with its owners, domains, dashboards and metrics, each list capped at ``limit``.
+
+        Related metrics are those shown on the same dashboards, most shared
+        first, counted over at most ``scan`` of the metric's dashboards.
+        """
+        node_id = self.node_id(label, name)
+        if node_id is None:
+            return None
+        properties = self.properties[node_id]
+        if label == "Metric":
+            dashboards = self.neighbors(node_id, "SHOWS", "Dashboard", "in")
+            domains = {domain for dashboard in dashboards for domain in self.neighbors(dashboard, "PART_OF", "Domain")}
+            domains.update(self.neighbors(node_id, "CONTAINS", "Domain", "in"))
+            shared = Counter(
+                other
+                for dashboard in sorted(set(dashboards), key=self.names.__getitem__)[:scan]
+                for other in self.neighbors(dashboard, "SHOWS", "Metric")
+                if other != node_id
+            )
+            details = {
+                **properties,
+                "description": self.description(node_id),
+                "data_source": properties.get("source"),
+                "dashboards": self._sorted_names(dashboards, limit),
+                "dashboard_count": len(dashboards),
+                "domains": self._sorted_names(domains, limit),
+                "owners": self._owners(dashboards, limit),
+                "related_metrics": self._ranked_names(shared, limit),
+            }
+        elif label == "Dashboard":
+            metrics = self.neighbors(node_id, "SHOWS", "Metric")
+            details = {
+                **properties,
+                "domains": self._sorted_names(self.neighbors(node_id, "PART_OF", "Domain"), limit),
+                "owners": self._owners([node_id], limit),
+                "metrics": self._sorted_names(metrics, limit),
+                "metric_count": len(metrics),
+            }
+        else:
+            dashboards = self.neighbors(node_id, "PART_OF", "Dashboard", "in")
+            details = {
+                **properties,
+                "dashboards": self._sorted_names(dashboards, limit),
+                "dashboard_count": len(dashboards),
+                "owners": self._owners(dashboards, limit),
+            }
+        return owner_projection(details)
+
+    def metrics_of(self, label: str, name: str, limit: int) -> Optional[Dict[str, Any]]:
+        """Summaries of the metrics on a dashboard, or on any dashboard of a domain, by name."""
+        node_id = self.node_id(label, name)
+        if node_id is None:
+            return None
+        if label == "Dashboard":
+            metrics = set(self.neighbors(node_id, "SHOWS", "Metric"))
+        else:
+            metrics = {
+                metric
+                for dashboard in self.neighbors(node_id, "PART_OF", "Dashboard", "in")
+                for metric in self.neighbors(dashboard, "SHOWS", "Metric")
+            }
+            metrics.update(self.neighbors(node_id, "CONTAINS", "Metric"))
+        ordered = sorted(metrics, key=self.names.__getitem__)
+        return {
+            label.lower(): name,
+            "items": [self.summary(metric) for metric in ordered[:limit]],
+            "total": len(metrics)
+        }
+
+    def domain_dashboards(self, domain: str) -> List[int]:
+        """Ids of the dashboards ``PART_OF`` a domain."""
+        domain_id = self.node_id("Domain", domain)
+        if domain_id is None:
+            return []
+        return self.neighbors(domain_id, "PART_OF", "Dashboard", direction="in")
+
+    def domain_paths(self, domain1: str, domain2: str, max_hops: int, limit: int) -> List[Dict[str, Any]]:
+        """Shortest paths between the dashboards of two domains."""
+        return self.shortest_paths(self.domain_dashboards(domain1), self.domain_dashboards(domain2), max_hops, limit)
+
+    def search(self, label: str, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Case-insensitive ranked search over names and descriptions.
+
+        Every term has to match; ``limit=None`` returns every hit. Exact name matches rank above prefix matches,
+        which rank above infix and description-only matches.
+        """
+        terms = text.lower().split()
+        if not terms:
+            return self.nodes(label)[:limit]
+
+        hits = []
+        for name, node_id in self.index.get(label, {}).items():
+            lowered = name.lower()
+            description = str(self.description(node_id) or "").lower()
+            score = 0.0
+            for term in terms:
+                if lowered == term:
+                    score += 3.0
+                elif lowered.startswith(term):
+                    score += 2.0
+                elif term in lowered:
+                    score += 1.0
+                elif term in description:
+                    score += 0.5
+                else:
+                    break
+            else:
+                if lowered == " ".join(terms):
+                    score += 3.0
+                hits.append((-score, name, node_id))
+
+        hits.sort()
+        return [
+            {**self.summary(node_id), "score": -neg_score}
+            for neg_score, _, node_id in hits[:limit]
+        ]
+
+    def shortest_paths(
+        self,
+        sources: Iterable[int],
+        targets: Iterable[int],
+        max_hops: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Find a shortest path from every source to every reachable target.
+
+        Runs one breadth-first search per source over undirected edges, so all
+        source/target pairs are covered in a single pass over the sources
+        instead of one search per pair. Paths that visit the same nodes,
+        in either direction, are returned once; at most ``limit`` are returned.
+        """
+        targets = list(dict.fromkeys(targets))
+        target_set = set(targets)
+        seen = set()
+        paths = []
+        for source in dict.fromkeys(sources):
+            parents = self._bfs(source, target_set, max_hops)
+            for target in targets:
+                if target == source or target not in parents:
+                    continue
+                path = self._path_to(parents, target)
+                key = tuple(path)
+                key = min(key, key[::-1])
+                if key in seen:
+                    continue
+                seen.add(key)
+                paths.append(self.path_data(path))
+                if len(paths) >= limit:
+                    return paths
+        return paths
+
+    def _bfs(self, source: int, targets: set, max_hops: int) -> Dict[int, Optional[int]]:
+        """Breadth-first search recording the previous node of every visited node."""
+        parents: Dict[int, Optional[int]] = {source: None}
+        remaining = len(targets - {source})
+        frontier = [source]
+        for _ in range(max_hops):
+            if not frontier or not remaining:
+                break
+            next_frontier = []
+            for node in frontier:
+                for other in self.adjacent(node):
+                    if other in parents:
+                        continue
+                    parents[other] = node
+                    next_frontier.append(other)
+                    if other in targets:
+                        remaining -= 1
+            frontier = next_frontier
+        return parents
+
+    def _path_to(self, parents: Dict[int, Optional[int]], target: int) -> List[int]:
+        path = [target]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def edge_between(self, start: int, end: int) -> Optional[Tuple[str, bool]]:
+        """Return ``(type, forward)`` of an edge joining two nodes in either direction."""
+        for rel_type, other in self.edges_of(start, "out"):
+            if other == end:
+                return rel_type, True
+        for rel_type, other in self.edges_of(start, "in"):
+            if other == end:
+                return rel_type, False
+        return None
+
+    def path_data(self, path: List[int]) -> Dict[str, Any]:
+        """Render a path in the same shape ``MetricsDatabase.get_dashboard_paths`` returns."""
+        relationships = []
+        for previous, node in zip(path, path[1:]):
+            rel_type, forward = self.edge_between(previous, node)
+            start, end = (previous, node) if forward else (node, previous)
+            relationships.append({
+                "start": self.names[start],
+                "end": self.names[end],
+                "type": rel_type
+            })
+        return {
+            "nodes": [self.names[node] for node in path],
+            "relationships": relationships
+        }
+
+    def description(self, node_id: int) -> Optional[str]:
+        """Return a node's description; metrics carry theirs as ``definition``."""
+        properties = self.properties[node_id]
+        return properties.get("description", properties.get("definition"))
+
+    def summary(self, node_id: int) -> Dict[str, Any]:
+        """Return the name and description of a node."""
+        return {
+            "name": self.names[node_id],
+            "description": self.description(node_id)
+        }
+
+
+class SnapshotCache:
+    """Holds the current ``GraphSnapshot`` and refreshes it in the background.
+
+    Readers use ``current`` and never wait on a refresh: a new snapshot is
+    built off to the side and swapped in with a single assignment. A refresh
+    happens when the catalog version reported by ``version_probe`` changes or
+    when ``refresh_interval`` seconds have passed since the last load.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[GraphSnapshot]],
+        version_probe: Callable[[], Awaitable[Any]],
+        refresh_interval: float,
+        poll_interval: float
+    ):
+        self.loader = loader
+        self.version_probe = version_probe
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        self.current: Optional[GraphSnapshot] = None
+        self.listeners: List[Callable[[GraphSnapshot], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def add_listener(self, listener: Callable[[GraphSnapshot], None]):
+        """Call ``listener`` with every new snapshot after it is swapped in.
+
+        Listeners run on the event loop and should hand heavy work off to a
+        background task.
+        """
+        self.listeners.append(listener)
+
+    async def start(self):
+        """Load the first snapshot and start the refresh loop."""
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop the refresh loop. The last snapshot stays readable."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def refresh(self) -> GraphSnapshot:
+        """Load a new snapshot and swap it in."""
+        async with self._lock:
+            started = time.monotonic()
+            snapshot = await self.loader()
+            self.current = snapshot
+            logger.info(
+                f"Loaded catalog snapshot version {snapshot.version}: {len(snapshot.names)} nodes, "
+                f"{snapshot.edge_count} edges in {time.monotonic() - started:.2f}s"
+            )
+            for listener in self.listeners:
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.warning(f"Snapshot listener {listener!r} failed: {e}")
+            return snapshot
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                current = self.current
+                stale = current is None or time.time() - current.loaded_at >= self.refresh_interval
+                if not stale:
+                    stale = await self.version_probe() != current.version
+                if stale:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Catalog snapshot refresh failed, keeping previous snapshot: {e}")
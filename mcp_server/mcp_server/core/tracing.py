@@ -0,0 +1,188 @@
+"""
+Request tracing.
+
+Tool calls arrive with the caller's W3C ``traceparent`` in the MCP request
+metadata; the tool span continues that trace and database spans nest under
+it. Finished spans can be appended to a file as OTLP/JSON lines, and the
+time spent per category (``tool``, ``database``) is kept for recent traces
+so the LLM service can read it back through the ``trace://`` resource.
+"""
+
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from mcp_server.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds: 1 internal, 2 server, 3 client
+SPAN_KINDS = {"tool": 2, "database": 3}
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        category: Optional[str],
+        attributes: Dict[str, Any]
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.category = category
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.category, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in {**self.attributes, "category": self.category}.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """Return ``(trace id, parent span id)`` from a W3C traceparent header."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    return (match.group(1), match.group(2)) if match else None
+
+
+class JsonFileExporter:
+    """Appends finished spans to a file as OTLP/JSON lines."""
+
+    def __init__(self, path: str, service: str):
+        self.path = path
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{"scope": {"name": "insights"}, "spans": [span.to_otlp()]}]
+            }]
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans and sums their durations per trace and category."""
+
+    def __init__(self, export_path: Optional[str], service_name: str, log_size: int):
+        self.exporter = JsonFileExporter(export_path, service_name) if export_path else None
+        self.log_size = log_size
+        # trace id -> {category: milliseconds}, oldest trace first
+        self.traces: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: Optional[str] = None,
+        traceparent: Optional[str] = None,
+        **attributes
+    ) -> Iterator[Span]:
+        """Run a block inside a new span under ``traceparent`` or the current span."""
+        remote = parse_traceparent(traceparent)
+        parent = _current_span.get()
+        if remote:
+            trace_id, parent_id = remote
+        elif parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+        span = Span(name, trace_id, parent_id, category, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        span.end_ns = time.time_ns()
+        if span.category:
+            timings = self.traces.pop(span.trace_id, {})
+            timings[span.category] = timings.get(span.category, 0.0) + span.duration_ms
+            self.traces[span.trace_id] = timings
+            while len(self.traces) > self.log_size:
+                self.traces.popitem(last=False)
+        if self.exporter:
+            try:
+                self.exporter.export(span)
+            except OSError as e:
+                logger.warning(f"Could not export span {span.name}: {e}")
+
+    def timings(self, trace_id: str) -> Dict[str, float]:
+        """Milliseconds spent per category in a recent trace."""
+        timings = self.traces.get(trace_id, {})
+        return {f"{category}_ms": round(ms, 3) for category, ms in timings.items()}
+
+
+def _request_traceparent(ctx: Any) -> Optional[str]:
+    """The ``traceparent`` the client sent in the request metadata, if any."""
+    try:
+        meta = ctx.request_context.meta
+    except (AttributeError, LookupError, ValueError):
+        return None
+    if meta is None:
+        return None
+    if isinstance(meta, dict):
+        return meta.get("traceparent")
+    return getattr(meta, "traceparent", None) or (getattr(meta, "model_extra", None) or {}).get("traceparent")
+
+
+def traced(tool: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Run an MCP tool inside a ``tool`` span continuing the caller's trace.
+
+    The tool must accept a ``ctx`` argument; its signature is kept so
+    FastMCP still sees the tool's parameters.
+    """
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        with tracer.span(f"tool {tool.__name__}", "tool", _request_traceparent(kwargs.get("ctx"))):
+            return await tool(*args, **kwargs)
+    return wrapper
+
+
+tracer = Tracer(settings.TRACE_EXPORT_PATH, settings.TRACE_SERVICE_NAME, settings.TRACE_LOG_SIZE)
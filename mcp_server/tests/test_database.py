@@ -0,0 +1,49 @@
+import asyncio
+
+from mcp_server.core.backends import MemoryBackend
+from mcp_server.core.database import MetricsDatabase
+
+NODES = [
+    ("Dashboard", {"name": "Executive Overview"}),
+    ("Dashboard", {"name": "Marketing Funnel"}),
+    ("Metric", {"name": "Revenue", "definition": "Total income"}),
+    ("Domain", {"name": "Finance"}),
+]
+EDGES = [
+    ("Dashboard", "Executive Overview", "SHOWS", "Metric", "Revenue"),
+    ("Dashboard", "Marketing Funnel", "SHOWS", "Metric", "Revenue"),
+    ("Dashboard", "Executive Overview", "PART_OF", "Domain", "Finance"),
+]
+
+
+async def connected():
+    db = MetricsDatabase(MemoryBackend(rows=(NODES, EDGES)))
+    await db.connect(ensure_schema=False)
+    return db
+
+
+def test_index_updates_are_held_until_they_finish():
+    async def run():
+        db = await connected()
+        await db.snapshot.refresh()
+        tasks = set(db._background)
+        assert tasks
+        await asyncio.gather(*tasks)
+        assert db._background == set()
+        assert db.path_index is not None
+        assert [hit["name"] for hit in db.search_index.search("total income")] == ["Revenue"]
+        await db.disconnect()
+
+    asyncio.run(run())
+
+
+def test_disconnect_cancels_pending_index_updates():
+    async def run():
+        db = await connected()
+        await db.snapshot.refresh()
+        tasks = set(db._background)
+        await db.disconnect()
+        assert db._background == set()
+        assert all(task.done() for task in tasks)
+
+    asyncio.run(run())
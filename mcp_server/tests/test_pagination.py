@@ -0,0 +1,100 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from mcp_server.core.backends import MemoryBackend
+from mcp_server.core.database import MetricsDatabase, decode_cursor, encode_cursor
+from mcp_server.core.errors import QueryError
+
+METRICS = [f"Revenue {i:02d}" for i in range(7)] + ["Churn", "Clicks"]
+
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+async def open_database(snapshot):
+    db = MetricsDatabase(MemoryBackend(rows=([("Metric", {"name": name}) for name in METRICS], [])))
+    await db.connect()
+    if snapshot:
+        await db.snapshot.refresh()
+    return db
+
+
+async def collect(fetch):
+    """Follow ``next_cursor`` from the first page to the last."""
+    names, cursor, pages = [], None, 0
+    while True:
+        page = await fetch(cursor)
+        names += [item["name"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names, page["total"], pages
+
+
+@pytest.mark.parametrize("position", [{}, {"after": "Revenue 03"}, {"offset": 0}, {"offset": 40}])
+def test_cursor_round_trip(position):
+    assert decode_cursor(encode_cursor(position)) == position
+
+
+def test_missing_cursor_is_the_first_page():
+    assert decode_cursor(None) == {}
+    assert decode_cursor("") == {}
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    raw_cursor([1, 2]),
+    raw_cursor("offset"),
+    raw_cursor({"offset": -1}),
+    raw_cursor({"offset": 1.5}),
+    raw_cursor({"offset": "10"}),
+    raw_cursor({"offset": True}),
+    raw_cursor({"after": 3}),
+    raw_cursor({"after": ["Churn"]}),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(QueryError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_list_pages_cover_every_node_once(snapshot):
+    async def run():
+        db = await open_database(snapshot)
+        return await collect(lambda cursor: db.list_page("Metric", 4, cursor))
+
+    names, total, pages = asyncio.run(run())
+    assert names == sorted(METRICS)
+    assert total == len(METRICS)
+    assert pages == 3
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_search_pages_cover_every_hit_once(snapshot):
+    async def run():
+        db = await open_database(snapshot)
+        return await collect(lambda cursor: db.search_page("Metric", "revenue", 3, cursor))
+
+    names, total, pages = asyncio.run(run())
+    assert sorted(names) == [name for name in METRICS if name.startswith("Revenue")]
+    assert total == 7
+    assert pages == 3
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+@pytest.mark.parametrize("call", [
+    lambda db, cursor: db.list_page("Metric", 4, cursor),
+    lambda db, cursor: db.search_page("Metric", "revenue", 4, cursor),
+])
+def test_pages_reject_malformed_cursors(snapshot, call):
+    async def run():
+        db = await open_database(snapshot)
+        await call(db, raw_cursor({"offset": -5, "after": 1}))
+
+    with pytest.raises(QueryError):
+        asyncio.run(run())
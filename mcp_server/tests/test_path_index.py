@@ -0,0 +1,198 @@
+from collections import deque
+from itertools import product
+
+import pytest
+
+from mcp_server.core.path_index import UNREACHABLE, DashboardPathIndex, _affected, _bfs
+from mcp_server.core.snapshot import GraphSnapshot
+
+# Two dashboard clusters joined through metric m3, plus an isolated dashboard
+EDGES = [
+    ("Dashboard", "d0", "SHOWS", "Metric", "m0"),
+    ("Dashboard", "d1", "SHOWS", "Metric", "m0"),
+    ("Dashboard", "d1", "SHOWS", "Metric", "m1"),
+    ("Dashboard", "d2", "SHOWS", "Metric", "m1"),
+    ("Dashboard", "d2", "SHOWS", "Metric", "m3"),
+    ("Dashboard", "d3", "SHOWS", "Metric", "m3"),
+    ("Dashboard", "d3", "SHOWS", "Metric", "m2"),
+    ("Dashboard", "d4", "SHOWS", "Metric", "m2"),
+    ("Dashboard", "d4", "PART_OF", "Domain", "sales"),
+    ("Author", "ann", "OWNS", "Dashboard", "d0"),
+]
+NODES = (
+    [("Dashboard", {"name": f"d{i}"}) for i in range(6)]
+    + [("Metric", {"name": f"m{i}"}) for i in range(4)]
+    + [("Domain", {"name": "sales"}), ("Author", {"name": "ann"})]
+)
+
+
+def snapshot(edges=EDGES, version=1):
+    return GraphSnapshot(NODES, edges, version)
+
+
+def reference_distances(graph, source):
+    """Hop distances from ``source`` by a plain undirected BFS over the edge list."""
+    neighbors = {node: set() for node in range(len(graph.names))}
+    for start, _, end in graph.edges():
+        neighbors[start].add(end)
+        neighbors[end].add(start)
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for other in neighbors[node]:
+            if other not in distances:
+                distances[other] = distances[node] + 1
+                queue.append(other)
+    return distances
+
+
+def assert_valid_path(graph, path, start, end):
+    assert path[0] == start and path[-1] == end
+    assert len(set(path)) == len(path)
+    for node, following in zip(path, path[1:]):
+        assert following in graph.adjacent(node)
+
+
+def dashboards(graph):
+    return sorted(graph.index["Dashboard"].values())
+
+
+def test_bfs_rows_match_reference():
+    graph = snapshot()
+    for target in dashboards(graph):
+        distance, next_hop = _bfs(graph, target)
+        expected = reference_distances(graph, target)
+        for node in range(len(graph.names)):
+            assert distance[node] == expected.get(node, UNREACHABLE)
+            if node == target or node not in expected:
+                assert next_hop[node] == -1
+            else:
+                # The next hop is a neighbor one step closer to the target
+                assert next_hop[node] in graph.adjacent(node)
+                assert distance[next_hop[node]] == distance[node] - 1
+
+
+def test_exact_index_finds_shortest_paths():
+    graph = snapshot()
+    index = DashboardPathIndex.build(graph, max_cells=10_000)
+    assert index.exact
+    for start, end in product(dashboards(graph), repeat=2):
+        expected = reference_distances(graph, start).get(end)
+        path = index.path(start, end, max_hops=20)
+        if expected is None:
+            assert path is None
+        else:
+            assert_valid_path(graph, path, start, end)
+            assert len(path) - 1 == expected
+
+
+def test_max_hops_rejects_longer_paths():
+    graph = snapshot()
+    index = DashboardPathIndex.build(graph, max_cells=10_000)
+    d0, d4 = graph.node_id("Dashboard", "d0"), graph.node_id("Dashboard", "d4")
+    assert len(index.path(d0, d4, max_hops=8)) == 9
+    assert index.path(d0, d4, max_hops=7) is None
+
+
+def test_landmark_index_finds_valid_paths():
+    graph = snapshot()
+    # Room for two rows only: the best-connected dashboards become landmarks
+    index = DashboardPathIndex.build(graph, max_cells=2 * len(graph.names))
+    assert not index.exact
+    assert len(index.targets) == 2
+    for start, end in product(dashboards(graph), repeat=2):
+        expected = reference_distances(graph, start).get(end)
+        path = index.path(start, end, max_hops=20)
+        if expected is None:
+            assert path is None
+        else:
+            assert_valid_path(graph, path, start, end)
+            # Routing through a landmark may take a detour but never a shortcut
+            assert len(path) - 1 >= expected
+
+
+def test_landmark_path_cuts_the_loop_through_the_landmark():
+    graph = snapshot()
+    index = DashboardPathIndex.build(graph, max_cells=len(graph.names))
+    d0, d2, d4 = (graph.node_id("Dashboard", name) for name in ("d0", "d2", "d4"))
+    # d2 and d4 both reach the landmark d0 through d2, so the detour is dropped
+    assert index.targets == [d0]
+    path = index.path(d2, d4, max_hops=20)
+    assert_valid_path(graph, path, d2, d4)
+    assert len(path) - 1 == reference_distances(graph, d2)[d4]
+
+
+def test_affected_detects_tree_changes_only():
+    graph = snapshot()
+    d0 = graph.node_id("Dashboard", "d0")
+    distance, next_hop = _bfs(graph, d0)
+    m0, m1 = graph.node_id("Metric", "m0"), graph.node_id("Metric", "m1")
+    d1, d2 = graph.node_id("Dashboard", "d1"), graph.node_id("Dashboard", "d2")
+    d5 = graph.node_id("Dashboard", "d5")
+    ann = graph.node_id("Author", "ann")
+
+    # Removing a tree edge or adding a shortcut changes the row
+    assert _affected(distance, next_hop, set(), {(d1, "SHOWS", m0)})
+    assert _affected(distance, next_hop, {(d0, "SHOWS", m1)}, set())
+    # Joining an unreachable node changes it too
+    assert _affected(distance, next_hop, {(d5, "SHOWS", m0)}, set())
+    # An edge between nodes at equal or adjacent depths does not
+    assert not _affected(distance, next_hop, {(ann, "OWNS", d1)}, set())
+    assert distance[d2] == distance[m1] + 1
+    assert not _affected(distance, next_hop, {(d2, "SHOWS", m1)}, set())
+
+
+@pytest.mark.parametrize("max_cells", [10_000, 2 * len(NODES)])
+@pytest.mark.parametrize("change", [
+    lambda edges: edges + [("Dashboard", "d0", "SHOWS", "Metric", "m2")],
+    lambda edges: edges + [("Dashboard", "d5", "SHOWS", "Metric", "m1")],
+    lambda edges: [edge for edge in edges if edge[4] != "m3"],
+    lambda edges: [edge for edge in edges if edge[1] != "ann"],
+])
+def test_incremental_update_matches_rebuild(max_cells, change):
+    old = snapshot()
+    new = snapshot(change(EDGES), version=2)
+    index = DashboardPathIndex.build(old, max_cells)
+    updated = index.updated(new, max_cells)
+    rebuilt = DashboardPathIndex.build(new, max_cells)
+
+    assert updated.snapshot is new
+    if index.exact:
+        assert updated.targets == rebuilt.targets
+        assert updated.distances == rebuilt.distances
+    else:
+        # Landmarks are kept across updates; their rows must still be exact
+        assert updated.targets == index.targets
+    for slot, target in enumerate(updated.targets):
+        assert list(updated.distances[slot]) == [
+            reference_distances(new, target).get(node, UNREACHABLE) for node in range(len(new.names))
+        ]
+    for start, end in product(dashboards(new), repeat=2):
+        path = updated.path(start, end, max_hops=20)
+        if path is not None:
+            assert_valid_path(new, path, start, end)
+        assert (path is None) == (rebuilt.path(start, end, max_hops=20) is None)
+    # The old index still answers from the old snapshot
+    assert index.snapshot is old
+
+
+def test_unaffected_rows_are_reused():
+    old = snapshot()
+    new = snapshot(EDGES + [("Author", "ann", "OWNS", "Dashboard", "d1")], version=2)
+    index = DashboardPathIndex.build(old, max_cells=10_000)
+    updated = index.updated(new, max_cells=10_000)
+    reused = [slot for slot in range(len(index.targets)) if updated.distances[slot] is index.distances[slot]]
+    recomputed = [slot for slot in range(len(index.targets)) if updated.distances[slot] is not index.distances[slot]]
+    assert reused and recomputed
+    for slot in range(len(index.targets)):
+        assert updated.distances[slot] == _bfs(new, updated.targets[slot])[0]
+
+
+def test_node_set_change_rebuilds():
+    old = snapshot()
+    index = DashboardPathIndex.build(old, max_cells=10_000)
+    new = GraphSnapshot(NODES + [("Dashboard", {"name": "d6"})], EDGES, 2)
+    updated = index.updated(new, max_cells=10_000)
+    assert len(updated.targets) == 7
+    assert all(updated.distances[slot] is not index.distances[0] for slot in range(7))
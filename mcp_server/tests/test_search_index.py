@@ -0,0 +1,162 @@
+import pytest
+
+from mcp_server.core.search_index import CatalogSearchIndex, TrigramIndex, trigrams
+from mcp_server.core.snapshot import GraphSnapshot
+
+MIN_SCORE = 0.45
+
+
+def snapshot(version, metrics, dashboards=(), domains=()):
+    # Metrics keep their text in "definition", as in the seeded catalog
+    nodes = [("Metric", {"name": name, "definition": definition}) for name, definition in metrics]
+    nodes += [("Dashboard", {"name": name}) for name in dashboards]
+    nodes += [("Domain", {"name": name}) for name in domains]
+    return GraphSnapshot(nodes, [], version)
+
+
+@pytest.fixture
+def catalog():
+    return snapshot(
+        1,
+        [("Revenue", "Total income from sales"), ("Refunds", "Money returned to customers"), ("Churn", None)],
+        dashboards=["Revenue Overview", "Support Queue"],
+        domains=["Marketing", "Finance"],
+    )
+
+
+def names(hits):
+    return [hit["name"] for hit in hits]
+
+
+def test_trigrams_are_padded_per_word():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+    assert trigrams("Ab ab") == trigrams("ab")
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("revnue", "Revenue"),
+    ("Revenu", "Revenue"),
+    ("markting", "Marketing"),
+    ("finanse", "Finance"),
+    ("churn", "Churn"),
+])
+def test_typos_find_the_intended_node(catalog, query, expected):
+    hits = CatalogSearchIndex.build(catalog, MIN_SCORE).search(query)
+    assert hits[0]["name"] == expected
+
+
+def test_exact_name_scores_highest(catalog):
+    hits = CatalogSearchIndex.build(catalog, MIN_SCORE).search("revenue")
+    assert names(hits)[:2] == ["Revenue", "Revenue Overview"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert hits[0] == {"label": "Metric", "name": "Revenue", "description": "Total income from sales",
+                       "score": hits[0]["score"]}
+
+
+def test_descriptions_match_at_lower_weight(catalog):
+    hits = CatalogSearchIndex.build(catalog, MIN_SCORE).search("customers returned money")
+    assert names(hits) == ["Refunds"]
+    assert hits[0]["score"] <= 0.5
+
+
+def test_metrics_are_found_by_their_definition(catalog):
+    hits = CatalogSearchIndex.build(catalog, MIN_SCORE).search("total income")
+    assert names(hits) == ["Revenue"]
+    assert hits[0]["description"] == "Total income from sales"
+    assert names(catalog.search("Metric", "income")) == ["Revenue"]
+    assert catalog.summary(catalog.node_id("Metric", "Revenue"))["description"] == "Total income from sales"
+
+
+def test_incremental_update_reindexes_changed_definitions(catalog):
+    index = CatalogSearchIndex.build(catalog, MIN_SCORE)
+    newer = index.updated(snapshot(2, [("Revenue", "Gross sales receipts"), ("Refunds", "Money returned to customers"),
+                                       ("Churn", None)]))
+    assert newer.search("total income") == []
+    assert names(newer.search("gross sales receipts")) == ["Revenue"]
+
+
+def test_unrelated_text_has_no_hits(catalog):
+    assert CatalogSearchIndex.build(catalog, MIN_SCORE).search("zzzz qqqq") == []
+    assert CatalogSearchIndex.build(catalog, MIN_SCORE).search("   ") == []
+
+
+def test_labels_filter_hits(catalog):
+    index = CatalogSearchIndex.build(catalog, MIN_SCORE)
+    assert {hit["label"] for hit in index.search("revenue")} == {"Metric", "Dashboard"}
+    assert [(hit["label"], hit["name"]) for hit in index.search("revenue", labels=["Dashboard"])] == [
+        ("Dashboard", "Revenue Overview")
+    ]
+    assert index.search("revenue", labels=["Domain"]) == []
+
+
+def test_limit_caps_hits(catalog):
+    assert len(CatalogSearchIndex.build(catalog, MIN_SCORE).search("revenue", limit=1)) == 1
+
+
+def test_incremental_update_adds_and_removes_nodes(catalog):
+    index = CatalogSearchIndex.build(catalog, MIN_SCORE)
+    newer = snapshot(
+        2,
+        [("Revenue", "Total income from sales"), ("Refunds", "Money sent back"), ("Churn", None),
+         ("Net Revenue", "Revenue after refunds")],
+        dashboards=["Revenue Overview", "Support Queue"],
+        domains=["Marketing", "Finance"],
+    )
+    newer_index = index.updated(newer)
+
+    assert newer_index.version == 2
+    assert "Net Revenue" in names(newer_index.search("net revnue"))
+    assert newer_index.search("customers returned money") == []
+    # The index answering searches meanwhile is left as it was
+    assert index.version == 1
+    assert "Net Revenue" not in names(index.search("net revnue"))
+    assert names(index.search("customers returned money")) == ["Refunds"]
+
+    removed = newer_index.updated(snapshot(
+        3,
+        [("Revenue", "Total income from sales"), ("Refunds", "Money sent back"), ("Churn", None),
+         ("Net Revenue", "Revenue after refunds")],
+        dashboards=["Revenue Overview"],
+        domains=["Marketing", "Finance"],
+    ))
+    assert removed.search("support queue") == []
+    assert names(newer_index.search("support queue")) == ["Support Queue"]
+
+
+def test_incremental_update_matches_a_rebuild(catalog):
+    newer = snapshot(2, [("Revenue", "Income"), ("Refund Rate", "Share of refunded orders"), ("Churn", None)],
+                     dashboards=["Revenue Overview", "Support Queue"], domains=["Marketing", "Finance"])
+    patched = CatalogSearchIndex.build(catalog, MIN_SCORE).updated(newer)
+    rebuilt = CatalogSearchIndex.build(newer, MIN_SCORE)
+    for query in ["revenue", "refund", "income", "orders refunded", "markting", "churn"]:
+        assert patched.search(query) == rebuilt.search(query)
+
+
+def test_large_changes_rebuild_from_scratch(catalog, monkeypatch):
+    index = CatalogSearchIndex.build(catalog, MIN_SCORE)
+    rebuilt = []
+    build = CatalogSearchIndex.build.__func__
+
+    def spy(cls, snapshot, min_score):
+        rebuilt.append(snapshot.version)
+        return build(cls, snapshot, min_score)
+
+    monkeypatch.setattr(CatalogSearchIndex, "build", classmethod(spy))
+    small = snapshot(2, [("Revenue", "Income"), ("Refunds", "Money returned to customers"), ("Churn", None)],
+                     dashboards=["Revenue Overview", "Support Queue"], domains=["Marketing", "Finance"])
+    index = index.updated(small)
+    assert rebuilt == []
+
+    large = snapshot(3, [(f"Metric {i}", None) for i in range(10)])
+    assert names(index.updated(large).search("metric 7"))[0] == "Metric 7"
+    assert rebuilt == [3]
+
+
+def test_trigram_index_copy_does_not_write_to_the_original():
+    original = TrigramIndex()
+    original.add("Revenue", "income")
+    copy = original.copy()
+    copy.add("Revenue Growth")
+    copy.remove("Revenue")
+    assert [name for _, name, _ in original.search("revenue", 5, MIN_SCORE)] == ["Revenue"]
+    assert [name for _, name, _ in copy.search("revenue", 5, MIN_SCORE)] == ["Revenue Growth"]